@@ -0,0 +1,40 @@
+"""
+Fast JSON responses.
+orjson-based response class used by the API router, plus SSE framing.
+"""
+from typing import Any
+
+import orjson
+from fastapi.responses import ORJSONResponse
+
+
+JSON_OPTIONS = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+
+
+class FastJSONResponse(ORJSONResponse):
+    """
+    ORJSONResponse that also accepts NumPy scalars/arrays and non-string keys.
+    
+    Handlers on hot paths return it directly with plain dicts/lists (floats,
+    datetimes), which skips FastAPI's generic ``jsonable_encoder`` pass.
+    """
+    
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content, option=JSON_OPTIONS)
+
+
+def sse_event(event: str, event_id: int, data: Any) -> bytes:
+    """
+    Frame one Server-Sent Event.
+    
+    Args:
+        event: Event name
+        event_id: Event id (engine snapshot version)
+        data: JSON-serializable payload
+    
+    Returns:
+        Encoded event including the terminating blank line
+    """
+    return b"event: %s\nid: %d\ndata: %s\n\n" % (
+        event.encode(), event_id, orjson.dumps(data, option=JSON_OPTIONS)
+    )
@@ -2,29 +2,172 @@
 FastAPI routes for trading bot API.
 Provides REST endpoints for Telegram bot to interact with paper trading engine.
 """
-from fastapi import APIRouter, HTTPException, Depends
-from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, desc
-from typing import List, Dict, Optional
-from datetime import datetime, timedelta
+import asyncio
+from fastapi import APIRouter, HTTPException, Depends, Header, Request
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncSession
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy import select, desc, func, case, bindparam
+from typing import List, Dict, Optional, Tuple
+from datetime import datetime, timedelta, timezone
 
-from ..database import get_db
+from .responses import FastJSONResponse, sse_event
+from .schemas import (
+    BulkExecuteRequest,
+    EquityCurveResponse,
+    PositionsResponse,
+    SignalResponse,
+    StatusResponse,
+    TradeHistoryResponse,
+)
+from ..database import get_db, get_connection
 from ..models.trade import Trade
+from ..models.execution_request import ExecutionRequest
 from ..services.market_data import MarketDataService
+from ..services.analytics import PerformanceTracker
+from ..services.breakouts import BreakoutBoard
+from ..services.candle_store import CandleArrays
+from ..services.clock import clock
+from ..services.compute import ComputeExecutor, LoopLagMonitor
+from ..services.equity_recorder import EQUITY_VIEWS, pick_resolution, query_equity_curve
+from ..services.event_broker import EventBroker
 from ..services.paper_trading import PaperTradingEngine
+from ..services.risk import PortfolioRiskEngine
+from ..services.signal_cache import SignalCache
+from ..services.state_store import create_state_store
+from ..services.write_behind import WriteBehindQueue
 from ..strategies.swing_trend import SwingTrendStrategy
 from ..config import settings
 
-router = APIRouter(prefix="/api/v1", tags=["trading"])
+router = APIRouter(prefix="/api/v1", tags=["trading"], default_response_class=FastJSONResponse)
 
 # Global instances
 market_data = MarketDataService()
-paper_engine = PaperTradingEngine(initial_capital=settings.INITIAL_CAPITAL)
+paper_engine = PaperTradingEngine(
+    initial_capital=settings.INITIAL_CAPITAL,
+    state_store=create_state_store()
+)
 strategy = SwingTrendStrategy()
+risk_engine = PortfolioRiskEngine()
+event_broker = EventBroker()
+event_broker.attach(paper_engine)
+performance = PerformanceTracker()
+write_queue = WriteBehindQueue()
+compute = ComputeExecutor()
+loop_lag = LoopLagMonitor()
+breakouts = BreakoutBoard()
+signal_cache = SignalCache(strategy.params)
+performance.attach(paper_engine)
 
 
-@router.get("/status")
-async def get_status(db: AsyncSession = Depends(get_db)):
+# Hot read queries are built once with bound parameters, so SQLAlchemy's
+# compiled cache and asyncpg's prepared statements are reused per connection
+STATUS_QUERY = (
+    select(
+        func.count(),
+        func.count().filter(Trade.pnl > 0),
+        func.coalesce(func.sum(case((Trade.closed_at >= bindparam("today_start"), Trade.pnl), else_=0)), 0)
+    )
+    .where(Trade.status == "closed")
+    .where(Trade.closed_at >= bindparam("since"))
+)
+
+
+async def compute_signal(symbol: str, candles: CandleArrays) -> Optional[Dict]:
+    """
+    Run the strategy in the compute pool instead of on the event loop.
+    
+    Concurrent requests for the same symbol and candles share one run.
+    """
+    key = (symbol, settings.TIMEFRAME, len(candles), int(candles.timestamp[-1]), float(candles.close[-1]))
+    return await compute.run(key, strategy.generate_signal, candles)
+
+
+def trail_distance(signal: Dict) -> Optional[float]:
+    """Trailing stop distance for a signal (None when trailing stops are off)."""
+    if settings.TRAILING_STOP_ATR <= 0:
+        return None
+    return signal["atr"] * settings.TRAILING_STOP_ATR
+
+
+async def refresh_breakout(symbol: str, candles: CandleArrays):
+    """Publish the symbol's breakout levels once per closed bar (last row is the forming bar)."""
+    if len(candles) < 2:
+        return
+    closed = candles.slice(0, len(candles) - 1)
+    last_closed = int(closed.timestamp[-1])
+    if not breakouts.needs_refresh(symbol, last_closed):
+        return
+    key = (symbol, settings.TIMEFRAME, "breakout", last_closed)
+    trigger = await compute.run(key, strategy.breakout_trigger, closed)
+    if trigger is not None:
+        breakouts.publish(symbol, trigger)
+
+
+async def evaluate_signal(symbol: str) -> Tuple[Optional[Dict], bool]:
+    """
+    Signal for the symbol's current bar, computed at most once per closed candle.
+    
+    A cached signal is returned without fetching candles, so /execute
+    trades exactly the signal /signals showed.
+    
+    Returns:
+        (signal or None, whether candle data was available)
+    """
+    cached = signal_cache.get(symbol)
+    if cached is not None:
+        return cached.signal, True
+    
+    # Fetch recent OHLCV data (last 100 bars)
+    candles = await market_data.fetch_candles(
+        symbol=symbol,
+        timeframe=settings.TIMEFRAME,
+        limit=100
+    )
+    if not len(candles):
+        return None, False
+    
+    # Keep returns cache warm for portfolio risk checks
+    risk_engine.update_returns(symbol, candles.close, candles.timestamp)
+    
+    signal = await compute_signal(symbol, candles)
+    await refresh_breakout(symbol, candles)
+    if len(candles) >= 2:
+        signal_cache.put(symbol, int(candles.timestamp[-2]), signal)
+    return signal, True
+
+
+async def entry_price(symbol: str, signal: Dict) -> Tuple[Optional[float], Optional[str]]:
+    """
+    Price to open a signal at now.
+    
+    A cached signal is served for its whole bar, but its ``entry`` is the
+    close when it was computed; filling there later would hand the paper
+    account a price that may no longer be available. Trades therefore fill
+    at the current ticker price, and are refused once that price has run
+    more than ``MAX_ENTRY_DRIFT_PCT`` past the entry or beyond the stop or
+    target.
+    
+    Returns:
+        (price, None), or (None, reason) if the signal should not be taken
+    """
+    ticker = await market_data.get_ticker(symbol)
+    price = ticker["last"]
+    # Signed so that positive drift is an adverse move for the trade
+    sign = 1 if signal["side"] == "long" else -1
+    drift_pct = sign * (price / signal["entry"] - 1) * 100
+    if sign * (price - signal["stop"]) <= 0 or sign * (signal["tp"] - price) <= 0:
+        return None, f"Price {price} is already beyond the signal's stop or target"
+    if drift_pct > settings.MAX_ENTRY_DRIFT_PCT:
+        return None, (
+            f"Price moved {drift_pct:.2f}% past the signal entry {signal['entry']} "
+            f"(limit {settings.MAX_ENTRY_DRIFT_PCT}%)"
+        )
+    return price, None
+
+
+@router.get("/status", response_model=StatusResponse)
+async def get_status(conn: AsyncConnection = Depends(get_connection)):
     """
     Get current trading status:
     - Portfolio equity
@@ -33,87 +176,63 @@ async def get_status(db: AsyncSession = Depends(get_db)):
     - Win rate (last 30 days)
     """
     try:
-        # Get portfolio status from paper engine
+        # Get portfolio status from paper engine (pull other workers' writes)
+        await paper_engine.sync()
         portfolio = paper_engine.get_status()
         
-        # Query recent trades (last 30 days)
-        thirty_days_ago = datetime.utcnow() - timedelta(days=30)
-        result = await db.execute(
-            select(Trade)
-            .where(Trade.status == "closed")
-            .where(Trade.closed_at >= thirty_days_ago)
-            .order_by(desc(Trade.closed_at))
-        )
-        recent_trades = result.scalars().all()
+        # Aggregate closed trades in SQL instead of loading rows
+        now = clock.utcnow()
+        thirty_days_ago = now - timedelta(days=30)
+        today_start = now.replace(hour=0, minute=0, second=0, microsecond=0)
+        result = await conn.execute(STATUS_QUERY, {"since": thirty_days_ago, "today_start": today_start})
+        total_trades, winning_trades, today_pnl = result.one()
         
         # Calculate win rate
-        if recent_trades:
-            winning_trades = [t for t in recent_trades if t.pnl > 0]
-            win_rate = (len(winning_trades) / len(recent_trades)) * 100
-        else:
-            win_rate = 0.0
-        
-        # Today's P&L
-        today_start = datetime.utcnow().replace(hour=0, minute=0, second=0, microsecond=0)
-        result = await db.execute(
-            select(Trade)
-            .where(Trade.status == "closed")
-            .where(Trade.closed_at >= today_start)
-        )
-        today_trades = result.scalars().all()
-        today_pnl = sum(t.pnl for t in today_trades)
+        win_rate = (winning_trades / total_trades) * 100 if total_trades else 0.0
         
-        return {
+        return FastJSONResponse({
             "equity": portfolio["equity"],
             "available": portfolio["available"],
             "open_positions": len(portfolio["positions"]),
             "positions": portfolio["positions"],
-            "today_pnl": round(today_pnl, 2),
+            "today_pnl": round(float(today_pnl), 2),
             "win_rate_30d": round(win_rate, 2),
-            "total_trades_30d": len(recent_trades),
-            "timestamp": datetime.utcnow().isoformat()
-        }
+            "total_trades_30d": total_trades,
+            "timestamp": now
+        })
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error fetching status: {str(e)}")
 
 
-@router.get("/signals/{symbol}")
+@router.get("/signals/{symbol}", response_model=SignalResponse)
 async def get_signal(symbol: str):
     """
     Check if there's a trading signal for given symbol.
     Returns entry price, stop loss, take profit if signal exists.
     """
     try:
-        # Fetch recent OHLCV data (last 100 bars)
-        df = await market_data.fetch_ohlcv(
-            symbol=symbol,
-            timeframe=settings.TIMEFRAME,
-            limit=100
-        )
-        
-        if df.empty:
+        # Generate signal (cached until the next candle closes)
+        signal, has_data = await evaluate_signal(symbol)
+        if not has_data:
             raise HTTPException(status_code=404, detail=f"No data for {symbol}")
         
-        # Generate signal
-        signal = strategy.generate_signal(df)
-        
         if signal is None:
-            return {
+            return FastJSONResponse({
                 "symbol": symbol,
                 "signal": None,
                 "message": "No signal at this time",
-                "timestamp": datetime.utcnow().isoformat()
-            }
+                "timestamp": clock.utcnow()
+            })
         
-        return {
+        return FastJSONResponse({
             "symbol": symbol,
             "signal": signal["side"],
             "entry_price": signal["entry"],
             "stop_loss": signal["stop"],
             "take_profit": signal["tp"],
             "risk_reward": settings.RR_RATIO,
-            "timestamp": datetime.utcnow().isoformat()
-        }
+            "timestamp": clock.utcnow()
+        })
     except HTTPException:
         raise
     except Exception as e:
@@ -121,202 +240,491 @@ async def get_signal(symbol: str):
 
 
 @router.post("/execute/{symbol}")
-async def execute_trade(symbol: str, db: AsyncSession = Depends(get_db)):
+async def execute_trade(symbol: str):
     """
     Execute trade for given symbol:
-    1. Check for signal
-    2. Calculate position size
+    1. Check for signal (refused if the price has run past its entry)
+    2. Calculate position size at the current price
     3. Open position in paper engine
-    4. Save to database
+    4. Queue the trade row (written by the next write-behind flush)
     """
     try:
-        # Check if max positions reached
-        status = paper_engine.get_status()
-        if len(status["positions"]) >= settings.MAX_OPEN_POSITIONS:
+        # Fast rejection from the lock-free snapshot (re-checked under the lock)
+        await paper_engine.sync()
+        if len(paper_engine.get_status()["positions"]) >= settings.MAX_OPEN_POSITIONS:
             raise HTTPException(
                 status_code=400,
                 detail=f"Max positions ({settings.MAX_OPEN_POSITIONS}) already open"
             )
         
-        # Fetch data and check signal
-        df = await market_data.fetch_ohlcv(
-            symbol=symbol,
-            timeframe=settings.TIMEFRAME,
-            limit=100
-        )
-        
-        if df.empty:
+        # Check signal (the one /signals showed, if computed for this bar)
+        signal, has_data = await evaluate_signal(symbol)
+        if not has_data:
             raise HTTPException(status_code=404, detail=f"No data for {symbol}")
         
-        signal = strategy.generate_signal(df)
-        
         if signal is None:
             raise HTTPException(
                 status_code=400,
                 detail="No valid signal at this time"
             )
         
-        # Calculate position size
-        qty = paper_engine.calculate_position_size(
-            entry_price=signal["entry"],
-            stop_price=signal["stop"]
-        )
+        # Fill at the current price, not the (possibly bar-old) signal close
+        price, refused = await entry_price(symbol, signal)
+        if refused:
+            raise HTTPException(status_code=400, detail=refused)
         
-        # Open position in paper engine
-        position = paper_engine.open_position(
-            symbol=symbol,
-            side=signal["side"],
-            entry_price=signal["entry"],
-            qty=qty,
-            stop_loss=signal["stop"],
-            take_profit=signal["tp"]
-        )
+        # Single writer: limit checks, sizing and open are atomic; the trade
+        # row is queued only once the engine state is committed
+        async with paper_engine.transaction():
+            status = paper_engine.get_status()
+            if len(status["positions"]) >= settings.MAX_OPEN_POSITIONS:
+                raise HTTPException(
+                    status_code=400,
+                    detail=f"Max positions ({settings.MAX_OPEN_POSITIONS}) already open"
+                )
+            
+            # Calculate position size
+            qty = paper_engine.calculate_position_size(
+                entry_price=price,
+                stop_price=signal["stop"],
+                symbol=symbol
+            )
+            
+            # Portfolio-level risk gate (may downsize or block)
+            decision = risk_engine.evaluate(
+                symbol=symbol,
+                side=signal["side"],
+                qty=qty,
+                price=price,
+                positions=status["positions"],
+                equity=paper_engine.equity
+            )
+            if not decision.allowed:
+                raise HTTPException(status_code=400, detail=f"Risk check failed: {decision.reason}")
+            qty = decision.qty
+            
+            # Open position in paper engine
+            position = paper_engine.open_position(
+                symbol=symbol,
+                side=signal["side"],
+                entry_price=price,
+                qty=qty,
+                stop_loss=signal["stop"],
+                take_profit=signal["tp"],
+                trail_distance=trail_distance(signal)
+            )
+            
+            position["trade_id"] = await write_queue.reserve_trade_id()
         
-        # Save to database
-        trade = Trade(
+        # Queue the trade row (entry and qty as actually filled)
+        write_queue.add_trade(
+            position["trade_id"],
             strategy="swing_trend",
             symbol=symbol,
             side=signal["side"],
-            entry_price=signal["entry"],
-            qty=qty,
+            entry_price=position["entry_price"],
+            qty=position["qty"],
             stop_loss=signal["stop"],
             take_profit=signal["tp"],
-            opened_at=datetime.utcnow(),
+            opened_at=position["opened_at"],
             status="open"
         )
-        db.add(trade)
-        await db.commit()
-        await db.refresh(trade)
         
         return {
-            "trade_id": trade.id,
+            "trade_id": position["trade_id"],
             "symbol": symbol,
             "side": signal["side"],
-            "entry_price": signal["entry"],
-            "quantity": qty,
+            "entry_price": position["entry_price"],
+            "quantity": position["qty"],
+            "fees": position["fees"],
             "stop_loss": signal["stop"],
             "take_profit": signal["tp"],
             "risk_amount": round(paper_engine.equity * (settings.RISK_PER_TRADE / 100), 2),
             "message": "Position opened successfully",
-            "timestamp": datetime.utcnow().isoformat()
+            "timestamp": clock.utcnow().isoformat()
         }
     except HTTPException:
         raise
     except Exception as e:
-        await db.rollback()
         raise HTTPException(status_code=500, detail=f"Error executing trade: {str(e)}")
 
 
-@router.get("/positions")
+async def _evaluate_symbol(symbol: str) -> Dict:
+    """Generate (or reuse) the signal for one symbol of a bulk request."""
+    signal, has_data = await evaluate_signal(symbol)
+    if not has_data:
+        return {"symbol": symbol, "signal": None, "reason": "No data"}
+    if signal is None:
+        return {"symbol": symbol, "signal": None, "reason": "No valid signal at this time"}
+    price, refused = await entry_price(symbol, signal)
+    if refused:
+        return {"symbol": symbol, "signal": None, "reason": refused}
+    return {"symbol": symbol, "signal": signal, "price": price}
+
+
+@router.post("/execute")
+async def execute_bulk(
+    request: BulkExecuteRequest,
+    idempotency_key: Optional[str] = Header(default=None, alias="Idempotency-Key", max_length=100),
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Execute trades for a batch of symbols:
+    1. Evaluate all symbols concurrently (with their current prices)
+    2. Size signals jointly against available capital
+    3. Open positions in paper engine
+    4. Queue all trades for the next write-behind flush
+    
+    Retries carrying the same ``Idempotency-Key`` header return the stored
+    response instead of opening positions again.
+    """
+    try:
+        if idempotency_key:
+            stored = await db.get(ExecutionRequest, idempotency_key)
+            if stored:
+                return stored.response
+        
+        symbols = list(dict.fromkeys(request.symbols))
+        results = await asyncio.gather(
+            *(_evaluate_symbol(symbol) for symbol in symbols),
+            return_exceptions=True
+        )
+        
+        skipped = []
+        candidates = []
+        for symbol, result in zip(symbols, results):
+            if isinstance(result, Exception):
+                skipped.append({"symbol": symbol, "reason": f"Error: {result}"})
+            elif result["signal"] is None:
+                skipped.append({"symbol": symbol, "reason": result["reason"]})
+            else:
+                candidates.append(result)
+        
+        async with paper_engine.transaction():
+            # Re-check under the writer lock: a concurrent retry may have finished first
+            if idempotency_key:
+                stored = await db.get(ExecutionRequest, idempotency_key)
+                if stored:
+                    return stored.response
+            
+            status = paper_engine.get_status()
+            held = {p["symbol"] for p in status["positions"]}
+            slots = settings.MAX_OPEN_POSITIONS - len(held)
+            
+            selected = []
+            for candidate in candidates:
+                if candidate["symbol"] in held:
+                    skipped.append({"symbol": candidate["symbol"], "reason": "Position already open"})
+                elif len(selected) >= slots:
+                    skipped.append({"symbol": candidate["symbol"], "reason": "Max positions reached"})
+                else:
+                    selected.append(candidate)
+            
+            # Joint sizing: risk-based qty per signal, scaled down together to fit capital
+            for candidate in selected:
+                signal = candidate["signal"]
+                candidate["qty"] = paper_engine.calculate_position_size(
+                    entry_price=candidate["price"],
+                    stop_price=signal["stop"],
+                    symbol=candidate["symbol"]
+                )
+            total_cost = sum(
+                c["qty"] * paper_engine.unit_cost(c["price"], c["symbol"])
+                for c in selected
+            )
+            if total_cost > paper_engine.available > 0:
+                scale = paper_engine.available / total_cost
+                for candidate in selected:
+                    candidate["qty"] *= scale
+            
+            executed = []
+            for candidate in selected:
+                symbol = candidate["symbol"]
+                signal = candidate["signal"]
+                decision = risk_engine.evaluate(
+                    symbol=symbol,
+                    side=signal["side"],
+                    qty=candidate["qty"],
+                    price=candidate["price"],
+                    positions=list(paper_engine.positions.values()),
+                    equity=paper_engine.equity
+                )
+                if not decision.allowed:
+                    skipped.append({"symbol": symbol, "reason": f"Risk check failed: {decision.reason}"})
+                    continue
+                try:
+                    position = paper_engine.open_position(
+                        symbol=symbol,
+                        side=signal["side"],
+                        entry_price=candidate["price"],
+                        qty=decision.qty,
+                        stop_loss=signal["stop"],
+                        take_profit=signal["tp"],
+                        trail_distance=trail_distance(signal)
+                    )
+                except Exception as e:
+                    skipped.append({"symbol": symbol, "reason": str(e)})
+                    continue
+                position["trade_id"] = await write_queue.reserve_trade_id()
+                executed.append(position)
+            
+            response = {
+                "executed": [
+                    {
+                        "trade_id": position["trade_id"],
+                        "symbol": position["symbol"],
+                        "side": position["side"],
+                        "entry_price": position["entry_price"],
+                        "quantity": position["qty"],
+                        "fees": position["fees"],
+                        "stop_loss": position["stop_loss"],
+                        "take_profit": position["take_profit"]
+                    }
+                    for position in executed
+                ],
+                "skipped": skipped,
+                "idempotency_key": idempotency_key,
+                "timestamp": clock.utcnow().isoformat()
+            }
+            # Claim the key now (a duplicate fails here and rolls the engine back),
+            # but commit it only once the engine state is committed
+            if idempotency_key:
+                db.add(ExecutionRequest(key=idempotency_key, response=response))
+                await db.flush()
+        
+        for position in executed:
+            write_queue.add_trade(
+                position["trade_id"],
+                strategy="swing_trend",
+                symbol=position["symbol"],
+                side=position["side"],
+                entry_price=position["entry_price"],
+                qty=position["qty"],
+                stop_loss=position["stop_loss"],
+                take_profit=position["take_profit"],
+                opened_at=position["opened_at"],
+                status="open"
+            )
+        if idempotency_key:
+            await db.commit()
+        
+        return response
+    except HTTPException:
+        raise
+    except IntegrityError:
+        # Same key committed by another worker; engine state was rolled back
+        await db.rollback()
+        stored = await db.get(ExecutionRequest, idempotency_key) if idempotency_key else None
+        if stored:
+            return stored.response
+        raise HTTPException(status_code=409, detail="Conflicting execution request")
+    except Exception as e:
+        await db.rollback()
+        raise HTTPException(status_code=500, detail=f"Error executing trades: {str(e)}")
+
+
+@router.get("/positions", response_model=PositionsResponse)
 async def get_positions():
     """
     Get all open positions with current P&L.
     """
     try:
+        await paper_engine.sync()
         status = paper_engine.get_status()
-        return {
+        return FastJSONResponse({
             "open_positions": len(status["positions"]),
             "positions": status["positions"],
-            "timestamp": datetime.utcnow().isoformat()
-        }
+            "timestamp": clock.utcnow()
+        })
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error fetching positions: {str(e)}")
 
 
 @router.post("/update-positions/{symbol}")
-async def update_positions(symbol: str, db: AsyncSession = Depends(get_db)):
+async def update_positions(symbol: str):
     """
     Update positions for given symbol:
     1. Fetch current price
     2. Check SL/TP hits
     3. Close positions if needed
-    4. Update database
+    4. Queue trade updates for closed positions
+    5. Check the price against the symbol's breakout levels, confirming a
+       hit with the full strategy
     """
     try:
         # Fetch current ticker
         ticker = await market_data.get_ticker(symbol)
         current_price = ticker["last"]
         
-        # Update positions in paper engine
-        closed_positions = paper_engine.update_positions(symbol, current_price)
+        async with paper_engine.transaction():
+            # Update positions in paper engine
+            closed_positions = paper_engine.update_positions(symbol, current_price)
         
-        # Update database for closed positions
-        for pos in closed_positions:
-            result = await db.execute(
-                select(Trade)
-                .where(Trade.symbol == symbol)
-                .where(Trade.status == "open")
-                .where(Trade.entry_price == pos["entry_price"])
-            )
-            trade = result.scalar_one_or_none()
-            
-            if trade:
-                trade.exit_price = pos["exit_price"]
-                trade.pnl = pos["pnl"]
-                trade.pnl_pct = pos["pnl_pct"]
-                trade.exit_reason = pos["exit_reason"]
-                trade.closed_at = datetime.utcnow()
-                trade.status = "closed"
+        # Update database for closed positions (next write-behind flush)
+        await write_queue.record_closed(symbol, closed_positions)
         
-        await db.commit()
+        # Two float comparisons unless the price crossed an entry level
+        breakout = None
+        side = breakouts.check(symbol, current_price)
+        if side is not None:
+            candles = await market_data.fetch_candles(symbol=symbol, timeframe=settings.TIMEFRAME, limit=100)
+        else:
+            candles = None
+        if candles is not None and len(candles) >= 2:
+            signal = await compute_signal(symbol, candles)
+            await refresh_breakout(symbol, candles)
+            # Replaces a cached "no signal" so /signals and /execute see the breakout
+            signal_cache.put(symbol, int(candles.timestamp[-2]), signal)
+            if signal is not None and signal["side"] == side:
+                breakout = signal
         
         return {
             "symbol": symbol,
             "current_price": current_price,
             "closed_positions": len(closed_positions),
             "details": closed_positions,
-            "timestamp": datetime.utcnow().isoformat()
+            "breakout": breakout,
+            "timestamp": clock.utcnow().isoformat()
         }
     except Exception as e:
-        await db.rollback()
         raise HTTPException(status_code=500, detail=f"Error updating positions: {str(e)}")
 
 
-@router.get("/trades/history")
+# Columns served by /trades/history, fetched as plain rows (no ORM entities)
+TRADE_HISTORY_COLUMNS = (
+    Trade.id,
+    Trade.symbol,
+    Trade.side,
+    Trade.entry_price,
+    Trade.exit_price,
+    Trade.qty,
+    Trade.pnl,
+    Trade.pnl_pct,
+    Trade.exit_reason,
+    Trade.opened_at,
+    Trade.closed_at,
+    Trade.status,
+)
+
+
+def trade_history_query(limit: int, status: Optional[str] = None):
+    """Newest trades first, optionally filtered by status."""
+    query = select(*TRADE_HISTORY_COLUMNS).order_by(desc(Trade.opened_at))
+    if status:
+        query = query.where(Trade.status == status)
+    return query.limit(limit)
+
+
+@router.get("/trades/history", response_model=TradeHistoryResponse)
 async def get_trade_history(
     limit: int = 50,
     status: Optional[str] = None,
-    db: AsyncSession = Depends(get_db)
+    conn: AsyncConnection = Depends(get_connection)
 ):
     """
     Get trade history with optional filtering.
     """
     try:
-        query = select(Trade).order_by(desc(Trade.opened_at))
-        
-        if status:
-            query = query.where(Trade.status == status)
-        
-        query = query.limit(limit)
-        
-        result = await db.execute(query)
-        trades = result.scalars().all()
+        result = await conn.execute(trade_history_query(limit, status))
+        trades = [row._asdict() for row in result]
         
-        return {
+        return FastJSONResponse({
             "total": len(trades),
-            "trades": [
-                {
-                    "id": t.id,
-                    "symbol": t.symbol,
-                    "side": t.side,
-                    "entry_price": t.entry_price,
-                    "exit_price": t.exit_price,
-                    "qty": t.qty,
-                    "pnl": t.pnl,
-                    "pnl_pct": t.pnl_pct,
-                    "exit_reason": t.exit_reason,
-                    "opened_at": t.opened_at.isoformat() if t.opened_at else None,
-                    "closed_at": t.closed_at.isoformat() if t.closed_at else None,
-                    "status": t.status
-                }
-                for t in trades
-            ],
-            "timestamp": datetime.utcnow().isoformat()
-        }
+            "trades": trades,
+            "timestamp": clock.utcnow()
+        })
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error fetching history: {str(e)}")
 
 
+def _naive_utc(value: datetime) -> datetime:
+    """Naive UTC datetime, as samples are stored (aware values are converted)."""
+    if value.tzinfo is None:
+        return value
+    return value.astimezone(timezone.utc).replace(tzinfo=None)
+
+
+@router.get("/equity", response_model=EquityCurveResponse)
+async def get_equity_curve(
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+    resolution: Optional[str] = None,
+    conn: AsyncConnection = Depends(get_connection)
+):
+    """
+    Get the downsampled equity curve for a time range.
+    
+    Defaults to the last 24 hours. Resolution ('1m', '1h', '1d') is picked
+    automatically to stay within EQUITY_MAX_POINTS unless given. Times with
+    an offset are converted to UTC; times without one are taken as UTC.
+    """
+    end = _naive_utc(end) if end else clock.utcnow()
+    start = _naive_utc(start) if start else end - timedelta(days=1)
+    if start >= end:
+        raise HTTPException(status_code=400, detail="start must be before end")
+    if resolution is not None and resolution not in EQUITY_VIEWS:
+        raise HTTPException(status_code=400, detail=f"resolution must be one of {list(EQUITY_VIEWS)}")
+    
+    try:
+        resolution = resolution or pick_resolution(start, end)
+        points = await query_equity_curve(conn, start, end, resolution)
+        return FastJSONResponse({
+            "resolution": resolution,
+            "start": start,
+            "end": end,
+            "points": points
+        })
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error fetching equity curve: {str(e)}")
+
+
+@router.get("/analytics")
+async def get_analytics():
+    """
+    Get running performance statistics for the paper run.
+    
+    Trade stats (expectancy, profit factor, streaks) and equity stats
+    (drawdown, Sharpe, Sortino) are maintained incrementally, so this is
+    constant time regardless of history length. Closes made on other
+    workers reach the tracker through the shared fills on sync.
+    """
+    try:
+        await paper_engine.sync()
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error syncing engine state: {str(e)}")
+    return FastJSONResponse({
+        **performance.report(),
+        "timestamp": clock.utcnow()
+    })
+
+
+@router.get("/stream")
+async def stream(request: Request, interval: Optional[float] = None):
+    """
+    Server-Sent Events stream of positions, equity and fills.
+    
+    Sends a full 'snapshot' first, then 'fill' events as they commit and
+    'update' events with only the changed fields, at most one per
+    ``interval`` seconds (floored at STREAM_MIN_INTERVAL_SECONDS).
+    """
+    subscription = event_broker.subscribe(interval)
+    
+    async def body():
+        try:
+            async for event, version, data in subscription.events():
+                if await request.is_disconnected():
+                    break
+                yield sse_event(event, version, data)
+        finally:
+            event_broker.unsubscribe(subscription)
+    
+    return StreamingResponse(
+        body(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
 @router.get("/health")
 async def health_check():
     """
@@ -325,5 +733,9 @@ async def health_check():
     return {
         "status": "healthy",
         "service": "trading-bot-api",
-        "timestamp": datetime.utcnow().isoformat()
+        "event_loop_lag": loop_lag.stats(),
+        "compute": compute.stats(),
+        "breakouts": breakouts.stats(),
+        "signal_cache": signal_cache.stats(),
+        "timestamp": clock.utcnow().isoformat()
     }
@@ -0,0 +1,105 @@
+"""
+Pydantic request and response models for the trading API.
+"""
+from datetime import datetime
+from typing import List, Optional
+
+from pydantic import BaseModel, Field
+
+
+class Position(BaseModel):
+    """Open paper position."""
+    symbol: str
+    side: str
+    entry_price: float
+    qty: float
+    stop_loss: float
+    take_profit: float
+    opened_at: datetime
+    cost: float
+    fees: float = 0.0
+    current_price: float
+    pnl: float
+    pnl_pct: float
+    trade_id: Optional[int] = None
+    trail_distance: Optional[float] = None
+    trailing_stop: Optional[float] = None
+
+
+class StatusResponse(BaseModel):
+    """GET /status."""
+    equity: float
+    available: float
+    open_positions: int
+    positions: List[Position]
+    today_pnl: float
+    win_rate_30d: float
+    total_trades_30d: int
+    timestamp: datetime
+
+
+class PositionsResponse(BaseModel):
+    """GET /positions."""
+    open_positions: int
+    positions: List[Position]
+    timestamp: datetime
+
+
+class SignalResponse(BaseModel):
+    """GET /signals/{symbol}."""
+    symbol: str
+    signal: Optional[str] = None
+    entry_price: Optional[float] = None
+    stop_loss: Optional[float] = None
+    take_profit: Optional[float] = None
+    risk_reward: Optional[float] = None
+    message: Optional[str] = None
+    timestamp: datetime
+
+
+class TradeRecord(BaseModel):
+    """One row of trade history."""
+    id: int
+    symbol: str
+    side: str
+    entry_price: float
+    exit_price: Optional[float] = None
+    qty: float
+    pnl: Optional[float] = None
+    pnl_pct: Optional[float] = None
+    exit_reason: Optional[str] = None
+    opened_at: Optional[datetime] = None
+    closed_at: Optional[datetime] = None
+    status: str
+
+
+class TradeHistoryResponse(BaseModel):
+    """GET /trades/history."""
+    total: int
+    trades: List[TradeRecord]
+    timestamp: datetime
+
+
+class EquityPoint(BaseModel):
+    """One bucket of the equity curve (OHLC of equity)."""
+    time: datetime
+    open: float
+    high: float
+    low: float
+    close: float
+    available: float
+    exposure: float
+    open_positions: int
+
+
+class EquityCurveResponse(BaseModel):
+    """GET /equity."""
+    resolution: str
+    start: datetime
+    end: datetime
+    points: List[EquityPoint]
+
+
+class BulkExecuteRequest(BaseModel):
+    """Body of POST /execute."""
+    symbols: List[str] = Field(..., min_length=1, max_length=200, description="Symbols to evaluate and trade")
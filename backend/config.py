@@ -15,22 +15,59 @@ class Settings(BaseSettings):
         description="PostgreSQL connection string"
     )
     
+    # Connection pool (split across uvicorn workers)
+    WEB_CONCURRENCY: int = Field(default=1, description="Uvicorn worker processes (same variable uvicorn reads)")
+    DB_MAX_CONNECTIONS: int = Field(default=30, description="Connections the API may hold across all workers")
+    DB_POOL_SIZE: int = Field(default=0, description="Persistent connections per worker; 0 derives it from the budget")
+    DB_POOL_TIMEOUT_SECONDS: float = Field(default=10.0, description="Wait for a free pooled connection")
+    DB_POOL_RECYCLE_SECONDS: int = Field(default=1800, description="Replace pooled connections older than this")
+    DB_STATEMENT_CACHE_SIZE: int = Field(default=256, description="Prepared statements cached per connection (asyncpg)")
+    DB_COMMAND_TIMEOUT_SECONDS: float = Field(default=30.0, description="Per-statement timeout (asyncpg)")
+    
     # Redis
     REDIS_URL: str = Field(
         default="redis://localhost:6379",
         description="Redis connection string"
     )
     
+    # Shared engine state (multi-worker deployments)
+    STATE_BACKEND: str = Field(default="memory", description="Engine state store: 'memory' or 'redis'")
+    STATE_LOCK_TIMEOUT_SECONDS: float = Field(default=10.0, description="Cross-worker engine write lock timeout")
+    LEADER_LEASE_SECONDS: float = Field(default=30.0, description="Scheduler leader lease duration")
+    STATE_FILLS_MAXLEN: int = Field(default=10000, description="Fills kept in the shared stream for workers catching up")
+    SCHEDULER_ENABLED: bool = Field(default=False, description="Run the position update scheduler")
+    SCHEDULER_INTERVAL_SECONDS: float = Field(default=10.0, description="Scheduler cycle interval")
+    
     # Exchange API (Binance)
     EXCHANGE_API_KEY: str = Field(default="", description="Binance API Key")
     EXCHANGE_API_SECRET: str = Field(default="", description="Binance API Secret")
     EXCHANGE_TESTNET: bool = Field(default=True, description="Use testnet")
+    EXCHANGE_API_URL: str = Field(default="", description="Base URL of a Binance-compatible API (e.g. the local fake exchange); overrides testnet")
+    MARKETS_CACHE_PATH: str = Field(default="data/markets.json", description="Market metadata cache file (empty disables)")
+    MARKETS_REFRESH_SECONDS: float = Field(default=86400.0, description="Max age of cached market metadata before refetching")
     
     # Capital and Risk Management
     INITIAL_CAPITAL: float = Field(default=500.0, description="Starting capital in USD")
     RISK_PER_TRADE: float = Field(default=2.0, description="Risk percentage per trade")
     MAX_OPEN_POSITIONS: int = Field(default=1, description="Maximum concurrent positions")
     DAILY_LOSS_LIMIT: float = Field(default=6.0, description="Daily loss limit percentage")
+    MAX_GROSS_EXPOSURE_PCT: float = Field(default=100.0, description="Max gross exposure as % of equity")
+    MAX_CORRELATION: float = Field(default=0.8, description="Max same-direction correlation with a held symbol")
+    VAR_LIMIT_PCT: float = Field(default=5.0, description="Max one-bar portfolio VaR as % of equity")
+    VAR_CONFIDENCE: float = Field(default=0.99, description="VaR confidence level")
+    RISK_RETURNS_WINDOW: int = Field(default=100, description="Returns per symbol used for correlation/VaR")
+    RISK_MAX_STALE_BARS: int = Field(
+        default=2,
+        description="Held symbols whose returns end more bars than this before the candidate's are left out of correlation/VaR"
+    )
+    
+    # Execution simulation (defaults mirror the Pine backtest)
+    EXECUTION_MODEL: str = Field(default="fees", description="Fill model: 'ideal', 'fees' or 'orderbook'")
+    COMMISSION_PCT: float = Field(default=0.04, description="Commission per side in percent")
+    SLIPPAGE_TICKS: int = Field(default=5, description="Adverse slippage in ticks (symbols with a known tick size)")
+    SLIPPAGE_BPS: float = Field(default=5.0, description="Adverse slippage in basis points of price when the tick size is unknown")
+    ORDER_BOOK_DEPTH: int = Field(default=100, description="Order book levels per side to cache")
+    ORDER_BOOK_REFRESH_SECONDS: float = Field(default=5.0, description="Order book snapshot refresh interval")
     
     # Strategy Parameters
     TIMEFRAME: str = Field(default="1h", description="Trading timeframe")
@@ -42,6 +79,65 @@ class Settings(BaseSettings):
     LOOKBACK: int = Field(default=40, description="Breakout lookback period")
     ATR_LENGTH: int = Field(default=14, description="ATR period")
     RR_RATIO: float = Field(default=2.5, description="Risk/Reward ratio")
+    TRAILING_STOP_ATR: float = Field(default=0.0, description="Trailing stop distance in ATRs; 0 disables")
+    SIGNAL_CACHE_NEGATIVE_SECONDS: float = Field(
+        default=60.0,
+        description="Seconds a 'no signal' result is reused within a bar (signals are reused until the bar closes)"
+    )
+    MAX_ENTRY_DRIFT_PCT: float = Field(
+        default=0.5,
+        description="Refuse to execute a signal once the price has moved this far past its entry, %"
+    )
+    INDICATOR_BACKEND: str = Field(
+        default="numba",
+        description="Indicator kernels: 'numba', 'talib' or 'numpy' (falls back to the fastest installed)"
+    )
+    
+    # Strategy compute offloading
+    COMPUTE_EXECUTOR: str = Field(default="process", description="Pool for strategy work: 'process' or 'thread'")
+    COMPUTE_WORKERS: int = Field(default=0, description="Compute pool size; 0 = min(4, CPU count)")
+    LOOP_LAG_INTERVAL_SECONDS: float = Field(default=0.5, description="Event-loop lag probe interval")
+    
+    # Multi-timeframe resampling
+    BASE_TIMEFRAME: str = Field(
+        default="",
+        description="Base candle resolution for derived timeframes (e.g., '1m'); empty disables"
+    )
+    BASE_HISTORY_BARS: int = Field(
+        default=7000,
+        description="Base candles kept per symbol (caps the backfill; larger requests fetch directly)"
+    )
+    MAX_RESAMPLE_RATIO: int = Field(
+        default=60,
+        description="Highest base candles per bar to resample; coarser timeframes are fetched directly"
+    )
+    INTRABAR_TIMEFRAME: str = Field(
+        default="1m",
+        description="Lower timeframe used to resolve SL/TP order inside a bar"
+    )
+    
+    # Candle Store (local columnar OHLCV for backtests)
+    CANDLE_STORE_PATH: str = Field(default="data/candles", description="Candle store root directory")
+    
+    # Equity curve recording (TimescaleDB)
+    EQUITY_RECORDING_ENABLED: bool = Field(default=True, description="Sample equity into equity_history")
+    EQUITY_SAMPLE_SECONDS: float = Field(default=10.0, description="Equity sampling interval")
+    EQUITY_MAX_POINTS: int = Field(default=1000, description="Max points returned by GET /equity")
+    
+    # Write-behind queue for trade and equity writes
+    WRITE_BEHIND_FLUSH_SECONDS: float = Field(default=1.0, description="Max delay before queued DB writes are flushed")
+    WRITE_BEHIND_MAX_BATCH: int = Field(default=500, description="Queued writes that trigger an immediate flush")
+    WRITE_BEHIND_MAX_ATTEMPTS: int = Field(default=10, description="Row-by-row retries before a failing trade write is dropped")
+    TRADE_ID_BLOCK: int = Field(default=50, description="Trade ids reserved from the sequence per round trip")
+    
+    # Performance analytics
+    ANALYTICS_RETURN_PERIOD_SECONDS: float = Field(default=86400.0, description="Return period for Sharpe/Sortino")
+    ANALYTICS_PERIODS_PER_YEAR: float = Field(default=365.0, description="Return periods per year (annualization)")
+    
+    # Live stream (Server-Sent Events)
+    STREAM_MIN_INTERVAL_SECONDS: float = Field(default=1.0, description="Minimum seconds between position/equity updates per client")
+    STREAM_HEARTBEAT_SECONDS: float = Field(default=15.0, description="Keep-alive interval for idle streams")
+    STREAM_MAX_PENDING_FILLS: int = Field(default=100, description="Fill events buffered per slow client before dropping the oldest")
     
     # Telegram Bot
     TELEGRAM_BOT_TOKEN: str = Field(default="", description="Telegram bot token")
@@ -1,17 +1,57 @@
 """
 Database setup with SQLAlchemy async support.
 """
-from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession, async_sessionmaker
+from typing import AsyncIterator, Dict
+
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import create_async_engine, AsyncConnection, AsyncSession, async_sessionmaker
 from sqlalchemy.orm import declarative_base
 from .config import settings
 
+
+def pool_options() -> Dict:
+    """
+    Engine pool and driver options from settings.
+
+    The connection budget (DB_MAX_CONNECTIONS) is split across uvicorn
+    workers (WEB_CONCURRENCY); each worker keeps a third of its share open
+    and may overflow into the rest. Instead of a pre-ping round trip on
+    every checkout, connections are recycled after DB_POOL_RECYCLE_SECONDS
+    and a connection found dead on use is invalidated by SQLAlchemy.
+
+    Returns:
+        Keyword arguments for ``create_async_engine``
+    """
+    per_worker = max(2, settings.DB_MAX_CONNECTIONS // max(1, settings.WEB_CONCURRENCY))
+    pool_size = settings.DB_POOL_SIZE or max(1, per_worker // 3)
+    options = {
+        "pool_size": pool_size,
+        "max_overflow": max(0, per_worker - pool_size),
+        "pool_timeout": settings.DB_POOL_TIMEOUT_SECONDS,
+        "pool_recycle": settings.DB_POOL_RECYCLE_SECONDS,
+        "pool_pre_ping": False,
+        "pool_use_lifo": True,  # idle surplus connections age out instead of rotating
+    }
+
+    url = make_url(settings.DATABASE_URL)
+    if url.get_backend_name() == "postgresql" and url.get_driver_name() == "asyncpg":
+        options["connect_args"] = {
+            # SQLAlchemy-side cache of asyncpg prepared statements per connection
+            "prepared_statement_cache_size": settings.DB_STATEMENT_CACHE_SIZE,
+            # asyncpg's own statement cache (used by raw asyncpg calls)
+            "statement_cache_size": settings.DB_STATEMENT_CACHE_SIZE,
+            "command_timeout": settings.DB_COMMAND_TIMEOUT_SECONDS,
+            # Short OLTP queries never benefit from JIT compilation
+            "server_settings": {"jit": "off"},
+        }
+    return options
+
+
 # Create async engine
 engine = create_async_engine(
     settings.DATABASE_URL,
     echo=False,
-    pool_pre_ping=True,
-    pool_size=10,
-    max_overflow=20
+    **pool_options()
 )
 
 # Create async session factory
@@ -45,3 +85,15 @@ async def get_db() -> AsyncSession:
             raise
         finally:
             await session.close()
+
+
+async def get_connection() -> AsyncIterator[AsyncConnection]:
+    """
+    Dependency for read-only endpoints: a bare pooled connection.
+
+    No ORM session, identity map or commit; the implicit transaction is
+    rolled back when the connection returns to the pool.
+    Usage: conn: AsyncConnection = Depends(get_connection)
+    """
+    async with engine.connect() as conn:
+        yield conn
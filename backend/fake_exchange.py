@@ -0,0 +1,401 @@
+"""
+Local Binance simulator.
+
+Serves the spot REST endpoints ``MarketDataService`` reaches through ccxt
+(exchangeInfo, klines, ticker/24hr, depth, account) from deterministic
+random-walk markets, so the fetch, caching and rate-limiting layers can be
+benchmarked and stress-tested offline. Latency, injected errors and 429s
+are configurable; request weights follow Binance's per-minute budget.
+
+Usage (from the repository root):
+    python -m backend.fake_exchange --port 8100 --latency-ms 20 --error-rate 0.01
+    EXCHANGE_API_URL=http://localhost:8100 uvicorn backend.main:app
+"""
+import argparse
+import asyncio
+import random
+import time
+import zlib
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+import uvicorn
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse
+
+from .services.replay import forming_bar
+from .services.resampler import bar_open_time, timeframe_to_ms
+
+MINUTE_MS = 60_000
+DAY_MINUTES = 1440
+# Hourly volatility of the random walks (scaled to one-minute steps)
+HOURLY_VOL = 0.01
+MAX_KLINES = 1000
+
+
+@dataclass
+class SimulatorConfig:
+    """Fake exchange behaviour."""
+    symbols: List[str] = field(default_factory=lambda: ['BTC/USDT', 'ETH/USDT', 'SOL/USDT', 'BNB/USDT', 'XRP/USDT'])
+    balance: float = 10_000.0            # free USDT reported by /account
+    latency_ms: float = 0.0              # added to every response
+    jitter_ms: float = 0.0               # uniform extra latency
+    error_rate: float = 0.0              # share of requests answered with HTTP 500
+    throttle_rate: float = 0.0           # share of requests answered with HTTP 429 regardless of weight
+    weight_limit: int = 6000             # request weight per minute (0 = unlimited)
+    history_days: int = 14               # candles available before server start
+    seed: int = 0
+
+
+def request_weight(path: str, params) -> int:
+    """Binance request weight of a call."""
+    if path.endswith('/depth'):
+        limit = int(params.get('limit', 100))
+        return 5 if limit <= 100 else 25 if limit <= 500 else 50 if limit <= 1000 else 250
+    if path.endswith('/ticker/24hr'):
+        return 2 if 'symbol' in params else 80
+    if path.endswith('/account'):
+        return 20
+    if path.endswith('/exchangeInfo'):
+        return 20
+    if path.endswith('/klines'):
+        return 2
+    return 1
+
+
+class _MinuteWalk:
+    """
+    One symbol's one-minute candles since the anchor, generated a day at a time.
+
+    Day ``k`` is drawn from its own seed and continues from the previous
+    day's close, so a market is identical for every run with the same seed
+    and anchor. All other intervals are aggregated from these candles, so
+    klines of every interval and the ticker agree.
+    """
+
+    def __init__(self, seed: int, symbol: str, anchor_ms: int):
+        self.seed = (seed, zlib.crc32(symbol.encode()))
+        self.anchor_ms = anchor_ms
+        self.days: List[np.ndarray] = []   # (5, 1440) open/high/low/close/volume
+        rng = np.random.default_rng(self.seed)
+        self.price = float(10 ** rng.uniform(-1, 4.5))
+        self.base_volume = float(1e5 / self.price)
+
+    def _generate(self, day: int) -> np.ndarray:
+        rng = np.random.default_rng(self.seed + (day,))
+        sigma = HOURLY_VOL / np.sqrt(60)
+        close = self.price * np.exp(np.cumsum(rng.normal(0, sigma, DAY_MINUTES)))
+        open_ = np.concatenate(([self.price], close[:-1]))
+        bars = np.empty((5, DAY_MINUTES))
+        bars[0] = open_
+        bars[1] = np.maximum(open_, close) * (1 + np.abs(rng.normal(0, sigma / 2, DAY_MINUTES)))
+        bars[2] = np.minimum(open_, close) * (1 - np.abs(rng.normal(0, sigma / 2, DAY_MINUTES)))
+        bars[3] = close
+        bars[4] = self.base_volume * rng.uniform(0.5, 1.5, DAY_MINUTES)
+        self.price = float(close[-1])
+        return bars
+
+    def minutes(self, start: int, stop: int) -> np.ndarray:
+        """Candles ``[start, stop)`` by minute index since the anchor, as a (5, n) copy."""
+        while len(self.days) * DAY_MINUTES < stop:
+            self.days.append(self._generate(len(self.days)))
+        first, last = start // DAY_MINUTES, (stop - 1) // DAY_MINUTES
+        block = np.concatenate(self.days[first:last + 1], axis=1)
+        offset = first * DAY_MINUTES
+        return block[:, start - offset:stop - offset].copy()
+
+
+class FakeExchange:
+    """Market state and request accounting behind the simulator app."""
+
+    def __init__(self, config: SimulatorConfig):
+        self.config = config
+        self.started_ms = int(time.time() * 1000)
+        self.anchor_ms = bar_open_time(self.started_ms - config.history_days * 86_400_000, '1d')
+        self.markets = {s.replace('/', ''): tuple(s.split('/')) for s in config.symbols}
+        self.walks: Dict[str, _MinuteWalk] = {}
+        self.random = random.Random(config.seed)
+        self.window = 0          # current weight window (epoch minute)
+        self.used_weight = 0
+        self.counts: Counter = Counter()
+
+    def walk(self, market_id: str) -> _MinuteWalk:
+        if market_id not in self.walks:
+            self.walks[market_id] = _MinuteWalk(self.config.seed, market_id, self.anchor_ms)
+        return self.walks[market_id]
+
+    def klines(
+        self,
+        market_id: str,
+        interval: str,
+        start: Optional[int],
+        end: Optional[int],
+        limit: int,
+        now_ms: int
+    ) -> Tuple[List[int], np.ndarray]:
+        """
+        Bars of ``interval`` with Binance's startTime/endTime/limit semantics.
+
+        Returns:
+            (open times, (5, n) OHLCV); the bar containing ``now_ms`` is still forming
+        """
+        step = timeframe_to_ms(interval)
+        last = bar_open_time(min(end, now_ms) if end is not None else now_ms, interval)
+        oldest = bar_open_time(self.anchor_ms, interval)
+        if start is not None:
+            first = max(bar_open_time(start + step - 1, interval), oldest)
+            last = min(last, first + (limit - 1) * step)
+        else:
+            first = max(last - (limit - 1) * step, oldest)
+        if first > last:
+            return [], np.empty((5, 0))
+
+        opens = list(range(first, last + step, step))
+        m0 = (max(first, self.anchor_ms) - self.anchor_ms) // MINUTE_MS
+        m1 = (min(last + step, now_ms) - self.anchor_ms - 1) // MINUTE_MS + 1
+        minutes = self.walk(market_id).minutes(m0, m1)
+        forming = (now_ms - self.anchor_ms) // MINUTE_MS
+        if m0 <= forming < m1:
+            o, h, l, c, v = minutes[:, forming - m0]
+            price, high, low, volume = forming_bar(o, h, l, c, v, (now_ms % MINUTE_MS) / MINUTE_MS)
+            minutes[1:, forming - m0] = (high, low, price, volume)
+
+        bounds = [(max(t, self.anchor_ms) - self.anchor_ms) // MINUTE_MS - m0 for t in opens]
+        bars = np.empty((5, len(opens)))
+        bars[0] = minutes[0, bounds]
+        bars[1] = np.maximum.reduceat(minutes[1], bounds)
+        bars[2] = np.minimum.reduceat(minutes[2], bounds)
+        bars[3] = minutes[3, [b - 1 for b in bounds[1:]] + [minutes.shape[1] - 1]]
+        bars[4] = np.add.reduceat(minutes[4], bounds)
+        return opens, bars
+
+    def charge(self, weight: int) -> Optional[int]:
+        """
+        Spend request weight.
+
+        Returns:
+            Seconds until the window resets if the budget is exceeded, else None
+        """
+        now = time.time()
+        window = int(now // 60)
+        if window != self.window:
+            self.window, self.used_weight = window, 0
+        self.used_weight += weight
+        if self.config.weight_limit and self.used_weight > self.config.weight_limit:
+            return int((window + 1) * 60 - now) + 1
+        return None
+
+
+def _error(status: int, code: int, msg: str, headers: Optional[Dict] = None) -> JSONResponse:
+    return JSONResponse({'code': code, 'msg': msg}, status_code=status, headers=headers)
+
+
+def _num(value: float) -> str:
+    return f"{value:.8f}"
+
+
+def create_app(config: Optional[SimulatorConfig] = None) -> FastAPI:
+    """
+    Build the simulator app.
+
+    Args:
+        config: Simulator behaviour (default SimulatorConfig())
+
+    Returns:
+        FastAPI app serving ``/api/v3`` plus ``/stats``
+    """
+    exchange = FakeExchange(config or SimulatorConfig())
+    cfg = exchange.config
+    app = FastAPI(title="Fake Binance", docs_url=None, redoc_url=None)
+    app.state.exchange = exchange
+
+    @app.middleware("http")
+    async def simulate_network(request: Request, call_next):
+        path = request.url.path
+        if not path.startswith('/api/'):
+            return await call_next(request)
+        exchange.counts[path] += 1
+        delay = cfg.latency_ms + exchange.random.uniform(0, cfg.jitter_ms)
+        if delay > 0:
+            await asyncio.sleep(delay / 1000)
+
+        retry_after = exchange.charge(request_weight(path, request.query_params))
+        headers = {'X-MBX-USED-WEIGHT-1M': str(exchange.used_weight)}
+        if retry_after is not None or exchange.random.random() < cfg.throttle_rate:
+            exchange.counts['429'] += 1
+            headers['Retry-After'] = str(retry_after or 1)
+            return _error(429, -1003, "Too many requests; current limit of IP is exceeded.", headers)
+        if exchange.random.random() < cfg.error_rate:
+            exchange.counts['500'] += 1
+            return _error(500, -1000, "An unknown error occurred while processing the request.", headers)
+
+        response = await call_next(request)
+        response.headers.update(headers)
+        return response
+
+    def market(symbol: str):
+        if symbol not in exchange.markets:
+            return None
+        return exchange.markets[symbol]
+
+    @app.get("/api/v3/ping")
+    async def ping():
+        return {}
+
+    @app.get("/api/v3/time")
+    async def server_time():
+        return {'serverTime': int(time.time() * 1000)}
+
+    @app.get("/api/v3/exchangeInfo")
+    async def exchange_info():
+        symbols = []
+        for market_id, (base, quote) in exchange.markets.items():
+            price = exchange.walk(market_id).minutes(0, 1)[3, 0]
+            tick = 10.0 ** (np.floor(np.log10(price)) - 4)
+            symbols.append({
+                'symbol': market_id, 'status': 'TRADING',
+                'baseAsset': base, 'baseAssetPrecision': 8,
+                'quoteAsset': quote, 'quotePrecision': 8, 'quoteAssetPrecision': 8,
+                'orderTypes': ['LIMIT', 'LIMIT_MAKER', 'MARKET', 'STOP_LOSS_LIMIT', 'TAKE_PROFIT_LIMIT'],
+                'icebergAllowed': True, 'ocoAllowed': True,
+                'isSpotTradingAllowed': True, 'isMarginTradingAllowed': False,
+                'filters': [
+                    {'filterType': 'PRICE_FILTER', 'minPrice': _num(tick), 'maxPrice': '1000000.00000000', 'tickSize': _num(tick)},
+                    {'filterType': 'LOT_SIZE', 'minQty': '0.00001000', 'maxQty': '9000000.00000000', 'stepSize': '0.00001000'},
+                    {'filterType': 'NOTIONAL', 'minNotional': '5.00000000', 'applyMinToMarket': True,
+                     'maxNotional': '9000000.00000000', 'applyMaxToMarket': False, 'avgPriceMins': 5},
+                ],
+                'permissions': ['SPOT'], 'permissionSets': [['SPOT']],
+            })
+        return {
+            'timezone': 'UTC',
+            'serverTime': int(time.time() * 1000),
+            'rateLimits': [{'rateLimitType': 'REQUEST_WEIGHT', 'interval': 'MINUTE', 'intervalNum': 1,
+                            'limit': cfg.weight_limit}],
+            'exchangeFilters': [],
+            'symbols': symbols,
+        }
+
+    @app.get("/api/v3/klines")
+    async def klines(
+        symbol: str,
+        interval: str,
+        startTime: Optional[int] = None,
+        endTime: Optional[int] = None,
+        limit: int = 500
+    ):
+        if market(symbol) is None:
+            return _error(400, -1121, "Invalid symbol.")
+        try:
+            step = timeframe_to_ms(interval)
+        except ValueError:
+            return _error(400, -1120, "Invalid interval.")
+        now_ms = int(time.time() * 1000)
+        opens, bars = exchange.klines(symbol, interval, startTime, endTime, min(max(limit, 1), MAX_KLINES), now_ms)
+        rows = bars.T.tolist()
+        return [
+            [t, _num(o), _num(h), _num(l), _num(c), _num(v), t + step - 1, _num(v * c), 0, "0", "0", "0"]
+            for t, (o, h, l, c, v) in zip(opens, rows)
+        ]
+
+    def ticker(market_id: str, now_ms: int) -> Dict:
+        opens, bars = exchange.klines(market_id, '1h', None, None, 25, now_ms)
+        last, open_ = float(bars[3, -1]), float(bars[0, 0])
+        volume = float(bars[4].sum())
+        return {
+            'symbol': market_id,
+            'priceChange': _num(last - open_),
+            'priceChangePercent': f"{(last / open_ - 1) * 100:.3f}",
+            'weightedAvgPrice': _num(float((bars[3] * bars[4]).sum()) / volume),
+            'prevClosePrice': _num(float(bars[3, -2]) if bars.shape[1] > 1 else open_),
+            'lastPrice': _num(last), 'lastQty': '1.00000000',
+            'bidPrice': _num(last), 'bidQty': '1.00000000',
+            'askPrice': _num(last), 'askQty': '1.00000000',
+            'openPrice': _num(open_),
+            'highPrice': _num(float(bars[1].max())), 'lowPrice': _num(float(bars[2].min())),
+            'volume': _num(volume), 'quoteVolume': _num(volume * last),
+            'openTime': opens[0], 'closeTime': now_ms,
+            'firstId': -1, 'lastId': -1, 'count': 0,
+        }
+
+    @app.get("/api/v3/ticker/24hr")
+    async def ticker_24hr(symbol: Optional[str] = None):
+        now_ms = int(time.time() * 1000)
+        if symbol is None:
+            return [ticker(market_id, now_ms) for market_id in exchange.markets]
+        if market(symbol) is None:
+            return _error(400, -1121, "Invalid symbol.")
+        return ticker(symbol, now_ms)
+
+    @app.get("/api/v3/depth")
+    async def depth(symbol: str, limit: int = 100):
+        if market(symbol) is None:
+            return _error(400, -1121, "Invalid symbol.")
+        now_ms = int(time.time() * 1000)
+        _, bars = exchange.klines(symbol, '1m', None, None, 1, now_ms)
+        price = float(bars[3, -1])
+        tick = price * 1e-4
+        levels = min(limit, 5000)
+        sizes = [exchange.random.uniform(0.1, 2.0) * 1e4 / price for _ in range(2 * levels)]
+        return {
+            'lastUpdateId': now_ms,
+            'bids': [[_num(price - (i + 1) * tick), _num(sizes[i])] for i in range(levels)],
+            'asks': [[_num(price + (i + 1) * tick), _num(sizes[levels + i])] for i in range(levels)],
+        }
+
+    @app.get("/api/v3/account")
+    async def account():
+        assets = sorted({asset for pair in exchange.markets.values() for asset in pair})
+        return {
+            'makerCommission': 10, 'takerCommission': 10, 'buyerCommission': 0, 'sellerCommission': 0,
+            'canTrade': True, 'canWithdraw': False, 'canDeposit': False,
+            'updateTime': int(time.time() * 1000), 'accountType': 'SPOT',
+            'balances': [
+                {'asset': asset, 'free': _num(cfg.balance if asset == 'USDT' else 0.0), 'locked': _num(0.0)}
+                for asset in assets
+            ],
+            'permissions': ['SPOT'],
+        }
+
+    @app.get("/stats")
+    async def stats():
+        """Request counters (not part of the Binance API)."""
+        return {'counts': dict(exchange.counts), 'used_weight_1m': exchange.used_weight}
+
+    return app
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Local Binance simulator")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8100)
+    parser.add_argument("--symbols", default=",".join(SimulatorConfig().symbols), help="Comma-separated pairs")
+    parser.add_argument("--extra-symbols", type=int, default=0, help="Add N synthetic XNNNN/USDT pairs")
+    parser.add_argument("--latency-ms", type=float, default=0.0)
+    parser.add_argument("--jitter-ms", type=float, default=0.0)
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Share of requests failing with 500")
+    parser.add_argument("--throttle-rate", type=float, default=0.0, help="Share of requests failing with 429")
+    parser.add_argument("--weight-limit", type=int, default=6000, help="Request weight per minute (0 = unlimited)")
+    parser.add_argument("--history-days", type=int, default=14)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    symbols = [s.strip() for s in args.symbols.split(",") if s.strip()]
+    symbols += [f"X{i:04d}/USDT" for i in range(args.extra_symbols)]
+    config = SimulatorConfig(
+        symbols=symbols,
+        latency_ms=args.latency_ms,
+        jitter_ms=args.jitter_ms,
+        error_rate=args.error_rate,
+        throttle_rate=args.throttle_rate,
+        weight_limit=args.weight_limit,
+        history_days=args.history_days,
+        seed=args.seed,
+    )
+    uvicorn.run(create_app(config), host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
@@ -6,8 +6,18 @@ from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 import uvicorn
 
-from .api.routes import router
-from .database import init_db
+import asyncio
+from typing import List, Optional
+
+from .api.routes import (
+    router, market_data, paper_engine, event_broker, performance, write_queue, compute, loop_lag
+)
+from .database import init_db, AsyncSessionLocal
+from .config import settings
+from .services.equity_recorder import EquityRecorder
+from .services.execution import FeeSlippageModel, OrderBookExecutionModel
+from .services.scheduler import PositionScheduler
+from .strategies.indicators import warm_up as warm_up_indicators
 
 app = FastAPI(
     title="Trading Bot API",
@@ -27,15 +37,101 @@ app.add_middleware(
 # Include routes
 app.include_router(router)
 
+scheduler = PositionScheduler(paper_engine, market_data, write_queue)
+equity_recorder = EquityRecorder(paper_engine, write_queue)
+
+# Loops started at startup; cancelled at shutdown (the write-behind loop is stopped instead)
+background_tasks: List[asyncio.Task] = []
+write_task: Optional[asyncio.Task] = None
+
+
+def start_background(coro) -> asyncio.Task:
+    """Run ``coro`` until shutdown."""
+    task = asyncio.create_task(coro)
+    background_tasks.append(task)
+    return task
+
 
 @app.on_event("startup")
 async def startup():
     """Initialize database on startup."""
+    global write_task
     await init_db()
     print("✓ Database initialized")
+    
+    # Running trade statistics start from the recorded history
+    async with AsyncSessionLocal() as db:
+        loaded = await performance.load_trades(db)
+    print(f"✓ Analytics loaded {loaded} closed trades")
+    
+    # Resolve (and for numba, compile) the indicator kernels before the first signal
+    print(f"✓ Indicator backend: {warm_up_indicators()}")
+    
+    # Market metadata from the on-disk cache (fetched and rewritten when stale);
+    # price ticks feed the simulated slippage
+    def apply_tick_sizes(ticks):
+        if isinstance(paper_engine.execution_model, FeeSlippageModel):
+            paper_engine.execution_model.tick_sizes.update(ticks)
+    try:
+        markets = await market_data.load_markets()
+        apply_tick_sizes(market_data.tick_sizes())
+        print(f"✓ Loaded {markets} markets")
+    except Exception as e:
+        print(f"⚠ Market metadata unavailable: {e}")
+    start_background(market_data.refresh_markets(apply_tick_sizes))
+    
+    # Keep order-book snapshots warm for depth-aware paper fills
+    if isinstance(paper_engine.execution_model, OrderBookExecutionModel):
+        start_background(paper_engine.execution_model.books.run(market_data))
+        print("✓ Order book refresher started")
+    
+    # Every worker competes for the scheduler lease; only the holder runs cycles
+    if settings.SCHEDULER_ENABLED:
+        start_background(scheduler.run())
+        print("✓ Position scheduler started")
+    
+    # Event-loop lag probe (reported by /health)
+    start_background(loop_lag.run())
+    
+    # Trade and equity writes are batched into periodic transactions
+    write_task = asyncio.create_task(write_queue.run())
+    print("✓ Write-behind queue started")
+    
+    # Equity curve samples (lease holder only)
+    if settings.EQUITY_RECORDING_ENABLED:
+        start_background(equity_recorder.run())
+        print("✓ Equity recorder started")
+    
+    # Stream clients on this worker also see writes made by other workers
+    if settings.STATE_BACKEND != "memory":
+        start_background(event_broker.follow(paper_engine))
+    
+    # Start from the shared engine state written by other workers
+    await paper_engine.sync()
     print("✓ API server ready")
 
 
+@app.on_event("shutdown")
+async def shutdown():
+    """Stop background loops, hand over scheduler leadership and close shared connections."""
+    global write_task
+    # Cancel the loops first so the scheduler and recorder cannot re-take the lease
+    tasks, background_tasks[:] = list(background_tasks), []
+    for task in tasks:
+        task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
+    
+    await equity_recorder.stop()
+    await scheduler.stop()
+    await write_queue.stop()
+    if write_task is not None:
+        await asyncio.gather(write_task, return_exceptions=True)
+        write_task = None
+    compute.shutdown()
+    await paper_engine.state_store.close()
+    await market_data.close()
+
+
 @app.get("/")
 async def root():
     """Root endpoint."""
@@ -0,0 +1,21 @@
+"""
+Equity sample model for SQLAlchemy ORM.
+One row of the paper engine's equity curve (TimescaleDB hypertable).
+"""
+from sqlalchemy import Column, Integer, Float, DateTime
+from ..database import Base
+
+
+class EquitySample(Base):
+    """Raw equity sample; aggregated by the equity_1m/1h/1d continuous aggregates."""
+    
+    __tablename__ = "equity_history"
+    
+    time = Column(DateTime, primary_key=True)
+    equity = Column(Float, nullable=False)
+    available = Column(Float, nullable=False)
+    exposure = Column(Float, nullable=False)
+    open_positions = Column(Integer, nullable=False)
+    
+    def __repr__(self):
+        return f"<EquitySample(time={self.time}, equity={self.equity})>"
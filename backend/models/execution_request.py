@@ -0,0 +1,20 @@
+"""
+Execution request model for SQLAlchemy ORM.
+Stores responses of bulk executions by idempotency key so retries replay them.
+"""
+from sqlalchemy import Column, String, DateTime, JSON
+from datetime import datetime
+from ..database import Base
+
+
+class ExecutionRequest(Base):
+    """Idempotency record for POST /execute."""
+    
+    __tablename__ = "execution_requests"
+    
+    key = Column(String(100), primary_key=True)
+    response = Column(JSON, nullable=False)
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False, index=True)
+    
+    def __repr__(self):
+        return f"<ExecutionRequest(key={self.key}, created_at={self.created_at})>"
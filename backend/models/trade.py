@@ -1,8 +1,11 @@
 """
 Trade model for SQLAlchemy ORM.
 Stores trade history with entry/exit prices, P&L, and status.
+
+Numeric columns are exposed as floats (asdecimal=False) so values are
+converted once at the DB boundary instead of as Decimal in every response.
 """
-from sqlalchemy import Column, Integer, String, Numeric, DateTime, Text
+from sqlalchemy import Column, Index, Integer, String, Numeric, DateTime, Text, text
 from datetime import datetime
 from ..database import Base
 
@@ -11,6 +14,25 @@ class Trade(Base):
     """Trade data model."""
     
     __tablename__ = "trades"
+    __table_args__ = (
+        # Matched to the hot queries (see migrations/004_trade_indexes.sql):
+        # /status and analytics scan recently closed trades for pnl
+        Index(
+            "idx_trades_closed_at_closed", "closed_at",
+            postgresql_where=text("status = 'closed'"),
+            sqlite_where=text("status = 'closed'"),
+            postgresql_include=["pnl"]
+        ),
+        # Open-trade lookup by symbol (closing positions without a trade_id)
+        Index(
+            "idx_trades_symbol_open", "symbol",
+            postgresql_where=text("status = 'open'"),
+            sqlite_where=text("status = 'open'"),
+            postgresql_include=["entry_price"]
+        ),
+        # /trades/history filtered by status, newest first
+        Index("idx_trades_status_opened_at", "status", text("opened_at DESC")),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     strategy = Column(String(50), nullable=False)
@@ -18,25 +40,25 @@ class Trade(Base):
     side = Column(String(10), nullable=False)  # 'long' or 'short'
     
     # Prices
-    entry_price = Column(Numeric(20, 8), nullable=False)
-    exit_price = Column(Numeric(20, 8), nullable=True)
-    qty = Column(Numeric(20, 8), nullable=False)
+    entry_price = Column(Numeric(20, 8, asdecimal=False), nullable=False)
+    exit_price = Column(Numeric(20, 8, asdecimal=False), nullable=True)
+    qty = Column(Numeric(20, 8, asdecimal=False), nullable=False)
     
     # Risk management
-    stop_loss = Column(Numeric(20, 8), nullable=False)
-    take_profit = Column(Numeric(20, 8), nullable=False)
+    stop_loss = Column(Numeric(20, 8, asdecimal=False), nullable=False)
+    take_profit = Column(Numeric(20, 8, asdecimal=False), nullable=False)
     
     # P&L
-    pnl = Column(Numeric(20, 8), nullable=True)
-    pnl_pct = Column(Numeric(10, 4), nullable=True)
+    pnl = Column(Numeric(20, 8, asdecimal=False), nullable=True)
+    pnl_pct = Column(Numeric(10, 4, asdecimal=False), nullable=True)
     exit_reason = Column(String(50), nullable=True)
     
     # Timestamps
     opened_at = Column(DateTime, default=datetime.utcnow, nullable=False, index=True)
-    closed_at = Column(DateTime, nullable=True, index=True)
+    closed_at = Column(DateTime, nullable=True)
     
     # Status
-    status = Column(String(20), default="open", nullable=False, index=True)  # 'open', 'closed', 'cancelled'
+    status = Column(String(20), default="open", nullable=False)  # 'open', 'closed', 'cancelled'
     notes = Column(Text, nullable=True)
     
     def __repr__(self):
@@ -0,0 +1,77 @@
+"""
+Monte Carlo robustness check of a trade sequence.
+
+Resamples closed trades (a TradingView trade-list export or the trades in
+the database) into many equity paths at the configured risk per trade and
+prints the return, max-drawdown and ruin distributions.
+
+Usage (from the repository root):
+    python -m backend.monte_carlo --csv backtest/results/trade_list_6m.csv --backtest-risk 2 --risk 1 --sims 100000
+    python -m backend.monte_carlo --db --strategy swing_trend --method permute --slippage-r 0.05
+"""
+import argparse
+import asyncio
+import time
+
+import orjson
+
+from .config import settings
+from .services.monte_carlo import METHODS, TradeSample, load_trade_sample, load_tradingview_csv, simulate
+
+
+async def _from_db(strategy) -> TradeSample:
+    from .database import AsyncSessionLocal
+    async with AsyncSessionLocal() as db:
+        return await load_trade_sample(db, strategy)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Monte Carlo drawdown and ruin analysis of closed trades")
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument("--csv", help="TradingView 'List of Trades' CSV export")
+    source.add_argument("--db", action="store_true", help="Use closed trades from the database")
+    parser.add_argument("--strategy", help="Only trades of this strategy (--db)")
+    parser.add_argument("--capital", type=float, default=None, help="Backtest starting capital (--csv)")
+    parser.add_argument("--sims", type=int, default=10_000, help="Number of simulated paths")
+    parser.add_argument("--trades", type=int, default=None, help="Trades per path (default: sample size)")
+    parser.add_argument("--method", choices=METHODS, default="bootstrap")
+    parser.add_argument("--risk", type=float, default=settings.RISK_PER_TRADE, help="Risk per trade to simulate, %%")
+    parser.add_argument(
+        "--backtest-risk", type=float, default=None,
+        help="Risk per trade the CSV backtest was run at, %% (--csv; default RISK_PER_TRADE)"
+    )
+    parser.add_argument("--slippage-r", type=float, default=0.0, help="Mean extra adverse slippage per trade, in R")
+    parser.add_argument("--ruin", type=float, default=0.5, help="Loss of starting capital counted as ruin (0.5 = 50%%)")
+    parser.add_argument("--workers", type=int, default=None, help="Processes (default: CPU count)")
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args()
+
+    if args.csv:
+        # Returns are converted to R at the backtest's own sizing, then replayed at --risk
+        sample = load_tradingview_csv(args.csv, args.capital, args.backtest_risk or settings.RISK_PER_TRADE)
+    else:
+        sample = asyncio.run(_from_db(args.strategy))
+    if not len(sample):
+        parser.error("no closed trades with a stop loss found")
+
+    started = time.perf_counter()
+    result = simulate(
+        sample,
+        simulations=args.sims,
+        trades=args.trades,
+        method=args.method,
+        risk_percent=args.risk,
+        slippage_r=args.slippage_r,
+        ruin_loss=args.ruin,
+        workers=args.workers,
+        seed=args.seed
+    )
+    report = result.report()
+    report['sample_trades'] = len(sample)
+    report['sample_mean_r'] = float(sample.r_multiple.mean())
+    report['seconds'] = round(time.perf_counter() - started, 3)
+    print(orjson.dumps(report, option=orjson.OPT_INDENT_2).decode())
+
+
+if __name__ == "__main__":
+    main()
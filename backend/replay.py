@@ -0,0 +1,225 @@
+"""
+Accelerated replay of the live stack.
+
+Runs the real FastAPI app (startup hooks, scheduler, write-behind queue,
+equity recorder, event broker) against ``ReplayMarketData`` with the shared
+clock running at N× speed, and asks for entries once per bar with a bulk
+POST /execute just before the bar closes, when the forming bar is all but
+complete. Reports throughput while it runs.
+
+The replay writes trades and resets nothing, so it only runs against a
+throwaway database (SQLite, or a database whose name contains "replay")
+with the in-memory state backend.
+
+Usage (from the repository root):
+    DATABASE_URL=sqlite+aiosqlite:///replay.db STATE_BACKEND=memory \
+        python -m backend.replay --symbols BTC/USDT,ETH/USDT --speed 3600 --bars 500
+    DATABASE_URL=sqlite+aiosqlite:///replay.db STATE_BACKEND=memory \
+        python -m backend.replay --store --symbols BTC/USDT --start 2024-01-01 --end 2024-03-01 --speed 36000
+"""
+import argparse
+import asyncio
+import logging
+import time
+from datetime import datetime, timezone
+from typing import Dict, List, Optional
+
+import httpx
+
+from .config import settings
+from .services.clock import clock
+from .services.replay import ReplayMarketData
+
+logger = logging.getLogger(__name__)
+
+# Closed bars each symbol needs before the first replayed bar (signals fetch 100)
+WARMUP_BARS = 100
+# Max symbols per POST /execute (see BulkExecuteRequest)
+BULK_LIMIT = 200
+# Simulated seconds before each bar closes at which entries are evaluated (at least)
+EVALUATE_BEFORE_CLOSE_SECONDS = 1.0
+
+
+def throwaway_database(url) -> bool:
+    """Whether ``url`` is a database a replay may fill with simulated trades."""
+    return url.get_backend_name() == 'sqlite' or 'replay' in (url.database or '')
+
+
+class ReplayRunner:
+    """Replays a ``ReplayMarketData`` through the app and measures it."""
+
+    def __init__(self, source: ReplayMarketData, speed: float, report_seconds: float = 5.0):
+        """
+        Initialize runner.
+
+        Args:
+            source: Candles to replay
+            speed: Simulated seconds per real second
+            report_seconds: Real seconds between progress reports
+        """
+        self.source = source
+        self.speed = speed
+        self.report_seconds = report_seconds
+        self.bars = 0
+        self.fills = 0
+        self.notifications = 0
+        self.latencies: List[float] = []
+        self.errors = 0
+        # Simulated seconds recent evaluations took from wake-up to response
+        self.spent: List[float] = []
+
+    def lead_seconds(self) -> float:
+        """
+        Simulated seconds before a bar's close to start evaluating it.
+
+        At high speeds a request takes minutes of simulated time, so the
+        lead covers twice the slowest recent evaluation; otherwise the
+        request would land in the next bar and see none of this bar's close.
+        Never more than half a bar.
+        """
+        spent = max(self.spent[-20:], default=0.0)
+        return min(max(EVALUATE_BEFORE_CLOSE_SECONDS, 2 * spent), self.source.bar_ms / 2000)
+
+    def _on_snapshot(self, snapshot, fills: List[Dict]):
+        self.notifications += 1
+        self.fills += len(fills)
+
+    def _install(self):
+        """
+        Point every live component at the replay source.
+
+        Raises:
+            Exception: If the configured database or state backend is a real one
+        """
+        from . import main
+        from .api import routes
+        from .database import engine
+
+        if not throwaway_database(engine.url):
+            raise Exception(
+                f"Refusing to replay into {engine.url.render_as_string(hide_password=True)}: "
+                "set DATABASE_URL to SQLite or a database named *replay*"
+            )
+        if settings.STATE_BACKEND != 'memory':
+            raise Exception("Refusing to replay with a shared state backend: set STATE_BACKEND=memory")
+
+        routes.market_data = self.source
+        main.market_data = self.source
+        main.scheduler.market_data = self.source
+        routes.paper_engine.subscribe(self._on_snapshot)
+        # The scheduler is what closes SL/TP hits between bars
+        settings.SCHEDULER_ENABLED = True
+        return main
+
+    async def _execute(self, client: httpx.AsyncClient, symbols: List[str]):
+        for i in range(0, len(symbols), BULK_LIMIT):
+            started = time.perf_counter()
+            response = await client.post("/api/v1/execute", json={"symbols": symbols[i:i + BULK_LIMIT]})
+            self.latencies.append(time.perf_counter() - started)
+            if response.status_code != 200:
+                self.errors += 1
+                logger.warning(f"POST /execute returned {response.status_code}: {response.text[:200]}")
+
+    def report(self, elapsed: float, written: int) -> Dict:
+        """Throughput since the replay started."""
+        latencies = sorted(self.latencies)
+        return {
+            'simulated': clock.utcnow().isoformat(timespec='minutes'),
+            'elapsed_seconds': round(elapsed, 2),
+            'bars': self.bars,
+            'bars_per_sec': round(self.bars / elapsed, 1) if elapsed else 0.0,
+            'trades': self.fills,
+            'trades_per_sec': round(self.fills / elapsed, 2) if elapsed else 0.0,
+            'db_writes': written,
+            'db_writes_per_sec': round(written / elapsed, 1) if elapsed else 0.0,
+            'notifications': self.notifications,
+            'execute_p50_ms': round(latencies[len(latencies) // 2] * 1000, 1) if latencies else None,
+            'execute_p95_ms': round(latencies[int(len(latencies) * 0.95)] * 1000, 1) if latencies else None,
+            'errors': self.errors,
+        }
+
+    async def run(self, warmup: int = WARMUP_BARS, max_bars: Optional[int] = None) -> Dict:
+        """
+        Replay every bar after the warmup (or the first ``max_bars``).
+
+        Returns:
+            Final throughput report
+        """
+        start_ms, end_ms = self.source.span(warmup)
+        if max_bars is not None:
+            end_ms = min(end_ms, start_ms + max_bars * self.source.bar_ms)
+        if end_ms <= start_ms:
+            raise Exception("Not enough candles to replay after the warmup")
+
+        main = self._install()
+        clock.simulate(start_ms / 1000, self.speed)
+        await main.startup()
+        write_queue = main.write_queue
+        written_before = write_queue.written
+        symbols = self.source.symbols
+        started = time.perf_counter()
+        next_report = started + self.report_seconds
+
+        try:
+            transport = httpx.ASGITransport(app=main.app)
+            async with httpx.AsyncClient(transport=transport, base_url="http://replay") as client:
+                bar_ms = start_ms
+                while bar_ms < end_ms:
+                    # Evaluate the bar just before it closes: a breakout signal
+                    # needs the bar's close, and the forming bar has it by then
+                    evaluate_at = (bar_ms + self.source.bar_ms) / 1000 - self.lead_seconds()
+                    wait = evaluate_at - clock.time()
+                    if wait > 0:
+                        await clock.sleep(wait)
+                    await self._execute(client, symbols)
+                    self.spent.append(clock.time() - evaluate_at)
+                    self.bars += len(symbols)
+                    bar_ms += self.source.bar_ms
+                    if time.perf_counter() >= next_report:
+                        next_report += self.report_seconds
+                        print(self.report(time.perf_counter() - started, write_queue.written - written_before))
+                # Let the last bar play out for the scheduler
+                await clock.sleep(max(0.0, end_ms / 1000 - clock.time()))
+            await write_queue.flush()
+            return self.report(time.perf_counter() - started, write_queue.written - written_before)
+        finally:
+            await main.shutdown()
+            clock.reset()
+
+
+def _epoch_ms(day: str) -> int:
+    return int(datetime.strptime(day, "%Y-%m-%d").replace(tzinfo=timezone.utc).timestamp() * 1000)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay candles through the live stack at N× speed")
+    parser.add_argument("--symbols", default="BTC/USDT,ETH/USDT", help="Comma-separated symbols")
+    parser.add_argument("--speed", type=float, default=3600.0, help="Simulated seconds per real second")
+    parser.add_argument("--store", action="store_true", help="Replay the candle store instead of random walks")
+    parser.add_argument("--start", help="First day to load from the store (YYYY-MM-DD)")
+    parser.add_argument("--end", help="Day after the last one to load from the store (YYYY-MM-DD)")
+    parser.add_argument("--bars", type=int, default=None, help="Bars to replay after the warmup")
+    parser.add_argument("--seed", type=int, default=0, help="Random-walk seed")
+    parser.add_argument("--report", type=float, default=5.0, help="Seconds between progress reports")
+    args = parser.parse_args()
+    logging.basicConfig(level=settings.LOG_LEVEL)
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+
+    symbols = [s.strip() for s in args.symbols.split(",") if s.strip()]
+    if args.store:
+        source = ReplayMarketData.from_store(
+            symbols,
+            start=_epoch_ms(args.start) if args.start else None,
+            end=_epoch_ms(args.end) if args.end else None
+        )
+    else:
+        bars = WARMUP_BARS + (args.bars or 500)
+        start = _epoch_ms(args.start) if args.start else _epoch_ms("2024-01-01")
+        source = ReplayMarketData.synthetic(symbols, bars, start, seed=args.seed)
+
+    result = asyncio.run(ReplayRunner(source, args.speed, args.report).run(max_bars=args.bars))
+    print(result)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,257 @@
+"""
+Performance Analytics.
+Running trade and equity statistics shared by live paper trading and backtests.
+"""
+import logging
+import math
+from typing import Dict, List, Optional
+
+from sqlalchemy import select
+
+from ..config import settings
+from ..models.trade import Trade
+from .paper_trading import EngineSnapshot
+
+logger = logging.getLogger(__name__)
+
+
+class TradeStats:
+    """
+    Closed-trade statistics updated in O(1) per trade.
+
+    Only running sums, extremes and streak counters are kept, so a report
+    costs the same after ten trades or ten thousand.
+    """
+
+    def __init__(self):
+        self.count = 0
+        self.wins = 0
+        self.losses = 0
+        self.gross_profit = 0.0
+        self.gross_loss = 0.0
+        self.largest_win = 0.0
+        self.largest_loss = 0.0
+        self.streak = 0  # > 0 consecutive wins, < 0 consecutive losses
+        self.max_win_streak = 0
+        self.max_loss_streak = 0
+
+    def add(self, pnl: float):
+        """
+        Record one closed trade.
+
+        Args:
+            pnl: Net P&L of the trade in quote currency
+        """
+        self.count += 1
+        if pnl > 0:
+            self.wins += 1
+            self.gross_profit += pnl
+            self.largest_win = max(self.largest_win, pnl)
+            self.streak = self.streak + 1 if self.streak > 0 else 1
+            self.max_win_streak = max(self.max_win_streak, self.streak)
+        elif pnl < 0:
+            self.losses += 1
+            self.gross_loss += -pnl
+            self.largest_loss = min(self.largest_loss, pnl)
+            self.streak = self.streak - 1 if self.streak < 0 else -1
+            self.max_loss_streak = max(self.max_loss_streak, -self.streak)
+        else:
+            self.streak = 0
+
+    def report(self) -> Dict:
+        """Trade statistics (ratios are None until defined)."""
+        net = self.gross_profit - self.gross_loss
+        return {
+            'total_trades': self.count,
+            'wins': self.wins,
+            'losses': self.losses,
+            'win_rate': self.wins / self.count * 100 if self.count else None,
+            'net_pnl': net,
+            'gross_profit': self.gross_profit,
+            'gross_loss': self.gross_loss,
+            'profit_factor': self.gross_profit / self.gross_loss if self.gross_loss else None,
+            'expectancy': net / self.count if self.count else None,
+            'avg_win': self.gross_profit / self.wins if self.wins else None,
+            'avg_loss': -self.gross_loss / self.losses if self.losses else None,
+            'largest_win': self.largest_win,
+            'largest_loss': self.largest_loss,
+            'current_streak': self.streak,
+            'max_win_streak': self.max_win_streak,
+            'max_loss_streak': self.max_loss_streak
+        }
+
+
+class EquityStats:
+    """
+    Drawdown and risk-adjusted return statistics updated in O(1) per sample.
+
+    Samples may arrive at any rate (every engine publish, every bar of a
+    backtest). Drawdown is tracked per sample; returns are taken per fixed
+    period (the equity change between period boundaries) and folded into
+    Welford mean/variance and a running downside sum for Sharpe/Sortino.
+    """
+
+    def __init__(self, period_seconds: Optional[float] = None, periods_per_year: Optional[float] = None):
+        """
+        Initialize stats.
+
+        Args:
+            period_seconds: Return period (default settings.ANALYTICS_RETURN_PERIOD_SECONDS)
+            periods_per_year: Annualization factor (default settings.ANALYTICS_PERIODS_PER_YEAR)
+        """
+        self.period_seconds = period_seconds or settings.ANALYTICS_RETURN_PERIOD_SECONDS
+        self.periods_per_year = periods_per_year or settings.ANALYTICS_PERIODS_PER_YEAR
+
+        self.samples = 0
+        self.last_equity: Optional[float] = None
+        self.peak = 0.0
+        self.max_drawdown = 0.0
+        self.max_drawdown_pct = 0.0
+
+        self._period: Optional[int] = None
+        self._period_open = 0.0
+        self.returns = 0
+        self._mean = 0.0
+        self._m2 = 0.0
+        self._downside_sq = 0.0
+
+    def add(self, timestamp: float, equity: float):
+        """
+        Record one equity sample.
+
+        Args:
+            timestamp: Sample time in epoch seconds (non-decreasing)
+            equity: Equity marked to market
+        """
+        period = int(timestamp // self.period_seconds)
+        if self._period is None:
+            self._period = period
+            self._period_open = equity
+        elif period != self._period:
+            if self._period_open > 0:
+                self._add_return(self.last_equity / self._period_open - 1)
+            self._period = period
+            self._period_open = self.last_equity
+
+        self.samples += 1
+        self.last_equity = equity
+        if equity > self.peak:
+            self.peak = equity
+        drawdown = self.peak - equity
+        if drawdown > self.max_drawdown:
+            self.max_drawdown = drawdown
+        if self.peak > 0:
+            self.max_drawdown_pct = max(self.max_drawdown_pct, drawdown / self.peak * 100)
+
+    def _add_return(self, r: float):
+        self.returns += 1
+        delta = r - self._mean
+        self._mean += delta / self.returns
+        self._m2 += delta * (r - self._mean)
+        if r < 0:
+            self._downside_sq += r * r
+
+    def report(self) -> Dict:
+        """Equity statistics (ratios are None until two returns exist)."""
+        sharpe = sortino = volatility = None
+        if self.returns >= 2:
+            std = math.sqrt(self._m2 / (self.returns - 1))
+            annualize = math.sqrt(self.periods_per_year)
+            volatility = std * annualize * 100
+            if std > 0:
+                sharpe = self._mean / std * annualize
+            downside = math.sqrt(self._downside_sq / self.returns)
+            if downside > 0:
+                sortino = self._mean / downside * annualize
+        drawdown = self.peak - self.last_equity if self.last_equity is not None else 0.0
+        return {
+            'equity': self.last_equity,
+            'peak_equity': self.peak,
+            'current_drawdown_pct': drawdown / self.peak * 100 if self.peak > 0 else 0.0,
+            'max_drawdown': self.max_drawdown,
+            'max_drawdown_pct': self.max_drawdown_pct,
+            'return_periods': self.returns,
+            'mean_period_return_pct': self._mean * 100 if self.returns else None,
+            'annualized_volatility_pct': volatility,
+            'sharpe': sharpe,
+            'sortino': sortino
+        }
+
+
+class PerformanceTracker:
+    """
+    Trade and equity statistics for one trading run.
+
+    Feed it from anywhere: ``record_trade``/``record_equity`` directly (a
+    backtest loop), or attach it to a ``PaperTradingEngine`` to consume
+    committed closes and published snapshots.
+    """
+
+    def __init__(self, period_seconds: Optional[float] = None, periods_per_year: Optional[float] = None):
+        """
+        Initialize tracker.
+
+        Args:
+            period_seconds: Return period for Sharpe/Sortino
+            periods_per_year: Annualization factor
+        """
+        self.trades = TradeStats()
+        self.equity = EquityStats(period_seconds, periods_per_year)
+
+    def record_trade(self, pnl: float):
+        """Record a closed trade's net P&L."""
+        self.trades.add(pnl)
+
+    def record_equity(self, timestamp: float, equity: float):
+        """Record an equity sample (epoch seconds, marked-to-market equity)."""
+        self.equity.add(timestamp, equity)
+
+    def attach(self, engine):
+        """
+        Consume closes and snapshots from a PaperTradingEngine.
+
+        With a shared state store the engine's ``sync()`` also delivers
+        fills committed on other workers, so every worker counts every close.
+        """
+        engine.subscribe(self.on_snapshot)
+
+    def on_snapshot(self, snapshot: EngineSnapshot, fills: List[Dict]):
+        """Engine listener: closed trades and marked-to-market equity."""
+        for fill in fills:
+            if fill['event'] == 'close':
+                self.record_trade(fill['pnl'])
+        self.record_equity(snapshot.published_at, snapshot.marked_equity)
+
+    async def load_trades(self, db) -> int:
+        """
+        Replay closed trades from the database (once, at startup).
+
+        Args:
+            db: AsyncSession
+
+        Returns:
+            Number of trades loaded
+        """
+        result = await db.execute(
+            select(Trade.pnl)
+            .where(Trade.status == 'closed')
+            .where(Trade.pnl.isnot(None))
+            .order_by(Trade.closed_at)
+        )
+        count = 0
+        for (pnl,) in result:
+            self.record_trade(float(pnl))
+            count += 1
+        return count
+
+    def report(self) -> Dict:
+        """
+        Full performance report.
+
+        Returns:
+            Dict with 'trades' and 'equity' sections
+        """
+        return {
+            'trades': self.trades.report(),
+            'equity': self.equity.report()
+        }
@@ -0,0 +1,86 @@
+"""
+Breakout Board.
+Per-symbol entry levels published after each closed bar and checked on every tick.
+"""
+from typing import Dict, Optional, Tuple
+
+from ..config import settings
+from ..strategies.swing_trend import BreakoutTrigger
+from .clock import clock
+from .resampler import timeframe_to_ms
+
+
+class BreakoutBoard:
+    """
+    Latest ``BreakoutTrigger`` per symbol.
+
+    ``check`` is the hot path: a dict lookup and two float comparisons per
+    price update, so thousands of symbols can be watched without running
+    the indicator pipeline. A hit only means the entry conditions may hold;
+    the caller confirms with the full strategy. Each side fires at most once
+    per bar, and a trigger stops firing once the bar it was built for closes.
+    """
+
+    def __init__(self, timeframe: Optional[str] = None):
+        """
+        Initialize board.
+
+        Args:
+            timeframe: Bar timeframe of the published triggers (default settings.TIMEFRAME)
+        """
+        self.bar_ms = timeframe_to_ms(timeframe or settings.TIMEFRAME)
+        # symbol -> (trigger, forming bar close in epoch seconds)
+        self.triggers: Dict[str, Tuple[BreakoutTrigger, float]] = {}
+        self._fired: Dict[str, set] = {}
+        self.checks = 0
+        self.hits = 0
+
+    def publish(self, symbol: str, trigger: BreakoutTrigger):
+        """Replace a symbol's trigger (no-op if it is for the same bar)."""
+        current = self.triggers.get(symbol)
+        if current is not None and current[0].bar_time >= trigger.bar_time:
+            return
+        expires = (trigger.bar_time + 2 * self.bar_ms) / 1000
+        self.triggers[symbol] = (trigger, expires)
+        self._fired[symbol] = set()
+
+    def needs_refresh(self, symbol: str, last_closed: int) -> bool:
+        """Whether ``last_closed`` (bar open time, epoch ms) is newer than the symbol's trigger."""
+        current = self.triggers.get(symbol)
+        return current is None or current[0].bar_time < last_closed
+
+    def check(self, symbol: str, price: float, now: Optional[float] = None) -> Optional[str]:
+        """
+        Test a price against a symbol's entry levels.
+
+        Args:
+            symbol: Trading pair
+            price: Latest price
+            now: Tick time in epoch seconds (default: the shared clock)
+
+        Returns:
+            'long' or 'short' the first time that side's level is crossed
+            during the bar, else None
+        """
+        self.checks += 1
+        entry = self.triggers.get(symbol)
+        if entry is None:
+            return None
+        trigger, expires = entry
+        side = trigger.side(price)
+        if side is None or side in self._fired[symbol]:
+            return None
+        if (now if now is not None else clock.time()) >= expires:
+            return None
+        self._fired[symbol].add(side)
+        self.hits += 1
+        return side
+
+    def get(self, symbol: str) -> Optional[BreakoutTrigger]:
+        """Current trigger for a symbol."""
+        entry = self.triggers.get(symbol)
+        return entry[0] if entry else None
+
+    def stats(self) -> Dict:
+        """Board counters."""
+        return {'symbols': len(self.triggers), 'checks': self.checks, 'hits': self.hits}
@@ -0,0 +1,327 @@
+"""
+Candle Store.
+Columnar on-disk OHLCV storage for backtests and optimizers.
+
+Candles are partitioned by symbol / timeframe / month and stored as plain
+NumPy ``.npy`` files that are opened with ``mmap_mode='r'``. Every column is a
+contiguous row of the on-disk array, so loading returns zero-copy float64
+views backed by the OS page cache, which is shared by all worker processes
+reading the same files.
+
+Layout::
+
+    <root>/<SYMBOL>/<timeframe>/<YYYY-MM>.ts.npy      int64  (n,)   open time, ms
+    <root>/<SYMBOL>/<timeframe>/<YYYY-MM>.ohlcv.npy   float64 (5, n) open/high/low/close/volume
+    <root>/<SYMBOL>/<timeframe>/_all.ts.npy           consolidated copy (optional)
+    <root>/<SYMBOL>/<timeframe>/_all.ohlcv.npy
+"""
+import os
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from ..config import settings
+
+OHLCV_FIELDS = ('open', 'high', 'low', 'close', 'volume')
+CONSOLIDATED = '_all'
+
+
+@dataclass(frozen=True)
+class CandleArrays:
+    """
+    Column views over a contiguous block of candles.
+
+    ``timestamp`` holds candle open times as int64 milliseconds; all other
+    columns are float64. When loaded from the store the arrays are read-only
+    memory-mapped views.
+    """
+    timestamp: np.ndarray
+    open: np.ndarray
+    high: np.ndarray
+    low: np.ndarray
+    close: np.ndarray
+    volume: np.ndarray
+
+    def __len__(self) -> int:
+        return int(self.timestamp.shape[0])
+
+    @classmethod
+    def from_matrix(cls, timestamps: np.ndarray, matrix: np.ndarray) -> "CandleArrays":
+        """Build column views from a (5, n) float64 OHLCV matrix."""
+        return cls(timestamps, matrix[0], matrix[1], matrix[2], matrix[3], matrix[4])
+
+    @classmethod
+    def from_rows(cls, rows: Sequence[Sequence[float]]) -> "CandleArrays":
+        """
+        Convert ccxt OHLCV rows ([timestamp ms, open, high, low, close, volume]).
+
+        Prices end up as rows of one (5, n) float64 block and timestamps as
+        an int64 array; nothing else is kept.
+        """
+        table = np.array(rows, dtype=np.float64).reshape(-1, 6)
+        return cls.from_matrix(table[:, 0].astype(np.int64), np.ascontiguousarray(table[:, 1:].T))
+
+    @classmethod
+    def from_frame(cls, df: pd.DataFrame) -> "CandleArrays":
+        """
+        Convert a DataFrame returned by ``MarketDataService.fetch_ohlcv``.
+
+        Args:
+            df: DataFrame with columns timestamp, open, high, low, close, volume
+
+        Returns:
+            CandleArrays with int64 ms timestamps
+        """
+        ts = df['timestamp']
+        if pd.api.types.is_datetime64_any_dtype(ts):
+            timestamps = ts.astype('datetime64[ms]').astype(np.int64).to_numpy()
+        else:
+            timestamps = ts.to_numpy(dtype=np.int64)
+        matrix = np.ascontiguousarray(
+            df[list(OHLCV_FIELDS)].to_numpy(dtype=np.float64).T
+        )
+        return cls.from_matrix(timestamps, matrix)
+
+    def slice(self, start: int, stop: int) -> "CandleArrays":
+        """Return a view over rows ``[start, stop)`` without copying."""
+        return CandleArrays(
+            self.timestamp[start:stop],
+            self.open[start:stop],
+            self.high[start:stop],
+            self.low[start:stop],
+            self.close[start:stop],
+            self.volume[start:stop],
+        )
+
+    def to_frame(self) -> pd.DataFrame:
+        """Materialize a DataFrame in the same shape as ``fetch_ohlcv`` output."""
+        return pd.DataFrame({
+            'timestamp': pd.to_datetime(self.timestamp, unit='ms'),
+            'open': self.open,
+            'high': self.high,
+            'low': self.low,
+            'close': self.close,
+            'volume': self.volume,
+        })
+
+
+def _month_key(timestamp_ms: int) -> str:
+    """Partition key (YYYY-MM, UTC) for a candle open time."""
+    return datetime.fromtimestamp(timestamp_ms / 1000, tz=timezone.utc).strftime('%Y-%m')
+
+
+def _month_bounds(key: str) -> Tuple[int, int]:
+    """Return [start, end) of a YYYY-MM partition in epoch milliseconds."""
+    year, month = (int(part) for part in key.split('-'))
+    start = datetime(year, month, 1, tzinfo=timezone.utc)
+    end = datetime(year + month // 12, month % 12 + 1, 1, tzinfo=timezone.utc)
+    return int(start.timestamp() * 1000), int(end.timestamp() * 1000)
+
+
+class CandleStore:
+    """Memory-mapped, month-partitioned OHLCV store."""
+
+    def __init__(self, root: Optional[str] = None):
+        """
+        Initialize store.
+
+        Args:
+            root: Base directory (default from settings.CANDLE_STORE_PATH)
+        """
+        self.root = Path(root or settings.CANDLE_STORE_PATH)
+        # Open memory maps keyed by file, validated against the file's mtime
+        self._mapped: Dict[Path, Tuple[int, CandleArrays]] = {}
+
+    def _dir(self, symbol: str, timeframe: str) -> Path:
+        # 'BTC/USDT' and 'BTCUSDT' map to the same directory
+        return self.root / symbol.replace('/', '').upper() / timeframe
+
+    def partitions(self, symbol: str, timeframe: str) -> List[str]:
+        """
+        List available month partitions in chronological order.
+
+        Args:
+            symbol: Trading pair (e.g., 'BTC/USDT')
+            timeframe: Candle timeframe (e.g., '1m', '1h')
+
+        Returns:
+            Sorted list of YYYY-MM keys
+        """
+        directory = self._dir(symbol, timeframe)
+        if not directory.exists():
+            return []
+        return sorted(
+            path.name[:-len('.ts.npy')]
+            for path in directory.glob('*.ts.npy')
+            if not path.name.startswith(CONSOLIDATED)
+        )
+
+    def _read(self, directory: Path, key: str) -> CandleArrays:
+        ts_path = directory / f"{key}.ts.npy"
+        mtime = ts_path.stat().st_mtime_ns
+        cached = self._mapped.get(ts_path)
+        if cached is not None and cached[0] == mtime:
+            return cached[1]
+
+        timestamps = np.load(ts_path, mmap_mode='r')
+        matrix = np.load(directory / f"{key}.ohlcv.npy", mmap_mode='r')
+        candles = CandleArrays.from_matrix(timestamps, matrix)
+        self._mapped[ts_path] = (mtime, candles)
+        return candles
+
+    @staticmethod
+    def _save(path: Path, array: np.ndarray):
+        """Write array atomically so concurrent readers never see a partial file."""
+        tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+        with open(tmp, 'wb') as f:
+            np.save(f, array)
+        os.replace(tmp, path)
+
+    def write(self, symbol: str, timeframe: str, candles: CandleArrays) -> int:
+        """
+        Merge candles into the store.
+
+        Rows are deduplicated by timestamp (incoming rows win) and kept sorted.
+        Only the month partitions touched by ``candles`` are rewritten.
+
+        Args:
+            symbol: Trading pair
+            timeframe: Candle timeframe
+            candles: Candles to store
+
+        Returns:
+            Number of rows written across touched partitions
+        """
+        if len(candles) == 0:
+            return 0
+
+        directory = self._dir(symbol, timeframe)
+        directory.mkdir(parents=True, exist_ok=True)
+
+        incoming_ts = np.asarray(candles.timestamp, dtype=np.int64)
+        incoming = np.vstack([
+            np.asarray(getattr(candles, field), dtype=np.float64) for field in OHLCV_FIELDS
+        ])
+        days = np.unique(incoming_ts // 86_400_000) * 86_400_000
+        keys = sorted({_month_key(int(day)) for day in days})
+        existing = set(self.partitions(symbol, timeframe))
+
+        written = 0
+        for key in keys:
+            start, end = _month_bounds(key)
+            mask = (incoming_ts >= start) & (incoming_ts < end)
+            if not mask.any():
+                continue
+            new_ts = incoming_ts[mask]
+            new_matrix = incoming[:, mask]
+
+            if key in existing:
+                old = self._read(directory, key)
+                old_matrix = np.vstack([getattr(old, field) for field in OHLCV_FIELDS])
+                keep = ~np.isin(old.timestamp, new_ts)
+                new_ts = np.concatenate([old.timestamp[keep], new_ts])
+                new_matrix = np.hstack([old_matrix[:, keep], new_matrix])
+
+            order = np.argsort(new_ts, kind='stable')
+            # Timestamps last: their mtime is what invalidates cached maps
+            self._save(directory / f"{key}.ohlcv.npy", np.ascontiguousarray(new_matrix[:, order]))
+            self._save(directory / f"{key}.ts.npy", np.ascontiguousarray(new_ts[order]))
+            written += int(order.shape[0])
+
+        # Consolidated copy is stale now
+        for suffix in ('.ts.npy', '.ohlcv.npy'):
+            (directory / f"{CONSOLIDATED}{suffix}").unlink(missing_ok=True)
+
+        return written
+
+    def consolidate(self, symbol: str, timeframe: str) -> int:
+        """
+        Write all partitions into a single contiguous file pair.
+
+        ``load`` serves multi-month ranges from this file as zero-copy views,
+        so optimizer workers share one page-cached copy instead of each
+        concatenating partitions into private memory. Invalidated by ``write``.
+
+        Returns:
+            Number of rows in the consolidated file
+        """
+        directory = self._dir(symbol, timeframe)
+        parts = [self._read(directory, key) for key in self.partitions(symbol, timeframe)]
+        if not parts:
+            return 0
+        timestamps = np.concatenate([p.timestamp for p in parts])
+        matrix = np.hstack([np.vstack([getattr(p, f) for f in OHLCV_FIELDS]) for p in parts])
+        self._save(directory / f"{CONSOLIDATED}.ohlcv.npy", np.ascontiguousarray(matrix))
+        self._save(directory / f"{CONSOLIDATED}.ts.npy", timestamps)
+        return int(timestamps.shape[0])
+
+    def iter_partitions(
+        self,
+        symbol: str,
+        timeframe: str,
+        start: Optional[int] = None,
+        end: Optional[int] = None
+    ) -> Iterator[CandleArrays]:
+        """
+        Yield zero-copy views per month partition overlapping ``[start, end)``.
+
+        Args:
+            symbol: Trading pair
+            timeframe: Candle timeframe
+            start: Inclusive start, epoch ms (None = beginning)
+            end: Exclusive end, epoch ms (None = end of data)
+        """
+        directory = self._dir(symbol, timeframe)
+        for key in self.partitions(symbol, timeframe):
+            part_start, part_end = _month_bounds(key)
+            if (end is not None and part_start >= end) or (start is not None and part_end <= start):
+                continue
+            yield self._clip(self._read(directory, key), start, end)
+
+    @staticmethod
+    def _clip(candles: CandleArrays, start: Optional[int], end: Optional[int]) -> CandleArrays:
+        lo = 0 if start is None else int(np.searchsorted(candles.timestamp, start, side='left'))
+        hi = len(candles) if end is None else int(np.searchsorted(candles.timestamp, end, side='left'))
+        return candles.slice(lo, hi)
+
+    def load(
+        self,
+        symbol: str,
+        timeframe: str,
+        start: Optional[int] = None,
+        end: Optional[int] = None
+    ) -> CandleArrays:
+        """
+        Load candles in ``[start, end)`` as column arrays.
+
+        Single-partition ranges and ranges served from a consolidated file are
+        zero-copy memory-mapped views; other multi-month ranges are
+        concatenated into new arrays.
+
+        Args:
+            symbol: Trading pair
+            timeframe: Candle timeframe
+            start: Inclusive start, epoch ms (None = beginning)
+            end: Exclusive end, epoch ms (None = end of data)
+
+        Returns:
+            CandleArrays (empty if nothing is stored)
+        """
+        directory = self._dir(symbol, timeframe)
+        if (directory / f"{CONSOLIDATED}.ts.npy").exists():
+            return self._clip(self._read(directory, CONSOLIDATED), start, end)
+
+        parts = [p for p in self.iter_partitions(symbol, timeframe, start, end) if len(p)]
+        if not parts:
+            empty = np.empty(0, dtype=np.float64)
+            return CandleArrays(np.empty(0, dtype=np.int64), empty, empty, empty, empty, empty)
+        if len(parts) == 1:
+            return parts[0]
+        return CandleArrays(*(
+            np.concatenate([getattr(p, field) for p in parts])
+            for field in ('timestamp',) + OHLCV_FIELDS
+        ))
@@ -0,0 +1,76 @@
+"""
+Clock.
+Process-wide time source that can be switched to accelerated simulated time for replays.
+"""
+import asyncio
+import time
+from datetime import date, datetime
+from typing import Optional
+
+
+class Clock:
+    """
+    Wall clock by default; ``simulate()`` makes it run from a chosen start at N× speed.
+
+    Live code reads time through the shared ``clock`` instance (``time``,
+    ``utcnow``, ``today``) and waits with ``sleep``/``timeout``, so a replay
+    drives the unchanged scheduler, engine, write-behind queue and equity
+    recorder: one simulated hour passes in 3600 / speed real seconds and
+    every interval shrinks by the same factor.
+    """
+
+    def __init__(self):
+        self.speed = 1.0
+        self._origin: Optional[float] = None   # simulated epoch seconds at _anchor
+        self._anchor = 0.0                     # time.monotonic() when simulation started
+
+    @property
+    def simulated(self) -> bool:
+        return self._origin is not None
+
+    def simulate(self, start: float, speed: float = 1.0):
+        """
+        Run simulated time.
+
+        Args:
+            start: Simulated epoch seconds at this instant
+            speed: Simulated seconds per real second
+        """
+        if speed <= 0:
+            raise ValueError("Clock speed must be positive")
+        self._origin = start
+        self._anchor = time.monotonic()
+        self.speed = speed
+
+    def reset(self):
+        """Return to the wall clock."""
+        self._origin = None
+        self.speed = 1.0
+
+    def time(self) -> float:
+        """Current epoch seconds."""
+        if self._origin is None:
+            return time.time()
+        return self._origin + (time.monotonic() - self._anchor) * self.speed
+
+    def utcnow(self) -> datetime:
+        """Current naive UTC datetime (like ``datetime.utcnow()``)."""
+        if self._origin is None:
+            return datetime.utcnow()
+        return datetime.utcfromtimestamp(self.time())
+
+    def today(self) -> date:
+        """Current UTC date."""
+        return self.utcnow().date()
+
+    def timeout(self, seconds: float) -> float:
+        """Real seconds to wait for ``seconds`` of clock time."""
+        return seconds / self.speed
+
+    async def sleep(self, seconds: float):
+        """Sleep for ``seconds`` of clock time."""
+        await asyncio.sleep(seconds / self.speed)
+
+
+# Shared by every service in the process
+clock = Clock()
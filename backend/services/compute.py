@@ -0,0 +1,145 @@
+"""
+Compute Offloading.
+Runs CPU-bound strategy work off the event loop and measures event-loop lag.
+"""
+import asyncio
+import logging
+import os
+import time
+from collections import deque
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Callable, Deque, Dict, Hashable, Optional
+
+import numpy as np
+
+from ..config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class ComputeExecutor:
+    """
+    Thread or process pool for strategy work, with request coalescing.
+
+    Concurrent calls with the same key (e.g. the same symbol and last
+    candle) share one computation instead of each occupying a worker.
+    Process pools keep TA-Lib and pandas, which hold the GIL, from slowing
+    the event loop; thread pools avoid pickling for light work.
+    """
+
+    def __init__(self, kind: Optional[str] = None, workers: Optional[int] = None):
+        """
+        Initialize executor (defaults from settings).
+
+        Args:
+            kind: 'process' or 'thread'
+            workers: Pool size; 0 or None means min(4, CPU count)
+        """
+        self.kind = kind or settings.COMPUTE_EXECUTOR
+        self.workers = workers or settings.COMPUTE_WORKERS or min(4, os.cpu_count() or 1)
+        if self.kind not in ('process', 'thread'):
+            raise ValueError(f"Unknown compute executor: {self.kind}")
+        self._pool: Optional[Executor] = None
+        self._inflight: Dict[Hashable, asyncio.Future] = {}
+        self.submitted = 0
+        self.coalesced = 0
+
+    @property
+    def pool(self) -> Executor:
+        """Pool, created on first use (after uvicorn has forked its workers)."""
+        if self._pool is None:
+            if self.kind == 'process':
+                self._pool = ProcessPoolExecutor(max_workers=self.workers)
+            else:
+                self._pool = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix='compute')
+        return self._pool
+
+    async def run(self, key: Optional[Hashable], fn: Callable, *args) -> Any:
+        """
+        Run ``fn(*args)`` in the pool.
+
+        Args:
+            key: Coalescing key; callers with an equal key while a call is in
+                flight await the same result (None disables coalescing)
+            fn: Picklable callable (for process pools)
+            *args: Picklable arguments
+
+        Returns:
+            fn's return value
+        """
+        if key is not None and key in self._inflight:
+            self.coalesced += 1
+            return await asyncio.shield(self._inflight[key])
+
+        self.submitted += 1
+        future = asyncio.get_running_loop().run_in_executor(self.pool, fn, *args)
+        if key is None:
+            return await future
+
+        self._inflight[key] = future
+        future.add_done_callback(lambda _: self._inflight.pop(key, None))
+        return await asyncio.shield(future)
+
+    def stats(self) -> Dict:
+        """Pool usage counters."""
+        return {
+            'kind': self.kind,
+            'workers': self.workers,
+            'in_flight': len(self._inflight),
+            'submitted': self.submitted,
+            'coalesced': self.coalesced
+        }
+
+    def shutdown(self):
+        """Stop the pool without waiting for queued work."""
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+
+
+class LoopLagMonitor:
+    """
+    Event-loop lag probe.
+
+    Sleeps for a fixed interval and records how late it wakes up; any time
+    beyond the interval is time the loop spent running something else
+    without yielding.
+    """
+
+    def __init__(self, interval: Optional[float] = None, window: int = 600):
+        """
+        Initialize monitor.
+
+        Args:
+            interval: Probe interval in seconds (default settings.LOOP_LAG_INTERVAL_SECONDS)
+            window: Number of recent samples kept for percentiles
+        """
+        self.interval = interval or settings.LOOP_LAG_INTERVAL_SECONDS
+        self.samples: Deque[float] = deque(maxlen=window)
+        self.max_lag = 0.0
+
+    async def run(self):
+        """Probe forever."""
+        while True:
+            started = time.perf_counter()
+            await asyncio.sleep(self.interval)
+            lag = max(0.0, time.perf_counter() - started - self.interval)
+            self.samples.append(lag)
+            if lag > self.max_lag:
+                self.max_lag = lag
+            if lag > 1.0:
+                logger.warning(f"Event loop blocked for {lag * 1000:.0f}ms")
+
+    def stats(self) -> Dict:
+        """Lag over the recent window, in milliseconds."""
+        if not self.samples:
+            return {'samples': 0}
+        lags = np.fromiter(self.samples, dtype=np.float64) * 1000
+        p50, p99 = np.percentile(lags, [50, 99])
+        return {
+            'samples': len(lags),
+            'last_ms': round(float(lags[-1]), 3),
+            'p50_ms': round(float(p50), 3),
+            'p99_ms': round(float(p99), 3),
+            'max_ms': round(self.max_lag * 1000, 3)
+        }
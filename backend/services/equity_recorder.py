@@ -0,0 +1,161 @@
+"""
+Equity Recorder.
+Samples the paper engine's equity curve into the write-behind queue.
+Runs on exactly one API worker at a time (the lease holder).
+"""
+import logging
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional
+
+from sqlalchemy import text
+
+from ..config import settings
+from .clock import clock
+from .paper_trading import PaperTradingEngine
+from .write_behind import WriteBehindQueue
+
+logger = logging.getLogger(__name__)
+
+# Continuous aggregates by bucket width (see migrations/003_equity_history.sql)
+EQUITY_VIEWS = {
+    '1m': ('equity_1m', timedelta(minutes=1)),
+    '1h': ('equity_1h', timedelta(hours=1)),
+    '1d': ('equity_1d', timedelta(days=1)),
+}
+
+
+class EquityRecorder:
+    """
+    Periodic equity sampler.
+
+    A sample is read from the engine's published snapshot (no lock) and
+    queued on the write-behind queue, which writes it together with pending
+    trade writes. Only the lease holder records, so several workers do not
+    write the same curve.
+    """
+
+    def __init__(
+        self,
+        engine: PaperTradingEngine,
+        writer: WriteBehindQueue,
+        sample_seconds: Optional[float] = None
+    ):
+        """
+        Initialize recorder.
+
+        Args:
+            engine: Paper trading engine (its state store provides the lease)
+            writer: Write-behind queue the samples are written through
+            sample_seconds: Sampling interval (default settings.EQUITY_SAMPLE_SECONDS)
+        """
+        self.engine = engine
+        self.writer = writer
+        self.sample_seconds = sample_seconds or settings.EQUITY_SAMPLE_SECONDS
+        self.is_leader = False
+
+    def sample(self) -> Dict:
+        """
+        Build one equity sample from the latest engine snapshot.
+
+        Returns:
+            Row dict for ``equity_history``
+        """
+        snap = self.engine.snapshot()
+        exposure = sum(abs(p['qty'] * p['current_price']) for p in snap.positions)
+        return {
+            'time': clock.utcnow(),
+            'equity': snap.marked_equity,
+            'available': snap.available,
+            'exposure': exposure,
+            'open_positions': len(snap.positions)
+        }
+
+    async def run(self):
+        """Sample forever."""
+        while True:
+            try:
+                leader = await self.engine.state_store.acquire_leadership()
+                if leader != self.is_leader:
+                    logger.info(f"Equity recorder leadership {'acquired' if leader else 'lost'}")
+                    self.is_leader = leader
+                if leader:
+                    await self.engine.sync()
+                    self.writer.add_equity(self.sample())
+            except Exception as e:
+                logger.error(f"Equity recording failed: {e}")
+            await clock.sleep(self.sample_seconds)
+
+    async def stop(self):
+        """Release the lease (buffered samples are flushed by the queue)."""
+        if self.is_leader:
+            await self.engine.state_store.release_leadership()
+            self.is_leader = False
+
+
+def pick_resolution(start: datetime, end: datetime, max_points: Optional[int] = None) -> str:
+    """
+    Finest aggregate that returns at most ``max_points`` buckets.
+
+    Args:
+        start: Range start
+        end: Range end
+        max_points: Point budget (default settings.EQUITY_MAX_POINTS)
+
+    Returns:
+        '1m', '1h' or '1d'
+    """
+    max_points = max_points or settings.EQUITY_MAX_POINTS
+    span = end - start
+    for resolution, (_, width) in EQUITY_VIEWS.items():
+        if span / width <= max_points:
+            return resolution
+    return '1d'
+
+
+async def query_equity_curve(
+    db,
+    start: datetime,
+    end: datetime,
+    resolution: str,
+    max_points: Optional[int] = None
+) -> List[Dict]:
+    """
+    Read a downsampled equity curve from the continuous aggregates.
+
+    Rows of the chosen aggregate are re-bucketed so at most ``max_points``
+    are returned; that is a scan of pre-aggregated rows only.
+
+    Args:
+        db: AsyncConnection or AsyncSession
+        start: Range start (inclusive)
+        end: Range end (exclusive)
+        resolution: '1m', '1h' or '1d'
+        max_points: Point budget (default settings.EQUITY_MAX_POINTS)
+
+    Returns:
+        List of {time, open, high, low, close, available, exposure, open_positions}
+    """
+    max_points = max_points or settings.EQUITY_MAX_POINTS
+    view, width = EQUITY_VIEWS[resolution]
+    buckets = max(1, -(-(end - start) // width))
+    bucket = width * max(1, -(-buckets // max_points))
+
+    result = await db.execute(
+        text(f"""
+            SELECT
+                time_bucket(:bucket, bucket) AS time,
+                first(open, bucket) AS open,
+                max(high) AS high,
+                min(low) AS low,
+                last(close, bucket) AS close,
+                last(available, bucket) AS available,
+                max(exposure) AS exposure,
+                max(open_positions) AS open_positions
+            FROM {view}
+            WHERE bucket >= :start AND bucket < :end
+            GROUP BY 1
+            ORDER BY 1
+        """),
+        {'bucket': bucket, 'start': start, 'end': end}
+    )
+    return [row._asdict() for row in result]
@@ -0,0 +1,224 @@
+"""
+Event Broker.
+Fans paper-engine snapshots and fills out to streaming clients.
+"""
+import asyncio
+import logging
+import time
+from collections import deque
+from typing import AsyncIterator, Deque, Dict, List, Optional, Set, Tuple
+
+from ..config import settings
+from .paper_trading import EngineSnapshot, PaperTradingEngine
+
+logger = logging.getLogger(__name__)
+
+# Position fields that change while a position is open
+MARK_FIELDS = (
+    'current_price', 'pnl', 'pnl_pct', 'stop_loss', 'take_profit', 'trailing_stop', 'trade_id', 'qty', 'cost'
+)
+
+
+def snapshot_state(snapshot: EngineSnapshot) -> Dict:
+    """
+    Streamable view of an engine snapshot.
+
+    Args:
+        snapshot: Published engine snapshot
+
+    Returns:
+        Dict with equity, available, daily P&L and positions keyed by position id
+    """
+    return {
+        'equity': snapshot.equity,
+        'available': snapshot.available,
+        'daily_pnl': snapshot.daily_pnl,
+        'positions': {p['id']: dict(p) for p in snapshot.positions}
+    }
+
+
+def diff_state(old: Dict, new: Dict) -> Dict:
+    """
+    Changes from ``old`` to ``new`` state.
+
+    New positions are sent in full, open positions send only changed mark
+    fields, and closed positions map to None.
+
+    Args:
+        old: State last sent to a client
+        new: Current state
+
+    Returns:
+        Dict of changed fields (empty if nothing changed)
+    """
+    diff = {key: new[key] for key in ('equity', 'available', 'daily_pnl') if new[key] != old[key]}
+
+    positions = {}
+    for key, position in new['positions'].items():
+        before = old['positions'].get(key)
+        if before is None:
+            positions[key] = position
+            continue
+        changed = {f: position.get(f) for f in MARK_FIELDS if position.get(f) != before.get(f)}
+        if changed:
+            positions[key] = changed
+    for key in old['positions'].keys() - new['positions'].keys():
+        positions[key] = None
+
+    if positions:
+        diff['positions'] = positions
+    return diff
+
+
+class StreamSubscription:
+    """
+    One client's view of the stream.
+
+    Fills are delivered as soon as they happen. Position marks and equity
+    are coalesced: at most one update per ``min_interval`` carrying only
+    what changed since the last update this client received.
+    """
+
+    def __init__(self, broker: "EventBroker", min_interval: float, max_pending_fills: int):
+        """
+        Initialize subscription.
+
+        Args:
+            broker: Owning broker
+            min_interval: Minimum seconds between state updates
+            max_pending_fills: Fills buffered before the oldest are dropped
+        """
+        self.broker = broker
+        self.min_interval = min_interval
+        self.fills: Deque[Dict] = deque(maxlen=max_pending_fills)
+        self.wake = asyncio.Event()
+        self.sent: Optional[Dict] = None
+        self.sent_at = 0.0
+
+    def notify(self, fills: List[Dict]):
+        """Called by the broker on every published snapshot."""
+        self.fills.extend(fills)
+        self.wake.set()
+
+    async def events(self, heartbeat: Optional[float] = None) -> AsyncIterator[Tuple[str, int, Dict]]:
+        """
+        Yield ``(event, version, data)`` tuples.
+
+        Events: 'snapshot' (full state, first), 'fill', 'update' (diff) and
+        'heartbeat' after ``heartbeat`` seconds without other events.
+
+        Args:
+            heartbeat: Keep-alive interval (default settings.STREAM_HEARTBEAT_SECONDS)
+        """
+        heartbeat = heartbeat or settings.STREAM_HEARTBEAT_SECONDS
+        version, self.sent = self.broker.latest()
+        self.sent_at = time.monotonic()
+        yield 'snapshot', version, self.sent
+
+        while True:
+            try:
+                await asyncio.wait_for(self.wake.wait(), timeout=heartbeat)
+            except asyncio.TimeoutError:
+                yield 'heartbeat', self.broker.version, {}
+                continue
+
+            # Fills go out immediately; marks are coalesced until the client's interval elapses
+            while True:
+                self.wake.clear()
+                while self.fills:
+                    yield 'fill', self.broker.version, self.fills.popleft()
+                wait = self.min_interval - (time.monotonic() - self.sent_at)
+                if wait <= 0:
+                    break
+                try:
+                    await asyncio.wait_for(self.wake.wait(), timeout=wait)
+                except asyncio.TimeoutError:
+                    break
+
+            version, state = self.broker.latest()
+            diff = diff_state(self.sent, state)
+            if diff:
+                self.sent = state
+                self.sent_at = time.monotonic()
+                yield 'update', version, diff
+
+
+class EventBroker:
+    """
+    Single fan-out point between the paper engine and streaming clients.
+
+    The engine calls ``on_snapshot`` synchronously after each publish; the
+    broker only stores the latest state and wakes subscribers, so slow
+    clients never hold up the engine.
+    """
+
+    def __init__(self, min_interval: Optional[float] = None, max_pending_fills: Optional[int] = None):
+        """
+        Initialize broker (defaults from settings).
+
+        Args:
+            min_interval: Floor for a client's update interval
+            max_pending_fills: Fills buffered per client
+        """
+        self.min_interval = min_interval or settings.STREAM_MIN_INTERVAL_SECONDS
+        self.max_pending_fills = max_pending_fills or settings.STREAM_MAX_PENDING_FILLS
+        self.subscribers: Set[StreamSubscription] = set()
+        self.version = 0
+        self._state: Dict = {'equity': 0.0, 'available': 0.0, 'daily_pnl': 0.0, 'positions': {}}
+
+    def attach(self, engine: PaperTradingEngine):
+        """Start receiving snapshots from ``engine``."""
+        self.on_snapshot(engine.snapshot(), [])
+        engine.subscribe(self.on_snapshot)
+
+    def on_snapshot(self, snapshot: EngineSnapshot, fills: List[Dict]):
+        """Engine listener: store the latest state and wake subscribers."""
+        self.version = snapshot.version
+        self._state = snapshot_state(snapshot)
+        for subscription in self.subscribers:
+            subscription.notify(fills)
+
+    async def follow(self, engine: PaperTradingEngine):
+        """
+        Background loop pulling other workers' writes into ``engine``.
+
+        Only needed with a shared state store: ``sync()`` republishes when
+        the stored version moved, together with the fills other workers
+        committed, so this worker's clients see every position change and
+        every fill.
+        """
+        while True:
+            if self.subscribers:
+                try:
+                    await engine.sync()
+                except Exception as e:
+                    logger.warning(f"Stream state sync failed: {e}")
+            await asyncio.sleep(self.min_interval)
+
+    def latest(self) -> Tuple[int, Dict]:
+        """Latest ``(version, state)``."""
+        return self.version, self._state
+
+    def subscribe(self, interval: Optional[float] = None) -> StreamSubscription:
+        """
+        Register a client.
+
+        Args:
+            interval: Requested seconds between updates (clamped to the broker floor)
+
+        Returns:
+            StreamSubscription; pass it to ``unsubscribe`` when the client leaves
+        """
+        subscription = StreamSubscription(
+            self,
+            max(interval or self.min_interval, self.min_interval),
+            self.max_pending_fills
+        )
+        self.subscribers.add(subscription)
+        logger.debug(f"Stream client connected ({len(self.subscribers)} total)")
+        return subscription
+
+    def unsubscribe(self, subscription: StreamSubscription):
+        """Remove a client."""
+        self.subscribers.discard(subscription)
+        logger.debug(f"Stream client disconnected ({len(self.subscribers)} total)")
@@ -0,0 +1,280 @@
+"""
+Execution Models.
+Turns a requested order into a simulated fill: fees, slippage and order-book depth.
+"""
+import asyncio
+import logging
+import time
+from dataclasses import dataclass
+from typing import Dict, Iterable, Optional, Set, Tuple
+
+import numpy as np
+
+from ..config import settings
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class Fill:
+    """Result of a simulated order."""
+    price: float  # average fill price
+    qty: float    # filled quantity (may be less than requested)
+    fee: float    # commission in quote currency
+
+
+class ExecutionModel:
+    """Ideal execution: fills everything at the reference price with no fees."""
+
+    def fill(self, symbol: str, side: str, qty: float, price: float) -> Fill:
+        """
+        Simulate an order.
+
+        Args:
+            symbol: Trading pair
+            side: 'buy' or 'sell'
+            qty: Requested quantity
+            price: Reference price (signal, stop or target level)
+
+        Returns:
+            Fill with average price, filled quantity and fee
+        """
+        return Fill(price=price, qty=qty, fee=0.0)
+
+    def fee(self, qty: float, price: float) -> float:
+        """Commission for a fill of ``qty`` at ``price``."""
+        return 0.0
+
+    def cost_rate(self, price: float, symbol: Optional[str] = None) -> float:
+        """Expected entry cost (fees + slippage) as a fraction of notional at ``price``."""
+        return 0.0
+
+
+class FeeSlippageModel(ExecutionModel):
+    """
+    Percentage commission plus adverse slippage.
+
+    Slippage is a fixed number of ticks for symbols whose tick size is known
+    from market metadata, and a fraction of price (basis points) otherwise:
+    a fixed absolute tick would be several percent of a sub-dollar pair.
+    """
+
+    def __init__(
+        self,
+        commission_pct: Optional[float] = None,
+        slippage_ticks: Optional[int] = None,
+        slippage_bps: Optional[float] = None
+    ):
+        """
+        Initialize model (defaults mirror the Pine backtest settings).
+
+        Args:
+            commission_pct: Commission per side in percent
+            slippage_ticks: Adverse slippage in ticks (symbols with a known tick)
+            slippage_bps: Adverse slippage in basis points of price (other symbols)
+        """
+        self.commission_pct = settings.COMMISSION_PCT if commission_pct is None else commission_pct
+        self.slippage_ticks = settings.SLIPPAGE_TICKS if slippage_ticks is None else slippage_ticks
+        self.slippage_bps = settings.SLIPPAGE_BPS if slippage_bps is None else slippage_bps
+        self.tick_sizes: Dict[str, float] = {}
+
+    def slippage(self, symbol: Optional[str], price: float) -> float:
+        """Adverse price move for one fill of ``symbol`` at ``price``."""
+        tick = self.tick_sizes.get(symbol)
+        if tick:
+            return self.slippage_ticks * tick
+        return price * self.slippage_bps / 10_000.0
+
+    def fee(self, qty: float, price: float) -> float:
+        return qty * price * self.commission_pct / 100.0
+
+    def cost_rate(self, price: float, symbol: Optional[str] = None) -> float:
+        if price <= 0:
+            return 0.0
+        return (price + self.slippage(symbol, price)) * (1 + self.commission_pct / 100.0) / price - 1
+
+    def slip(self, symbol: str, side: str, price: float) -> float:
+        """Apply slippage against the order's direction."""
+        slippage = self.slippage(symbol, price)
+        return price + slippage if side == 'buy' else price - slippage
+
+    def fill(self, symbol: str, side: str, qty: float, price: float) -> Fill:
+        fill_price = self.slip(symbol, side, price)
+        return Fill(price=fill_price, qty=qty, fee=self.fee(qty, fill_price))
+
+
+class OrderBookSnapshot:
+    """
+    One side-pair of an order book held as cumulative NumPy arrays.
+
+    Walking the book for a quantity is a binary search over cumulative size,
+    so an average fill price costs O(log depth) with no Python-level loop.
+    """
+
+    __slots__ = ('timestamp', 'best_bid', 'best_ask', '_bids', '_asks')
+
+    def __init__(self, bids: Iterable, asks: Iterable, timestamp: float):
+        """
+        Build snapshot from ccxt ``[[price, amount], ...]`` levels.
+
+        Args:
+            bids: Bid levels, best first
+            asks: Ask levels, best first
+            timestamp: Monotonic time the snapshot was taken
+        """
+        self.timestamp = timestamp
+        self._bids = self._side(bids)
+        self._asks = self._side(asks)
+        self.best_bid = float(self._bids[0][0]) if self._bids[0].size else float('nan')
+        self.best_ask = float(self._asks[0][0]) if self._asks[0].size else float('nan')
+
+    @staticmethod
+    def _side(levels: Iterable) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        book = np.asarray(list(levels), dtype=np.float64).reshape(-1, 2)
+        prices = np.ascontiguousarray(book[:, 0])
+        cum_qty = np.cumsum(book[:, 1])
+        cum_notional = np.cumsum(book[:, 0] * book[:, 1])
+        return prices, cum_qty, cum_notional
+
+    def walk(self, side: str, qty: float) -> Tuple[float, float]:
+        """
+        Average price for taking ``qty`` from the book.
+
+        Args:
+            side: 'buy' consumes asks, 'sell' consumes bids
+            qty: Quantity to take
+
+        Returns:
+            (average price, filled quantity); filled < qty when depth runs out
+        """
+        prices, cum_qty, cum_notional = self._asks if side == 'buy' else self._bids
+        if prices.size == 0 or qty <= 0:
+            return float('nan'), 0.0
+
+        filled = min(qty, float(cum_qty[-1]))
+        i = int(np.searchsorted(cum_qty, filled, side='left'))
+        before_qty = float(cum_qty[i - 1]) if i else 0.0
+        before_notional = float(cum_notional[i - 1]) if i else 0.0
+        notional = before_notional + (filled - before_qty) * float(prices[i])
+        return notional / filled, filled
+
+
+class OrderBookCache:
+    """Periodically refreshed order-book snapshots for tracked symbols."""
+
+    def __init__(self, refresh_seconds: Optional[float] = None, depth: Optional[int] = None):
+        """
+        Initialize cache.
+
+        Args:
+            refresh_seconds: Snapshot refresh interval
+            depth: Levels per side to request
+        """
+        self.refresh_seconds = refresh_seconds or settings.ORDER_BOOK_REFRESH_SECONDS
+        self.depth = depth or settings.ORDER_BOOK_DEPTH
+        self.snapshots: Dict[str, OrderBookSnapshot] = {}
+        self.symbols: Set[str] = set()
+
+    def track(self, symbol: str):
+        """Include ``symbol`` in subsequent bulk refreshes."""
+        self.symbols.add(symbol)
+
+    def get(self, symbol: str) -> Optional[OrderBookSnapshot]:
+        """
+        Get a snapshot if one is fresh enough to trade against.
+
+        Snapshots older than three refresh intervals are treated as missing.
+        """
+        self.track(symbol)
+        snapshot = self.snapshots.get(symbol)
+        if snapshot is None or time.monotonic() - snapshot.timestamp > 3 * self.refresh_seconds:
+            return None
+        return snapshot
+
+    async def refresh(self, market_data) -> int:
+        """
+        Refresh all tracked symbols in one concurrent batch.
+
+        Args:
+            market_data: MarketDataService (or compatible) instance
+
+        Returns:
+            Number of snapshots updated
+        """
+        if not self.symbols:
+            return 0
+        books = await market_data.fetch_order_books(sorted(self.symbols), limit=self.depth)
+        now = time.monotonic()
+        for symbol, book in books.items():
+            self.snapshots[symbol] = OrderBookSnapshot(book['bids'], book['asks'], now)
+        return len(books)
+
+    async def run(self, market_data):
+        """Background loop refreshing snapshots every ``refresh_seconds``."""
+        while True:
+            try:
+                await self.refresh(market_data)
+            except Exception as e:
+                logger.warning(f"Order book refresh failed: {e}")
+            await asyncio.sleep(self.refresh_seconds)
+
+
+class OrderBookExecutionModel(FeeSlippageModel):
+    """
+    Fills against cached order-book depth.
+
+    The book's price impact (average fill minus best quote) is added to the
+    reference price, and quantity beyond the visible depth is left unfilled.
+    Falls back to tick slippage when no fresh snapshot is cached.
+    """
+
+    def __init__(self, books: OrderBookCache, **kwargs):
+        """
+        Initialize model.
+
+        Args:
+            books: Order-book snapshot cache
+            **kwargs: Passed to FeeSlippageModel
+        """
+        super().__init__(**kwargs)
+        self.books = books
+
+    def fill(self, symbol: str, side: str, qty: float, price: float) -> Fill:
+        snapshot = self.books.get(symbol)
+        if snapshot is None:
+            return super().fill(symbol, side, qty, price)
+
+        avg_price, filled = snapshot.walk(side, qty)
+        if filled <= 0:
+            return Fill(price=price, qty=0.0, fee=0.0)
+
+        best = snapshot.best_ask if side == 'buy' else snapshot.best_bid
+        fill_price = price + (avg_price - best)
+        return Fill(price=fill_price, qty=filled, fee=self.fee(filled, fill_price))
+
+
+def create_execution_model(
+    name: Optional[str] = None,
+    books: Optional[OrderBookCache] = None
+) -> ExecutionModel:
+    """
+    Build the execution model selected in settings.
+
+    Args:
+        name: 'ideal', 'fees' or 'orderbook' (default settings.EXECUTION_MODEL)
+        books: Snapshot cache for the 'orderbook' model
+
+    Returns:
+        ExecutionModel instance
+
+    Raises:
+        ValueError: If the model name is unknown
+    """
+    name = name or settings.EXECUTION_MODEL
+    if name == 'ideal':
+        return ExecutionModel()
+    if name == 'fees':
+        return FeeSlippageModel()
+    if name == 'orderbook':
+        return OrderBookExecutionModel(books or OrderBookCache())
+    raise ValueError(f"Unknown execution model: {name}")
@@ -0,0 +1,143 @@
+"""
+Intrabar Fill Simulator.
+Resolves stop-loss / take-profit hits inside a bar using lower-timeframe candles.
+"""
+import logging
+from typing import Optional, Tuple
+
+import numpy as np
+
+from ..config import settings
+from .candle_store import CandleStore
+from .resampler import timeframe_to_ms
+
+logger = logging.getLogger(__name__)
+
+
+class IntrabarFillSimulator:
+    """
+    Decides which protective level a bar touched first.
+
+    When a bar's range contains only one of the levels the answer is read
+    from the bar itself. When it contains both, the simulator loads just the
+    sub-bars covering that bar from the candle store (a binary search over a
+    memory-mapped timestamp column) and scans them in order. Without sub-bar
+    data it assumes the stop was hit first, which is the conservative choice.
+    """
+
+    def __init__(self, store: Optional[CandleStore] = None, sub_timeframe: Optional[str] = None):
+        """
+        Initialize simulator.
+
+        Args:
+            store: Candle store holding lower-timeframe candles
+            sub_timeframe: Drill-down resolution (default from settings.INTRABAR_TIMEFRAME)
+        """
+        self.store = store or CandleStore()
+        self.sub_timeframe = sub_timeframe or settings.INTRABAR_TIMEFRAME
+
+    @staticmethod
+    def _touches(side: str, high: float, low: float, stop_loss: float, take_profit: float) -> Tuple[bool, bool]:
+        """Return (stop touched, target touched) for one bar."""
+        if side == 'long':
+            return low <= stop_loss, high >= take_profit
+        return high >= stop_loss, low <= take_profit
+
+    @staticmethod
+    def _gapped(side: str, open_price: float, level: float, reason: str) -> bool:
+        """Whether the bar opened beyond ``level`` (so it fills at the open)."""
+        if (side == 'long') == (reason == 'stop_loss'):
+            return open_price <= level
+        return open_price >= level
+
+    def resolve(
+        self,
+        symbol: str,
+        timeframe: str,
+        bar_open_ms: int,
+        bar_open: float,
+        bar_high: float,
+        bar_low: float,
+        side: str,
+        stop_loss: float,
+        take_profit: float
+    ) -> Optional[Tuple[str, float]]:
+        """
+        Determine the exit triggered within a bar, if any.
+
+        Args:
+            symbol: Trading pair
+            timeframe: Timeframe of the bar being evaluated (e.g., '1h')
+            bar_open_ms: Bar open time in epoch ms
+            bar_open: Bar open price
+            bar_high: Bar high price
+            bar_low: Bar low price
+            side: Position side ('long' or 'short')
+            stop_loss: Stop loss price
+            take_profit: Take profit price
+
+        Returns:
+            (exit_reason, fill_price) or None if neither level was touched
+        """
+        stop_hit, target_hit = self._touches(side, bar_high, bar_low, stop_loss, take_profit)
+        if not stop_hit and not target_hit:
+            return None
+        if stop_hit and target_hit:
+            # A gap through either level settles it at the open without drilling down
+            if self._gapped(side, bar_open, stop_loss, 'stop_loss'):
+                reason = 'stop_loss'
+            elif self._gapped(side, bar_open, take_profit, 'take_profit'):
+                reason = 'take_profit'
+            else:
+                reason = self._first_touch(symbol, timeframe, bar_open_ms, side, stop_loss, take_profit)
+        else:
+            reason = 'stop_loss' if stop_hit else 'take_profit'
+
+        level = stop_loss if reason == 'stop_loss' else take_profit
+        fill = bar_open if self._gapped(side, bar_open, level, reason) else level
+        return reason, fill
+
+    def _first_touch(
+        self,
+        symbol: str,
+        timeframe: str,
+        bar_open_ms: int,
+        side: str,
+        stop_loss: float,
+        take_profit: float
+    ) -> str:
+        """Scan sub-bars of one bar for the first level touched."""
+        if timeframe_to_ms(self.sub_timeframe) >= timeframe_to_ms(timeframe):
+            return 'stop_loss'
+
+        sub = self.store.load(
+            symbol,
+            self.sub_timeframe,
+            start=bar_open_ms,
+            end=bar_open_ms + timeframe_to_ms(timeframe)
+        )
+        if len(sub) == 0:
+            logger.debug(f"No {self.sub_timeframe} candles for {symbol} at {bar_open_ms}, assuming stop first")
+            return 'stop_loss'
+
+        if side == 'long':
+            stop_mask = sub.low <= stop_loss
+            target_mask = sub.high >= take_profit
+        else:
+            stop_mask = sub.high >= stop_loss
+            target_mask = sub.low <= take_profit
+
+        n = len(sub)
+        first_stop = int(np.argmax(stop_mask)) if stop_mask.any() else n
+        first_target = int(np.argmax(target_mask)) if target_mask.any() else n
+
+        if first_target < first_stop:
+            return 'take_profit'
+        if first_stop < first_target:
+            return 'stop_loss'
+
+        # Both inside one sub-bar: the level nearer its open is assumed first
+        sub_open = float(sub.open[first_stop])
+        if abs(take_profit - sub_open) < abs(stop_loss - sub_open):
+            return 'take_profit'
+        return 'stop_loss'
@@ -2,45 +2,247 @@
 Market Data Service.
 Fetches OHLCV data and ticker information from Binance via ccxt.
 """
+import asyncio
+import logging
+import os
+import time
+from pathlib import Path
 import ccxt.async_support as ccxt
+from ccxt.base.decimal_to_precision import DECIMAL_PLACES
+import orjson
 import pandas as pd
 from datetime import datetime
-from typing import Dict, Optional
+from typing import Callable, Dict, List, Optional, Tuple
 from ..config import settings
+from .candle_store import CandleArrays
+from .clock import clock
+from .resampler import TimeframeResampler, derives_from, timeframe_to_ms
+
+# Max candles Binance returns per klines request
+MAX_FETCH_LIMIT = 1000
+
+logger = logging.getLogger(__name__)
+
+# ccxt clients by (process, endpoint, key); see shared_exchange()
+_clients: Dict[Tuple, ccxt.binance] = {}
+
+
+def _price_filter_tick(market: Dict) -> Optional[float]:
+    """``tickSize`` of a Binance market's PRICE_FILTER, if the raw info carries one."""
+    for entry in (market.get('info') or {}).get('filters') or ():
+        if entry.get('filterType') == 'PRICE_FILTER' and entry.get('tickSize'):
+            return float(entry['tickSize'])
+    return None
+
+
+def exchange_endpoint() -> str:
+    """Identifies the configured exchange API (cached markets are only valid for it)."""
+    if settings.EXCHANGE_API_URL:
+        return settings.EXCHANGE_API_URL.rstrip('/')
+    return 'binance-testnet' if settings.EXCHANGE_TESTNET else 'binance'
+
+
+def _create_exchange() -> ccxt.binance:
+    exchange = ccxt.binance({
+        'apiKey': settings.EXCHANGE_API_KEY,
+        'secret': settings.EXCHANGE_API_SECRET,
+        'enableRateLimit': True,
+        'options': {
+            'defaultType': 'spot',
+        }
+    })
+    
+    # Local/alternative Binance-compatible API (spot endpoints only)
+    if settings.EXCHANGE_API_URL:
+        base = settings.EXCHANGE_API_URL.rstrip('/') + '/api/v3'
+        exchange.urls['api'] = {'public': base, 'private': base}
+        exchange.options['fetchMarkets'] = ['spot']
+        exchange.options['fetchCurrencies'] = False
+    # Use testnet if enabled
+    elif settings.EXCHANGE_TESTNET:
+        exchange.set_sandbox_mode(True)
+        # Override with testnet URL
+        exchange.urls['api'] = {
+            'public': 'https://testnet.binance.vision/api/v3',
+            'private': 'https://testnet.binance.vision/api/v3',
+        }
+    return exchange
+
+
+def shared_exchange() -> ccxt.binance:
+    """
+    The process-wide ccxt client for the configured exchange.
+    
+    Every ``MarketDataService`` in a process uses it, so market metadata is
+    loaded once and requests share one aiohttp session, whose keep-alive
+    connections are reused instead of reconnecting (and re-handshaking TLS)
+    per call. Forked workers get their own client.
+    """
+    key = (os.getpid(), exchange_endpoint(), settings.EXCHANGE_API_KEY)
+    exchange = _clients.get(key)
+    if exchange is None:
+        exchange = _clients[key] = _create_exchange()
+    return exchange
 
 
 class MarketDataService:
     """Market data service using ccxt for Binance integration."""
     
     def __init__(self):
-        """Initialize ccxt exchange instance."""
-        self.exchange = ccxt.binance({
-            'apiKey': settings.EXCHANGE_API_KEY,
-            'secret': settings.EXCHANGE_API_SECRET,
-            'enableRateLimit': True,
+        """Initialize service (the ccxt client is shared, see ``shared_exchange``)."""
+        # Base-resolution candle buffers per symbol (empty when resampling is off)
+        self.base_timeframe = settings.BASE_TIMEFRAME
+        self._resamplers: Dict[str, TimeframeResampler] = {}
+        self._resample_locks: Dict[str, asyncio.Lock] = {}
+        
+        # On-disk market metadata (precision, limits) shared across restarts and workers
+        self.markets_cache = Path(settings.MARKETS_CACHE_PATH) if settings.MARKETS_CACHE_PATH else None
+        self.markets_refresh_seconds = settings.MARKETS_REFRESH_SECONDS
+    
+    @property
+    def exchange(self) -> ccxt.binance:
+        return shared_exchange()
+    
+    def _read_markets_cache(self) -> Optional[Dict]:
+        """Cached markets for this endpoint, or None if missing/unreadable."""
+        if self.markets_cache is None or not self.markets_cache.exists():
+            return None
+        try:
+            cached = orjson.loads(self.markets_cache.read_bytes())
+        except (OSError, orjson.JSONDecodeError) as e:
+            logger.warning(f"Ignoring unreadable markets cache {self.markets_cache}: {e}")
+            return None
+        if cached.get('endpoint') != exchange_endpoint():
+            return None
+        return cached
+    
+    def _write_markets_cache(self):
+        """Atomically replace the cache file with the client's current markets."""
+        if self.markets_cache is None:
+            return
+        exchange = self.exchange
+        payload = {
+            'endpoint': exchange_endpoint(),
+            'saved_at': time.time(),
+            'markets': exchange.markets,
+            'currencies': exchange.currencies or {},
+            'base_currencies': exchange.baseCurrencies or {},
+            'quote_currencies': exchange.quoteCurrencies or {},
             'options': {
-                'defaultType': 'spot',
-            }
-        })
-        
-        # Use testnet if enabled
-        if settings.EXCHANGE_TESTNET:
-            self.exchange.set_sandbox_mode(True)
-            # Override with testnet URL
-            self.exchange.urls['api'] = {
-                'public': 'https://testnet.binance.vision/api/v3',
-                'private': 'https://testnet.binance.vision/api/v3',
-            }
+                name: exchange.options.get(name)
+                for name in exchange.options.get('marketHelperProps', [])
+            },
+        }
+        try:
+            self.markets_cache.parent.mkdir(parents=True, exist_ok=True)
+            tmp = self.markets_cache.with_name(f"{self.markets_cache.name}.{os.getpid()}.tmp")
+            tmp.write_bytes(orjson.dumps(payload))
+            os.replace(tmp, self.markets_cache)
+        except OSError as e:
+            logger.warning(f"Could not write markets cache {self.markets_cache}: {e}")
     
-    async def fetch_ohlcv(
+    def _restore_markets(self, cached: Dict):
+        """
+        Install cached markets through ccxt's ``set_markets``.
+        
+        Passing the cached currencies skips deriving them from the markets
+        again; the base/quote indexes that ``set_markets`` only builds in
+        that case are restored from the cache.
+        """
+        exchange = self.exchange
+        exchange.set_markets(cached['markets'], cached['currencies'] or None)
+        if cached['currencies']:
+            exchange.baseCurrencies = cached['base_currencies']
+            exchange.quoteCurrencies = cached['quote_currencies']
+        exchange.options.update(cached['options'])
+    
+    async def load_markets(self, refresh: bool = False) -> int:
+        """
+        Load market metadata (precision, limits) into the shared client.
+        
+        A cache file younger than ``MARKETS_REFRESH_SECONDS`` is used without
+        contacting the exchange; otherwise markets are fetched and the file
+        rewritten. If the fetch fails, a stale cache is used rather than
+        failing startup.
+        
+        Args:
+            refresh: Fetch from the exchange even if the cache is fresh
+        
+        Returns:
+            Number of markets loaded
+        """
+        cached = None if refresh else self._read_markets_cache()
+        if cached is not None and time.time() - cached['saved_at'] < self.markets_refresh_seconds:
+            self._restore_markets(cached)
+            return len(self.exchange.markets)
+        
+        try:
+            await self.exchange.load_markets(reload=True)
+        except Exception as e:
+            stale = cached or self._read_markets_cache()
+            if stale is None:
+                raise Exception(f"Error loading markets: {str(e)}")
+            logger.warning(f"Using stale markets cache after failed refresh: {e}")
+            self._restore_markets(stale)
+            return len(self.exchange.markets)
+        self._write_markets_cache()
+        return len(self.exchange.markets)
+    
+    async def refresh_markets(self, on_refresh: Optional[Callable[[Dict[str, float]], None]] = None):
+        """
+        Reload markets from the exchange every ``MARKETS_REFRESH_SECONDS``.
+        
+        Args:
+            on_refresh: Called with the new ``tick_sizes()`` after each reload
+        """
+        while True:
+            await asyncio.sleep(self.markets_refresh_seconds)
+            try:
+                await self.load_markets(refresh=True)
+                if on_refresh is not None:
+                    on_refresh(self.tick_sizes())
+            except Exception as e:
+                logger.error(f"Markets refresh failed: {e}")
+    
+    def tick_sizes(self) -> Dict[str, float]:
+        """
+        Price tick per loaded market.
+        
+        Taken from the exchange's PRICE_FILTER ``tickSize`` when present.
+        Otherwise it is derived from ``precision.price``, which the pinned
+        ccxt reports for Binance as a number of decimal places
+        (``precisionMode == DECIMAL_PLACES``), not as a tick.
+        
+        Returns:
+            Dict of symbol -> tick size (empty before markets are loaded)
+        """
+        exchange = self.exchange
+        ticks = {}
+        for symbol, market in (exchange.markets or {}).items():
+            tick = _price_filter_tick(market)
+            if tick is None:
+                precision = (market.get('precision') or {}).get('price')
+                if precision is None:
+                    continue
+                precision = float(precision)
+                tick = 10.0 ** -precision if exchange.precisionMode == DECIMAL_PLACES else precision
+            if tick > 0:
+                ticks[symbol] = tick
+        return ticks
+    
+    async def fetch_candles(
         self,
         symbol: str,
         timeframe: str = "1h",
         limit: int = 100,
         since: Optional[int] = None
-    ) -> pd.DataFrame:
+    ) -> CandleArrays:
         """
-        Fetch OHLCV data from exchange.
+        Fetch OHLCV data from exchange as contiguous arrays.
+        
+        This is what the strategy path consumes: int64 ms timestamps and
+        float64 columns built in one copy, with no DataFrame or datetime
+        conversion per call.
         
         Args:
             symbol: Trading pair (e.g., 'BTC/USDT')
@@ -49,8 +251,11 @@ class MarketDataService:
             since: Unix timestamp to fetch from
         
         Returns:
-            DataFrame with columns: timestamp, open, high, low, close, volume
+            CandleArrays (last row is the still-forming candle)
         """
+        if since is None and self._can_resample(timeframe, limit):
+            return await self.fetch_resampled_candles(symbol, timeframe, limit)
+        
         try:
             ohlcv = await self.exchange.fetch_ohlcv(
                 symbol=symbol,
@@ -58,18 +263,109 @@ class MarketDataService:
                 limit=limit,
                 since=since
             )
-            
-            # Convert to DataFrame
-            df = pd.DataFrame(
-                ohlcv,
-                columns=['timestamp', 'open', 'high', 'low', 'close', 'volume']
-            )
-            
-            # Convert timestamp to datetime
-            df['timestamp'] = pd.to_datetime(df['timestamp'], unit='ms')
-            
-            return df
-            
+            return CandleArrays.from_rows(ohlcv)
+        except Exception as e:
+            raise Exception(f"Error fetching OHLCV data: {str(e)}")
+    
+    async def fetch_ohlcv(
+        self,
+        symbol: str,
+        timeframe: str = "1h",
+        limit: int = 100,
+        since: Optional[int] = None
+    ) -> pd.DataFrame:
+        """
+        Fetch OHLCV data from exchange.
+        
+        Args:
+            symbol: Trading pair (e.g., 'BTC/USDT')
+            timeframe: Candle timeframe (e.g., '1h', '4h', '1d')
+            limit: Number of candles to fetch
+            since: Unix timestamp to fetch from
+        
+        Returns:
+            DataFrame with columns: timestamp, open, high, low, close, volume
+        """
+        candles = await self.fetch_candles(symbol, timeframe, limit, since)
+        return candles.to_frame()
+    
+    def _can_resample(self, timeframe: str, limit: int) -> bool:
+        """
+        Whether ``timeframe`` is served from the base-resolution stream.
+        
+        Timeframes far above the base (more than MAX_RESAMPLE_RATIO base
+        candles per bar) or requests whose backfill would exceed
+        BASE_HISTORY_BARS are fetched directly: one request at the target
+        timeframe is cheaper than paging through thousands of base candles.
+        """
+        if not self.base_timeframe or not derives_from(timeframe, self.base_timeframe):
+            return False
+        ratio = timeframe_to_ms(timeframe) // timeframe_to_ms(self.base_timeframe)
+        return ratio <= settings.MAX_RESAMPLE_RATIO and (limit + 1) * ratio <= settings.BASE_HISTORY_BARS
+    
+    async def fetch_resampled_candles(
+        self,
+        symbol: str,
+        timeframe: str,
+        limit: int = 100
+    ) -> CandleArrays:
+        """
+        Get OHLCV bars derived from the base-resolution candle stream.
+        
+        The base stream is synced incrementally (only candles newer than the
+        last one held are requested), so every timeframe for a symbol is
+        served from one exchange fetch and stays consistent with the others.
+        
+        Args:
+            symbol: Trading pair (e.g., 'BTC/USDT')
+            timeframe: Base or higher timeframe that is a multiple of the base
+            limit: Number of bars to return (``(limit + 1) * ratio`` base
+                candles must fit in BASE_HISTORY_BARS, see ``_can_resample``)
+        
+        Returns:
+            CandleArrays
+        """
+        ratio = timeframe_to_ms(timeframe) // timeframe_to_ms(self.base_timeframe)
+        # One extra bar absorbs an incomplete leading bucket
+        needed = (limit + 1) * ratio
+        
+        lock = self._resample_locks.setdefault(symbol, asyncio.Lock())
+        async with lock:
+            resampler = self._resamplers.get(symbol)
+            if resampler is None:
+                resampler = TimeframeResampler(self.base_timeframe, max_base_bars=settings.BASE_HISTORY_BARS)
+                self._resamplers[symbol] = resampler
+            await self._sync_base(symbol, resampler, needed)
+            rows = resampler.bars(timeframe, limit)
+        
+        return CandleArrays.from_rows(rows)
+    
+    async def _sync_base(self, symbol: str, resampler: TimeframeResampler, needed: int):
+        """
+        Fetch base candles newer than the resampler's last candle.
+        
+        On first use, backfills ``needed`` candles page by page. Afterwards
+        the last held candle is re-requested so its final values replace the
+        still-forming version.
+        """
+        base_ms = resampler.base_ms
+        since = resampler.last_timestamp
+        if since is None:
+            now_ms = int(clock.time() * 1000)
+            since = now_ms - needed * base_ms
+        
+        try:
+            while True:
+                page: List[List[float]] = await self.exchange.fetch_ohlcv(
+                    symbol=symbol,
+                    timeframe=self.base_timeframe,
+                    limit=MAX_FETCH_LIMIT,
+                    since=since
+                )
+                resampler.ingest(page)
+                if len(page) < MAX_FETCH_LIMIT:
+                    break
+                since = int(page[-1][0]) + base_ms
         except Exception as e:
             raise Exception(f"Error fetching OHLCV data: {str(e)}")
     
@@ -89,6 +385,27 @@ class MarketDataService:
         except Exception as e:
             raise Exception(f"Error fetching ticker: {str(e)}")
     
+    async def fetch_order_books(self, symbols: List[str], limit: int = 100) -> Dict[str, Dict]:
+        """
+        Fetch order books for several symbols concurrently.
+        
+        Args:
+            symbols: Trading pairs
+            limit: Depth per side
+        
+        Returns:
+            Dict of symbol -> ccxt order book (symbols that failed are omitted)
+        """
+        results = await asyncio.gather(
+            *(self.exchange.fetch_order_book(symbol, limit=limit) for symbol in symbols),
+            return_exceptions=True
+        )
+        return {
+            symbol: book
+            for symbol, book in zip(symbols, results)
+            if not isinstance(book, Exception)
+        }
+    
     async def get_balance(self, currency: str = "USDT") -> float:
         """
         Get account balance for specific currency.
@@ -106,5 +423,7 @@ class MarketDataService:
             raise Exception(f"Error fetching balance: {str(e)}")
     
     async def close(self):
-        """Close exchange connection."""
-        await self.exchange.close()
+        """Close the shared client; the next call in this process creates a new one."""
+        exchange = self.exchange
+        _clients.pop(next(k for k, v in _clients.items() if v is exchange), None)
+        await exchange.close()
@@ -0,0 +1,285 @@
+"""
+Monte Carlo Risk Analysis.
+Resamples closed-trade results to estimate drawdown and ruin distributions for the risk sizing.
+"""
+import csv
+import os
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import Dict, Iterable, Optional, Sequence, Tuple
+
+import numpy as np
+from sqlalchemy import select
+
+from ..config import settings
+from ..models.trade import Trade
+
+METHODS = ('bootstrap', 'permute')
+# Simulations per vectorized block (block x trades float64 arrays stay cache-friendly)
+BLOCK_SIMS = 4096
+# Below this many simulations a process pool costs more than it saves
+MIN_PARALLEL_SIMS = 20_000
+
+
+@dataclass(frozen=True)
+class TradeSample:
+    """
+    Closed trades as position-size-independent results.
+
+    ``r_multiple`` is P&L in units of the risk taken (1.0 = won the stop
+    distance); ``stop_fraction`` is the stop distance as a fraction of the
+    entry price. ``calculate_position_size`` risks ``risk`` of equity but
+    caps the position at the available capital, so a trade moves equity by
+    ``min(risk, stop_fraction) * r_multiple``.
+    """
+    r_multiple: np.ndarray
+    stop_fraction: np.ndarray
+
+    def __len__(self) -> int:
+        return int(self.r_multiple.shape[0])
+
+    @classmethod
+    def from_trades(cls, trades: Iterable) -> "TradeSample":
+        """
+        Build from closed trades (ORM rows or dicts with entry_price, stop_loss, qty, pnl).
+
+        Trades without a stop distance or P&L are skipped.
+        """
+        r_multiples, fractions = [], []
+        for trade in trades:
+            get = trade.get if isinstance(trade, dict) else lambda name: getattr(trade, name)
+            entry, stop, qty, pnl = get('entry_price'), get('stop_loss'), get('qty'), get('pnl')
+            risk = abs(entry - stop) * qty if None not in (entry, stop, qty) else 0.0
+            if not risk or pnl is None:
+                continue
+            r_multiples.append(pnl / risk)
+            fractions.append(abs(entry - stop) / entry)
+        return cls(np.array(r_multiples, dtype=np.float64), np.array(fractions, dtype=np.float64))
+
+    @classmethod
+    def from_equity_returns(cls, returns: Sequence[float], risk_percent: Optional[float] = None) -> "TradeSample":
+        """
+        Build from per-trade returns on equity taken at ``risk_percent`` sizing.
+
+        Stop distances are unknown, so the capital cap is not modelled.
+        """
+        risk = (risk_percent or settings.RISK_PER_TRADE) / 100.0
+        r_multiples = np.asarray(returns, dtype=np.float64) / risk
+        return cls(r_multiples, np.full(r_multiples.shape, np.inf))
+
+
+async def load_trade_sample(db, strategy: Optional[str] = None) -> TradeSample:
+    """
+    Closed trades from the database.
+
+    Args:
+        db: AsyncSession
+        strategy: Only trades of this strategy (default: all)
+
+    Returns:
+        TradeSample in close order
+    """
+    query = (
+        select(Trade.entry_price, Trade.stop_loss, Trade.qty, Trade.pnl)
+        .where(Trade.status == 'closed')
+        .where(Trade.pnl.isnot(None))
+        .order_by(Trade.closed_at)
+    )
+    if strategy:
+        query = query.where(Trade.strategy == strategy)
+    result = await db.execute(query)
+    return TradeSample.from_trades(row._asdict() for row in result)
+
+
+def load_tradingview_csv(path: str, initial_capital: Optional[float] = None,
+                         risk_percent: Optional[float] = None) -> TradeSample:
+    """
+    Trades from a TradingView "List of Trades" CSV export.
+
+    Each trade's profit column (e.g. "Profit USDT" or "Net P&L USDT") is
+    divided by the equity before it, starting at ``initial_capital``.
+
+    Args:
+        path: CSV file (see backtest/INSTRUCTIONS.md)
+        initial_capital: Backtest starting capital (default settings.INITIAL_CAPITAL)
+        risk_percent: Risk per trade the backtest used (default settings.RISK_PER_TRADE)
+
+    Returns:
+        TradeSample in trade order
+    """
+    with open(path, newline='', encoding='utf-8-sig') as f:
+        rows = list(csv.DictReader(f))
+    if not rows:
+        raise Exception(f"No trades in {path}")
+    columns = list(rows[0])
+    profit = next((c for c in columns if c.startswith(('Profit', 'Net P&L')) and '%' not in c), None)
+    if profit is None or 'Type' not in columns:
+        raise Exception(f"Not a TradingView trade list (columns: {', '.join(columns)})")
+
+    equity = initial_capital or settings.INITIAL_CAPITAL
+    exits = sorted(
+        (row for row in rows if row['Type'].lower().startswith('exit')),
+        key=lambda row: int(row.get('Trade #') or 0)
+    )
+    returns = []
+    for row in exits:
+        pnl = float(row[profit].replace(',', ''))
+        returns.append(pnl / equity)
+        equity += pnl
+    return TradeSample.from_equity_returns(returns, risk_percent)
+
+
+def _simulate_block(
+    r_multiple: np.ndarray,
+    weight: np.ndarray,
+    sims: int,
+    trades: int,
+    method: str,
+    slippage_r: float,
+    seed: np.random.SeedSequence
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Simulate ``sims`` equity paths of ``trades`` trades (equity starts at 1).
+
+    Returns:
+        (final equity, max drawdown fraction, lowest equity) per path
+    """
+    rng = np.random.default_rng(seed)
+    n = r_multiple.shape[0]
+    if method == 'permute':
+        idx = rng.permuted(np.broadcast_to(np.arange(n), (sims, n)), axis=1)
+    else:
+        idx = rng.integers(0, n, size=(sims, trades))
+
+    path = r_multiple[idx]
+    if slippage_r > 0:
+        path -= rng.uniform(0, 2 * slippage_r, size=path.shape)
+    path *= weight[idx]
+    path += 1.0
+    np.maximum(path, 0.0, out=path)          # a position cannot lose more than the account
+    np.cumprod(path, axis=1, out=path)
+
+    final = path[:, -1].copy()
+    lowest = np.minimum(path.min(axis=1), 1.0)
+    peak = np.maximum.accumulate(path, axis=1)
+    np.maximum(peak, 1.0, out=peak)
+    np.divide(path, peak, out=path)
+    max_drawdown = 1.0 - path.min(axis=1)
+    return final, np.maximum(max_drawdown, 0.0), lowest
+
+
+def _simulate_chunk(args) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Process-pool entry point: several blocks with independent seeds."""
+    r_multiple, weight, sizes, trades, method, slippage_r, seeds = args
+    parts = [
+        _simulate_block(r_multiple, weight, size, trades, method, slippage_r, seed)
+        for size, seed in zip(sizes, seeds)
+    ]
+    return tuple(np.concatenate(column) for column in zip(*parts))
+
+
+@dataclass(frozen=True)
+class MonteCarloResult:
+    """Per-simulation outcomes (equity as a multiple of starting capital)."""
+    final_equity: np.ndarray
+    max_drawdown: np.ndarray
+    lowest_equity: np.ndarray
+    trades: int
+    risk: float
+    ruin_loss: float
+
+    @property
+    def simulations(self) -> int:
+        return int(self.final_equity.shape[0])
+
+    @property
+    def ruined(self) -> np.ndarray:
+        """Paths that lost ``ruin_loss`` of starting capital at some point."""
+        return self.lowest_equity <= 1.0 - self.ruin_loss
+
+    def report(
+        self,
+        percentiles: Sequence[float] = (1, 5, 25, 50, 75, 95, 99),
+        drawdowns: Sequence[float] = (0.1, 0.2, 0.3, 0.5)
+    ) -> Dict:
+        """
+        Distribution summary.
+
+        Args:
+            percentiles: Percentiles of return and max drawdown to report
+            drawdowns: Max-drawdown levels to report exceedance probabilities for
+
+        Returns:
+            Dict with return/drawdown percentiles (in %) and probabilities
+        """
+        returns = (self.final_equity - 1.0) * 100
+        drawdown = self.max_drawdown * 100
+        return {
+            'simulations': self.simulations,
+            'trades': self.trades,
+            'risk_per_trade_pct': self.risk * 100,
+            'return_pct': {f"p{p:g}": float(v) for p, v in zip(percentiles, np.percentile(returns, percentiles))},
+            'max_drawdown_pct': {f"p{p:g}": float(v) for p, v in zip(percentiles, np.percentile(drawdown, percentiles))},
+            'mean_return_pct': float(returns.mean()),
+            'prob_loss': float(np.mean(self.final_equity < 1.0)),
+            'prob_drawdown_over': {f"{d:.0%}": float(np.mean(self.max_drawdown > d)) for d in drawdowns},
+            'ruin_loss_pct': self.ruin_loss * 100,
+            'prob_ruin': float(np.mean(self.ruined)),
+        }
+
+
+def simulate(
+    sample: TradeSample,
+    simulations: int = 10_000,
+    trades: Optional[int] = None,
+    method: str = 'bootstrap',
+    risk_percent: Optional[float] = None,
+    slippage_r: float = 0.0,
+    ruin_loss: float = 0.5,
+    workers: Optional[int] = None,
+    seed: Optional[int] = None
+) -> MonteCarloResult:
+    """
+    Monte Carlo equity paths from resampled trades.
+
+    Args:
+        sample: Historical trades
+        simulations: Number of paths
+        trades: Trades per path (default: as many as in the sample; 'permute' requires that)
+        method: 'bootstrap' (draw with replacement) or 'permute' (reorder the same trades)
+        risk_percent: Risk per trade (default settings.RISK_PER_TRADE)
+        slippage_r: Mean extra adverse slippage per trade in R, drawn uniformly from [0, 2x]
+        ruin_loss: Loss of starting capital that counts as ruin (0.5 = half the account)
+        workers: Processes (default CPU count; 1 runs in this process)
+        seed: Random seed for reproducible results
+
+    Returns:
+        MonteCarloResult
+    """
+    if method not in METHODS:
+        raise ValueError(f"Unknown Monte Carlo method: {method}")
+    if not len(sample):
+        raise ValueError("Monte Carlo needs at least one trade")
+    trades = trades or len(sample)
+    if method == 'permute' and trades != len(sample):
+        raise ValueError("Permutation paths have exactly as many trades as the sample")
+
+    risk = (risk_percent or settings.RISK_PER_TRADE) / 100.0
+    weight = np.minimum(sample.stop_fraction, risk)
+    sizes = [min(BLOCK_SIMS, simulations - i) for i in range(0, simulations, BLOCK_SIMS)]
+    seeds = np.random.SeedSequence(seed).spawn(len(sizes))
+
+    workers = workers or os.cpu_count() or 1
+    workers = min(workers, len(sizes)) if simulations >= MIN_PARALLEL_SIMS else 1
+    chunks = [
+        (sample.r_multiple, weight, sizes[i::workers], trades, method, slippage_r, seeds[i::workers])
+        for i in range(workers)
+    ]
+    if workers == 1:
+        parts = [_simulate_chunk(chunks[0])]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            parts = list(pool.map(_simulate_chunk, chunks))
+
+    final, max_drawdown, lowest = (np.concatenate(column) for column in zip(*parts))
+    return MonteCarloResult(final, max_drawdown, lowest, trades, risk, ruin_loss)
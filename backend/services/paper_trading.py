@@ -2,28 +2,302 @@
 Paper Trading Engine.
 Simulates trading without real money, tracks equity and positions.
 """
-from typing import Dict, List, Optional
-from datetime import datetime
+import asyncio
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from types import MappingProxyType
+from typing import AsyncIterator, Callable, Dict, List, Mapping, Optional, Tuple
+from datetime import date, datetime, timezone
 from ..config import settings
+from .clock import clock
+from .execution import ExecutionModel, create_execution_model
+from .fill_simulator import IntrabarFillSimulator
+from .resampler import timeframe_to_ms
+from .state_store import EngineStateStore
+from .triggers import TRAILING_STOP, TriggerIndex
+
+
+@dataclass(frozen=True)
+class EngineSnapshot:
+    """Immutable view of engine state published after every mutation."""
+    version: int
+    equity: float
+    available: float
+    positions: Tuple[Mapping, ...]
+    daily_pnl: float
+    daily_pnl_date: date
+    published_at: float  # epoch seconds
+    
+    @property
+    def marked_equity(self) -> float:
+        """
+        Equity including unrealized P&L of open positions.
+        
+        Built like ``close_position`` settles: free capital plus each
+        position's cost and gross P&L. Entry fees already left ``available``
+        at open, so they are not counted again as equity.
+        """
+        return self.available + sum(p['cost'] + p['pnl'] for p in self.positions)
+
+
+# Running totals kept on a position while its exit fills only in part
+PARTIAL_EXIT_FIELDS = (
+    'closed_qty', 'closed_cost', 'closed_entry_fees', 'exit_notional', 'exit_fees', 'realized_pnl'
+)
+
+# Called with each published snapshot and the fills committed since the last one
+SnapshotListener = Callable[[EngineSnapshot, List[Dict]], None]
 
 
 class PaperTradingEngine:
-    """Paper trading simulation engine."""
+    """
+    Paper trading simulation engine.
+    
+    Mutations are serialized through ``transaction()`` (a single writer at a
+    time), while ``get_status()`` reads the last published snapshot and never
+    waits on a writer.
+    
+    With a shared ``EngineStateStore`` the same holds across processes:
+    transactions take the store's writer lock, start from the latest shared
+    state and save it on success; ``sync()`` pulls newer state for readers.
+    
+    Listeners registered with ``subscribe()`` receive every published
+    snapshot together with the fills (opens and closes) behind it. The
+    snapshot and fills of a transaction are published only once it commits.
     
-    def __init__(self, initial_capital: float = None):
+    Exit levels (stop loss, take profit, trailing stop) are armed in a
+    ``TriggerIndex`` when a position opens, so a price update only touches
+    the levels it crosses. Positions are keyed by an id assigned at open
+    (``position['id']``), so a symbol may hold several, each with its own
+    OCO group of exits.
+    """
+    
+    def __init__(
+        self,
+        initial_capital: float = None,
+        fill_simulator: Optional[IntrabarFillSimulator] = None,
+        execution_model: Optional[ExecutionModel] = None,
+        state_store: Optional[EngineStateStore] = None
+    ):
         """Initialize paper trading engine."""
         self.initial_capital = initial_capital or settings.INITIAL_CAPITAL
         self.equity = self.initial_capital
         self.available = self.initial_capital
-        self.positions: Dict[str, Dict] = {}
+        self.positions: Dict[str, Dict] = {}  # position id -> position
+        self.next_position_id = 1
         self.daily_pnl = 0.0
+        self.daily_pnl_date = clock.utcnow().date()
         self.daily_loss_limit = settings.DAILY_LOSS_LIMIT
+        self.fill_simulator = fill_simulator
+        self.execution_model = execution_model or create_execution_model()
+        self.triggers = TriggerIndex()
+        
+        self.state_store = state_store or EngineStateStore()
+        self._state_version = 0
+        
+        self._write_lock = asyncio.Lock()
+        self._in_transaction = False
+        self._pending_fills: List[Dict] = []
+        self._listeners: List[SnapshotListener] = []
+        self._version = 0
+        self._publish()
+    
+    def to_state(self) -> Dict:
+        """Serialize mutable engine state to a JSON-compatible dict."""
+        return {
+            'equity': self.equity,
+            'available': self.available,
+            'positions': {
+                key: {**p, 'opened_at': p['opened_at'].isoformat()}
+                for key, p in self.positions.items()
+            },
+            'next_position_id': self.next_position_id,
+            'daily_pnl': self.daily_pnl,
+            'daily_pnl_date': self.daily_pnl_date.isoformat()
+        }
+    
+    def load_state(self, state: Dict):
+        """Replace engine state with a dict produced by ``to_state``."""
+        self.equity = state['equity']
+        self.available = state['available']
+        # States written before positions had ids are keyed by symbol
+        self.positions = {
+            key: {'id': key, **p, 'opened_at': datetime.fromisoformat(p['opened_at'])}
+            for key, p in state['positions'].items()
+        }
+        self.next_position_id = state.get('next_position_id', 1)
+        self.daily_pnl = state['daily_pnl']
+        self.daily_pnl_date = date.fromisoformat(state['daily_pnl_date'])
+        self._rebuild_triggers()
+        self._publish()
+    
+    async def sync(self) -> bool:
+        """
+        Pull newer state from the shared store, if any.
+        
+        Costs one small version read when nothing changed. Fills other
+        workers committed since the last sync are delivered to listeners
+        with the new snapshot, as if they had happened here.
+        
+        Returns:
+            True if local state was replaced
+        """
+        if await self.state_store.version() <= self._state_version:
+            return False
+        loaded = await self.state_store.load()
+        if loaded is None:
+            return False
+        self._state_version, state = loaded
+        self._pending_fills.extend(await self.state_store.load_fills())
+        self.load_state(state)
+        return True
+    
+    def subscribe(self, listener: SnapshotListener):
+        """Register a callback for published snapshots and committed fills."""
+        self._listeners.append(listener)
+    
+    def _record_fill(self, event: str, position: Dict):
+        """Queue a fill event for listeners."""
+        self._pending_fills.append({'event': event, **position})
+    
+    def _publish(self):
+        """
+        Publish an immutable snapshot of the current state for readers.
+        
+        Inside a transaction this is deferred until it commits, so readers
+        never see state that is later rolled back.
+        """
+        if self._in_transaction:
+            return
+        self._version += 1
+        self._snapshot = EngineSnapshot(
+            version=self._version,
+            equity=self.equity,
+            available=self.available,
+            positions=tuple(MappingProxyType(dict(p)) for p in self.positions.values()),
+            daily_pnl=self.daily_pnl,
+            daily_pnl_date=self.daily_pnl_date,
+            published_at=clock.time()
+        )
+        fills, self._pending_fills = self._pending_fills, []
+        for listener in self._listeners:
+            listener(self._snapshot, fills)
+    
+    def snapshot(self) -> EngineSnapshot:
+        """Get the latest published snapshot (lock-free)."""
+        return self._snapshot
+    
+    @asynccontextmanager
+    async def transaction(self) -> AsyncIterator["PaperTradingEngine"]:
+        """
+        Exclusive write section.
+        
+        Holds the writer lock so check-then-act sequences (limit checks,
+        sizing against ``available``, opening and persisting a position) are
+        atomic across awaits. If the block raises, engine state is restored
+        to what it was on entry, keeping capital accounting consistent with
+        a rolled-back database transaction. A block that leaves the state
+        unchanged (e.g. a price poll for a symbol with no position) is not
+        saved or republished, so other workers are not made to re-sync.
+        If another writer saved in the meantime (the store's lock expired
+        while this block was still running), the save fails and the block
+        is rolled back rather than overwriting that state.
+        
+        Usage:
+            async with engine.transaction():
+                engine.open_position(...)
+                await db.commit()
+        """
+        async with self._write_lock, self.state_store.write_lock():
+            await self.sync()
+            saved = (
+                self.equity,
+                self.available,
+                {key: dict(p) for key, p in self.positions.items()},
+                self.daily_pnl,
+                self.daily_pnl_date
+            )
+            self._in_transaction = True
+            changed = False
+            try:
+                yield self
+                changed = self._pending_fills or saved != (
+                    self.equity,
+                    self.available,
+                    self.positions,
+                    self.daily_pnl,
+                    self.daily_pnl_date
+                )
+                if changed:
+                    self._state_version = await self.state_store.save(
+                        self.to_state(), self._pending_fills, expected_version=self._state_version
+                    )
+            except BaseException:
+                changed = False
+                (self.equity, self.available, self.positions,
+                 self.daily_pnl, self.daily_pnl_date) = saved
+                self._rebuild_triggers()
+                self._pending_fills = []
+                raise
+            finally:
+                self._in_transaction = False
+                # Readers switch to the new state only once it is committed
+                if changed:
+                    self._publish()
+    
+    def _arm(self, position: Dict):
+        """Arm a position's exit levels in the trigger index."""
+        trail_distance = position.get('trail_distance')
+        peak = None
+        if trail_distance:
+            # The trailing stop sits trail_distance behind the best price seen
+            trailing_stop = position.get('trailing_stop')
+            if trailing_stop is None:
+                peak = position['entry_price']
+            elif position['side'] == 'long':
+                peak = trailing_stop + trail_distance
+            else:
+                peak = trailing_stop - trail_distance
+        self.triggers.arm(
+            position['id'],
+            position['symbol'],
+            position['side'],
+            stop_loss=position['stop_loss'],
+            take_profit=position['take_profit'],
+            trail_distance=trail_distance,
+            peak=peak
+        )
+        if trail_distance:
+            position['trailing_stop'] = self.triggers.trailing_stop(position['id'])
+    
+    def _rebuild_triggers(self):
+        """Re-arm the trigger index from ``positions`` (after a load or rollback)."""
+        self.triggers.clear()
+        for position in self.positions.values():
+            self._arm(position)
+    
+    def unit_cost(self, entry_price: float, symbol: Optional[str] = None) -> float:
+        """
+        Expected capital consumed per unit bought at ``entry_price``.
+        
+        Includes the execution model's fees and slippage, plus a hair for
+        float rounding so a fill sized with it never exceeds available.
+        
+        Args:
+            entry_price: Reference entry price
+            symbol: Trading pair, for its price tick
+        
+        Returns:
+            Quote currency per unit of base
+        """
+        return entry_price * (1 + self.execution_model.cost_rate(entry_price, symbol) + 1e-9)
     
     def calculate_position_size(
         self,
         entry_price: float,
         stop_price: float,
-        risk_percent: float = None
+        risk_percent: float = None,
+        symbol: Optional[str] = None
     ) -> float:
         """
         Calculate position size based on risk management rules.
@@ -32,6 +306,7 @@ class PaperTradingEngine:
             entry_price: Entry price for the position
             stop_price: Stop loss price
             risk_percent: Risk per trade (default from settings)
+            symbol: Trading pair, for its price tick in the cost estimate
         
         Returns:
             Position size in base currency (e.g., BTC amount for BTC/USDT)
@@ -50,10 +325,10 @@ class PaperTradingEngine:
         
         qty = risk_amount / stop_distance
         
-        # Ensure we have enough capital
-        position_cost = qty * entry_price
-        if position_cost > self.available:
-            qty = self.available / entry_price
+        # Ensure we have enough capital, leaving room for simulated fees and slippage
+        unit_cost = self.unit_cost(entry_price, symbol)
+        if qty * unit_cost > self.available:
+            qty = self.available / unit_cost
         
         return qty
     
@@ -64,7 +339,8 @@ class PaperTradingEngine:
         entry_price: float,
         qty: float,
         stop_loss: float,
-        take_profit: float
+        take_profit: float,
+        trail_distance: Optional[float] = None
     ) -> Dict:
         """
         Open a new position.
@@ -76,52 +352,69 @@ class PaperTradingEngine:
             qty: Position size
             stop_loss: Stop loss price
             take_profit: Take profit price
+            trail_distance: Trailing stop distance in price units (None disables)
         
         Returns:
-            Position dict with details
+            Position dict with details (entry_price and qty reflect the simulated fill)
         """
         # Check max positions limit
         if len(self.positions) >= settings.MAX_OPEN_POSITIONS:
             raise Exception(f"Maximum {settings.MAX_OPEN_POSITIONS} positions allowed")
         
         # Check daily loss limit
+        self._roll_daily_pnl()
         daily_loss_pct = (self.daily_pnl / self.initial_capital) * 100
         if daily_loss_pct <= -self.daily_loss_limit:
             raise Exception(f"Daily loss limit reached: {daily_loss_pct:.2f}%")
         
+        # Simulate the entry fill (fees, slippage, book depth)
+        fill = self.execution_model.fill(symbol, 'buy' if side == 'long' else 'sell', qty, entry_price)
+        if fill.qty <= 0:
+            raise Exception(f"No liquidity to fill {symbol} order")
+        entry_price = fill.price
+        qty = fill.qty
+        
         # Calculate position cost
         position_cost = qty * entry_price
         
         # Check available capital
-        if position_cost > self.available:
+        if position_cost + fill.fee > self.available:
             raise Exception(f"Insufficient capital: {self.available:.2f} USDT")
         
         # Create position
         position = {
+            'id': f"{symbol}#{self.next_position_id}",
             'symbol': symbol,
             'side': side,
             'entry_price': entry_price,
             'qty': qty,
             'stop_loss': stop_loss,
             'take_profit': take_profit,
-            'opened_at': datetime.utcnow(),
+            'opened_at': clock.utcnow(),
             'cost': position_cost,
+            'fees': fill.fee,
             'current_price': entry_price,
             'pnl': 0.0,
             'pnl_pct': 0.0
         }
+        if trail_distance:
+            position['trail_distance'] = trail_distance
         
         # Update available capital
-        self.available -= position_cost
+        self.available -= position_cost + fill.fee
         
-        # Store position
-        self.positions[symbol] = position
+        # Store position and arm its exits
+        self.next_position_id += 1
+        self.positions[position['id']] = position
+        self._arm(position)
+        self._record_fill('open', position)
+        self._publish()
         
         return position
     
     def update_positions(self, symbol: str, current_price: float) -> List[Dict]:
         """
-        Update position with current price and check for SL/TP hits.
+        Update the symbol's positions with current price and check for exit hits.
         
         Args:
             symbol: Trading pair
@@ -130,95 +423,246 @@ class PaperTradingEngine:
         Returns:
             List of closed positions (if any)
         """
-        closed_positions = []
+        held = self.positions_for(symbol)
+        if not held:
+            return []
         
-        if symbol not in self.positions:
-            return closed_positions
+        for position in held:
+            self._mark(position, current_price)
+        closed_positions = self._apply_triggers(symbol, current_price)
+        self._publish()
         
-        position = self.positions[symbol]
+        return closed_positions
+    
+    def positions_for(self, symbol: str) -> List[Dict]:
+        """Open positions of ``symbol``, oldest first."""
+        return [p for p in self.positions.values() if p['symbol'] == symbol]
+    
+    @staticmethod
+    def _opened_ms(position: Dict) -> int:
+        """Open time of a position in epoch ms."""
+        return int(position['opened_at'].replace(tzinfo=timezone.utc).timestamp() * 1000)
+    
+    @staticmethod
+    def _mark(position: Dict, current_price: float):
+        """Mark an open position to ``current_price`` (unrealized, before exit costs)."""
         position['current_price'] = current_price
-        
-        # Calculate P&L
         if position['side'] == 'long':
-            pnl = (current_price - position['entry_price']) * position['qty']
-            pnl_pct = ((current_price / position['entry_price']) - 1) * 100
-            
-            # Check SL/TP
-            if current_price <= position['stop_loss']:
-                closed_position = self.close_position(symbol, position['stop_loss'], 'stop_loss')
-                closed_positions.append(closed_position)
-            elif current_price >= position['take_profit']:
-                closed_position = self.close_position(symbol, position['take_profit'], 'take_profit')
-                closed_positions.append(closed_position)
-        
+            position['pnl'] = (current_price - position['entry_price']) * position['qty']
+            position['pnl_pct'] = ((current_price / position['entry_price']) - 1) * 100
         else:  # short
-            pnl = (position['entry_price'] - current_price) * position['qty']
-            pnl_pct = ((position['entry_price'] / current_price) - 1) * 100
-            
-            # Check SL/TP
-            if current_price >= position['stop_loss']:
-                closed_position = self.close_position(symbol, position['stop_loss'], 'stop_loss')
-                closed_positions.append(closed_position)
-            elif current_price <= position['take_profit']:
-                closed_position = self.close_position(symbol, position['take_profit'], 'take_profit')
-                closed_positions.append(closed_position)
-        
-        # Update position
-        position['pnl'] = pnl
-        position['pnl_pct'] = pnl_pct
-        
+            position['pnl'] = (position['entry_price'] - current_price) * position['qty']
+            position['pnl_pct'] = ((position['entry_price'] / current_price) - 1) * 100
+    
+    def _apply_triggers(self, symbol: str, price: float) -> List[Dict]:
+        """Close positions whose exit levels ``price`` crossed; trail the rest."""
+        closed_positions = []
+        for key, reason, level in self.triggers.on_price(symbol, price):
+            closed = self.close_position(key, level, reason)
+            if closed is not None:
+                closed_positions.append(closed)
+        for position in self.positions_for(symbol):
+            if position.get('trail_distance'):
+                position['trailing_stop'] = self.triggers.trailing_stop(position['id'])
         return closed_positions
     
-    def close_position(
+    def update_positions_with_bar(
         self,
         symbol: str,
-        exit_price: float,
-        exit_reason: str
-    ) -> Dict:
+        timeframe: str,
+        bar_open_ms: int,
+        open_price: float,
+        high: float,
+        low: float,
+        close: float
+    ) -> List[Dict]:
         """
-        Close a position.
+        Update the symbol's positions with a completed bar and check for SL/TP hits inside it.
+        
+        Unlike ``update_positions`` this sees the bar's full range, and when
+        both levels lie within it the fill simulator drills into
+        lower-timeframe candles to decide which was hit first. Positions
+        opened after the bar opened did not exist for all of its range, so
+        they are only marked to the close, and not even that once one
+        opened after the bar closed.
         
         Args:
             symbol: Trading pair
-            exit_price: Exit price
-            exit_reason: Reason for exit ('stop_loss', 'take_profit', 'manual')
+            timeframe: Bar timeframe (e.g., '1h')
+            bar_open_ms: Bar open time in epoch ms
+            open_price: Bar open
+            high: Bar high
+            low: Bar low
+            close: Bar close
         
         Returns:
-            Closed position dict
+            List of closed positions (if any)
         """
-        if symbol not in self.positions:
-            raise Exception(f"Position {symbol} not found")
+        positions = self.positions_for(symbol)
+        if not positions:
+            return []
         
-        position = self.positions[symbol]
+        held = [p for p in positions if self._opened_ms(p) <= bar_open_ms]
+        if held and self.fill_simulator is None:
+            self.fill_simulator = IntrabarFillSimulator()
         
-        # Calculate final P&L
-        if position['side'] == 'long':
-            pnl = (exit_price - position['entry_price']) * position['qty']
-            pnl_pct = ((exit_price / position['entry_price']) - 1) * 100
-        else:  # short
-            pnl = (position['entry_price'] - exit_price) * position['qty']
-            pnl_pct = ((position['entry_price'] / exit_price) - 1) * 100
+        closed_positions = []
+        for position in held:
+            # The trailing stop (as of the bar open) replaces the fixed stop once tighter
+            long = position['side'] == 'long'
+            stop_loss = position['stop_loss']
+            trailing_stop = position.get('trailing_stop')
+            trailing = trailing_stop is not None and (
+                trailing_stop > stop_loss if long else trailing_stop < stop_loss
+            )
+            if trailing:
+                stop_loss = trailing_stop
+            
+            exit_fill = self.fill_simulator.resolve(
+                symbol=symbol,
+                timeframe=timeframe,
+                bar_open_ms=bar_open_ms,
+                bar_open=open_price,
+                bar_high=high,
+                bar_low=low,
+                side=position['side'],
+                stop_loss=stop_loss,
+                take_profit=position['take_profit']
+            )
+            
+            if exit_fill is None:
+                # Nothing triggered: trail to the bar's best price
+                if position.get('trail_distance'):
+                    best = high - position['trail_distance'] if long else low + position['trail_distance']
+                    position['trailing_stop'] = max(trailing_stop, best) if long else min(trailing_stop, best)
+                    self._arm(position)
+                continue
+            
+            exit_reason, exit_price = exit_fill
+            if exit_reason == 'stop_loss' and trailing:
+                exit_reason = TRAILING_STOP
+            closed = self.close_position(position['id'], exit_price, exit_reason)
+            if closed is not None:
+                closed_positions.append(closed)
+        
+        # Mark survivors to the close (which may still cross a raised trailing stop)
+        bar_close_ms = bar_open_ms + timeframe_to_ms(timeframe)
+        if any(self._opened_ms(p) >= bar_close_ms for p in self.positions_for(symbol)):
+            self._publish()
+            return closed_positions
+        return closed_positions + self.update_positions(symbol, close)
+    
+    def close_position(
+        self,
+        position_id: str,
+        exit_price: float,
+        exit_reason: str
+    ) -> Optional[Dict]:
+        """
+        Close a position, or as much of it as the exit fill covers.
         
-        # Update equity and available capital
-        position_value = exit_price * position['qty']
-        self.available += position_value
-        self.equity = self.available + sum(p['cost'] for p in self.positions.values() if p['symbol'] != symbol)
+        When the execution model fills only part of the exit (order-book
+        depth), that part is settled and the rest stays open with its exits
+        re-armed, so it is retried on the next price. The closed record is
+        returned once nothing is left; it reports the whole trade: total
+        quantity, average exit price, and P&L net of every fee, with
+        ``pnl_pct`` on the same net basis (P&L over entry cost).
+        
+        Args:
+            position_id: Position id (``position['id']``)
+            exit_price: Exit price
+            exit_reason: Reason for exit ('stop_loss', 'take_profit', 'trailing_stop', 'manual')
+        
+        Returns:
+            Closed position dict, or None while part of the position remains open
+        """
+        if position_id not in self.positions:
+            raise Exception(f"Position {position_id} not found")
+        
+        position = self.positions[position_id]
+        symbol = position['symbol']
+        sign = 1 if position['side'] == 'long' else -1
+        
+        # Simulate the exit fill (may cover only part of the position)
+        fill = self.execution_model.fill(
+            symbol, 'sell' if position['side'] == 'long' else 'buy', position['qty'], exit_price
+        )
+        qty = min(fill.qty, position['qty'])
+        if qty <= 0:
+            # Nothing filled: keep the position and retry its exits on the next price
+            self._arm(position)
+            return None
+        exit_price = fill.price
+        exit_fee = fill.fee
+        
+        # Settle the filled part with its share of the entry cost and fee
+        share = qty / position['qty']
+        cost = position['cost'] * share
+        entry_fee = position['fees'] * share
+        gross_pnl = sign * (exit_price - position['entry_price']) * qty
+        pnl = gross_pnl - entry_fee - exit_fee
+        
+        # Release the part's margin plus P&L (entry fee was paid at open)
+        self.available += cost + gross_pnl - exit_fee
         
         # Update daily P&L
+        self._roll_daily_pnl()
         self.daily_pnl += pnl
         
-        # Create closed position record
+        # Totals over every exit of this trade
+        closed_qty = position.get('closed_qty', 0.0) + qty
+        closed_cost = position.get('closed_cost', 0.0) + cost
+        closed_entry_fees = position.get('closed_entry_fees', 0.0) + entry_fee
+        exit_notional = position.get('exit_notional', 0.0) + qty * exit_price
+        exit_fees = position.get('exit_fees', 0.0) + exit_fee
+        realized_pnl = position.get('realized_pnl', 0.0) + pnl
+        
+        remaining = position['qty'] - qty
+        if remaining > position['qty'] * 1e-9:
+            position.update(
+                qty=remaining,
+                cost=position['cost'] - cost,
+                fees=position['fees'] - entry_fee,
+                closed_qty=closed_qty,
+                closed_cost=closed_cost,
+                closed_entry_fees=closed_entry_fees,
+                exit_notional=exit_notional,
+                exit_fees=exit_fees,
+                realized_pnl=realized_pnl
+            )
+            self._mark(position, position['current_price'])
+            self._arm(position)
+            self.equity = self.available + sum(p['cost'] for p in self.positions.values())
+            self._record_fill('partial_close', {
+                **position,
+                'exit_price': exit_price,
+                'exit_qty': qty,
+                'exit_reason': exit_reason,
+                'exit_pnl': pnl
+            })
+            self._publish()
+            return None
+        
+        # Create closed position record for the whole trade
+        total_cost = position['cost'] + closed_cost - cost
         closed_position = {
-            **position,
-            'exit_price': exit_price,
+            **{k: v for k, v in position.items() if k not in PARTIAL_EXIT_FIELDS},
+            'qty': closed_qty,
+            'cost': total_cost,
+            'exit_price': exit_notional / closed_qty,
             'exit_reason': exit_reason,
-            'pnl': pnl,
-            'pnl_pct': pnl_pct,
-            'closed_at': datetime.utcnow()
+            'fees': closed_entry_fees + exit_fees,
+            'pnl': realized_pnl,
+            'pnl_pct': realized_pnl / total_cost * 100 if total_cost else 0.0,
+            'closed_at': clock.utcnow()
         }
         
         # Remove from positions
-        del self.positions[symbol]
+        del self.positions[position_id]
+        self.triggers.disarm(position_id)
+        self.equity = self.available + sum(p['cost'] for p in self.positions.values())
+        self._record_fill('close', closed_position)
+        self._publish()
         
         return closed_position
     
@@ -226,17 +670,30 @@ class PaperTradingEngine:
         """
         Get current engine status.
         
+        Served from the latest published snapshot, so it never blocks on
+        (or observes a half-applied) write.
+        
         Returns:
             Dict with equity, available capital, and positions
         """
+        snap = self._snapshot
+        # A new UTC day starts from zero even before the next write rolls it
+        daily_pnl = snap.daily_pnl if snap.daily_pnl_date == clock.utcnow().date() else 0.0
         return {
-            'equity': self.equity,
-            'available': self.available,
-            'positions': list(self.positions.values()),
-            'daily_pnl': self.daily_pnl,
-            'daily_pnl_pct': (self.daily_pnl / self.initial_capital) * 100
+            'equity': snap.equity,
+            'available': snap.available,
+            'positions': [dict(p) for p in snap.positions],
+            'daily_pnl': daily_pnl,
+            'daily_pnl_pct': (daily_pnl / self.initial_capital) * 100
         }
     
     def reset_daily_pnl(self):
         """Reset daily P&L counter (call at start of each day)."""
         self.daily_pnl = 0.0
+        self.daily_pnl_date = clock.utcnow().date()
+        self._publish()
+    
+    def _roll_daily_pnl(self):
+        """Reset the daily P&L counter automatically when the UTC date changes."""
+        if clock.utcnow().date() != self.daily_pnl_date:
+            self.reset_daily_pnl()
@@ -0,0 +1,253 @@
+"""
+Replay Market Data.
+Serves stored or synthetic candles as if they were arriving live, following the shared clock.
+"""
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from ..config import settings
+from .candle_store import CandleArrays, CandleStore
+from .clock import clock
+from .resampler import timeframe_to_ms
+
+
+def random_walk(bars: int, start_ms: int, timeframe: str, seed: int = 0, price: float = 100.0) -> CandleArrays:
+    """
+    Synthetic candles from a geometric random walk.
+
+    Args:
+        bars: Number of candles
+        start_ms: Open time of the first candle, epoch ms
+        timeframe: Candle timeframe
+        seed: Random seed
+        price: First open price
+
+    Returns:
+        CandleArrays with contiguous columns
+    """
+    rng = np.random.default_rng(seed)
+    close = price * np.exp(np.cumsum(rng.normal(0, 0.01, bars)))
+    open_ = np.concatenate(([price], close[:-1]))
+    body_high = np.maximum(open_, close)
+    body_low = np.minimum(open_, close)
+    matrix = np.empty((5, bars))
+    matrix[0] = open_
+    matrix[1] = body_high * (1 + np.abs(rng.normal(0, 0.004, bars)))
+    matrix[2] = body_low * (1 - np.abs(rng.normal(0, 0.004, bars)))
+    matrix[3] = close
+    matrix[4] = rng.uniform(50, 150, bars)
+    timestamps = start_ms + np.arange(bars, dtype=np.int64) * timeframe_to_ms(timeframe)
+    return CandleArrays.from_matrix(timestamps, matrix)
+
+
+def forming_bar(o: float, h: float, l: float, c: float, volume: float, progress: float) -> Tuple[float, float, float, float]:
+    """
+    A bar part-way through forming.
+
+    The price walks open → low → high → close (open → high → low → close
+    for down bars) in equal thirds of the bar.
+
+    Args:
+        o, h, l, c, volume: The completed bar
+        progress: Fraction of the bar elapsed (clipped to 0..1)
+
+    Returns:
+        (price, high, low, volume) so far
+    """
+    path = (o, l, h, c) if c >= o else (o, h, l, c)
+    progress = min(max(progress, 0.0), 1.0) * 3
+    leg = min(int(progress), 2)
+    price = path[leg] + (path[leg + 1] - path[leg]) * (progress - leg)
+    walked = path[:leg + 1] + (price,)
+    return price, max(walked), min(walked), volume * progress / 3
+
+
+class ReplayMarketData:
+    """
+    Drop-in ``MarketDataService`` replacement for replays.
+
+    Candles are revealed as the shared clock passes their open time. The
+    candle containing "now" is returned still forming (see ``forming_bar``):
+    its high, low and volume cover only the part walked so far. Tickers quote that same price, so signals, the
+    scheduler's SL/TP checks and /update-positions see a consistent market.
+    """
+
+    def __init__(self, candles: Dict[str, CandleArrays], timeframe: Optional[str] = None):
+        """
+        Initialize source.
+
+        Args:
+            candles: Symbol -> candles at ``timeframe`` (sorted by open time)
+            timeframe: Candle timeframe of the data (default settings.TIMEFRAME)
+        """
+        self.timeframe = timeframe or settings.TIMEFRAME
+        self.bar_ms = timeframe_to_ms(self.timeframe)
+        self.candles = {symbol: c for symbol, c in candles.items() if len(c)}
+        self.requests = 0
+
+    @classmethod
+    def from_store(
+        cls,
+        symbols: List[str],
+        timeframe: Optional[str] = None,
+        start: Optional[int] = None,
+        end: Optional[int] = None,
+        store: Optional[CandleStore] = None
+    ) -> "ReplayMarketData":
+        """Replay candles from the local candle store (``start``/``end`` in epoch ms)."""
+        timeframe = timeframe or settings.TIMEFRAME
+        store = store or CandleStore()
+        return cls({s: store.load(s, timeframe, start, end) for s in symbols}, timeframe)
+
+    @classmethod
+    def synthetic(
+        cls,
+        symbols: List[str],
+        bars: int,
+        start_ms: int,
+        timeframe: Optional[str] = None,
+        seed: int = 0
+    ) -> "ReplayMarketData":
+        """Replay one random walk per symbol."""
+        timeframe = timeframe or settings.TIMEFRAME
+        return cls(
+            {s: random_walk(bars, start_ms, timeframe, seed + i) for i, s in enumerate(symbols)},
+            timeframe
+        )
+
+    @property
+    def symbols(self) -> List[str]:
+        return list(self.candles)
+
+    def span(self, warmup: int = 0) -> Tuple[int, int]:
+        """
+        Replayable range in epoch ms.
+
+        Args:
+            warmup: Closed bars every symbol must have before the range starts
+
+        Returns:
+            (start, end): open time of the first replayed bar and close time
+            of the last bar
+        """
+        start = max(int(c.timestamp[min(warmup, len(c) - 1)]) for c in self.candles.values())
+        end = min(int(c.timestamp[-1]) for c in self.candles.values()) + self.bar_ms
+        return start, end
+
+    def _series(self, symbol: str) -> CandleArrays:
+        candles = self.candles.get(symbol)
+        if candles is None:
+            raise Exception(f"No replay data for {symbol}")
+        return candles
+
+    def _forming(self, candles: CandleArrays, i: int, now_ms: int):
+        """(price, high, low, volume) of bar ``i`` at ``now_ms``."""
+        return forming_bar(
+            float(candles.open[i]), float(candles.high[i]), float(candles.low[i]),
+            float(candles.close[i]), float(candles.volume[i]),
+            (now_ms - int(candles.timestamp[i])) / self.bar_ms
+        )
+
+    def _position(self, candles: CandleArrays, now_ms: int) -> int:
+        """Index of the bar containing ``now_ms`` (-1 before the data, len past its end)."""
+        i = int(np.searchsorted(candles.timestamp, now_ms, side='right')) - 1
+        if i >= 0 and now_ms >= int(candles.timestamp[i]) + self.bar_ms:
+            return len(candles)  # past the final bar: everything is closed
+        return i
+
+    async def fetch_candles(
+        self,
+        symbol: str,
+        timeframe: str = "1h",
+        limit: int = 100,
+        since: Optional[int] = None
+    ) -> CandleArrays:
+        """
+        Candles visible at the current clock time (last row still forming).
+
+        Args:
+            symbol: Trading pair
+            timeframe: Must equal the replayed timeframe
+            limit: Number of candles
+            since: Earliest open time, epoch ms
+
+        Returns:
+            CandleArrays (a fresh copy; callers may keep it)
+        """
+        self.requests += 1
+        if timeframe != self.timeframe:
+            raise Exception(f"Replay data is {self.timeframe}, not {timeframe}")
+        candles = self._series(symbol)
+        now_ms = int(clock.time() * 1000)
+        i = self._position(candles, now_ms)
+        stop = min(i + 1, len(candles))
+        start = max(0, stop - limit)
+        if since is not None:
+            start = max(start, int(np.searchsorted(candles.timestamp, since, side='left')))
+        if start >= stop:
+            return candles.slice(0, 0)
+
+        timestamps = np.array(candles.timestamp[start:stop])
+        matrix = np.array([candles.open[start:stop], candles.high[start:stop], candles.low[start:stop],
+                           candles.close[start:stop], candles.volume[start:stop]])
+        if i < len(candles):
+            price, high, low, volume = self._forming(candles, i, now_ms)
+            matrix[1:, -1] = (high, low, price, volume)
+        return CandleArrays.from_matrix(timestamps, matrix)
+
+    async def fetch_ohlcv(
+        self,
+        symbol: str,
+        timeframe: str = "1h",
+        limit: int = 100,
+        since: Optional[int] = None
+    ) -> pd.DataFrame:
+        """Same as ``fetch_candles`` as a DataFrame."""
+        candles = await self.fetch_candles(symbol, timeframe, limit, since)
+        return candles.to_frame()
+
+    async def get_ticker(self, symbol: str) -> Dict:
+        """
+        Ticker at the current clock time.
+
+        Returns:
+            Dict with ccxt ticker keys (last, bid, ask, high, low, timestamp)
+        """
+        self.requests += 1
+        candles = self._series(symbol)
+        now_ms = int(clock.time() * 1000)
+        i = self._position(candles, now_ms)
+        if i < 0:
+            raise Exception(f"Error fetching ticker: no replay data for {symbol} yet")
+        if i >= len(candles):
+            price = high = low = float(candles.close[-1])
+        else:
+            price, high, low, _ = self._forming(candles, i, now_ms)
+        return {
+            'symbol': symbol, 'timestamp': now_ms, 'last': price, 'close': price,
+            'bid': price, 'ask': price, 'high': high, 'low': low
+        }
+
+    async def fetch_order_books(self, symbols: List[str], limit: int = 100) -> Dict[str, Dict]:
+        """No depth is replayed; depth-aware fills use their no-book fallback."""
+        return {}
+
+    async def get_balance(self, currency: str = "USDT") -> float:
+        """Paper balance (the replay has no exchange account)."""
+        return float(settings.INITIAL_CAPITAL) if currency == "USDT" else 0.0
+
+    async def load_markets(self, refresh: bool = False) -> int:
+        """Replayed symbols count as the loaded markets."""
+        return len(self.candles)
+
+    async def refresh_markets(self, on_refresh=None):
+        """Replay markets never change."""
+
+    def tick_sizes(self) -> Dict[str, float]:
+        """No tick sizes are replayed; the default tick applies."""
+        return {}
+
+    async def close(self):
+        """Nothing to close."""
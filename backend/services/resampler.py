@@ -0,0 +1,194 @@
+"""
+Timeframe Resampler.
+Derives higher-timeframe OHLCV bars incrementally from a base-resolution stream.
+"""
+from collections import deque
+from typing import Deque, Dict, Iterable, List, Optional, Sequence
+
+import pandas as pd
+
+OHLCV_COLUMNS = ['timestamp', 'open', 'high', 'low', 'close', 'volume']
+
+_UNIT_MS = {
+    'm': 60_000,
+    'h': 3_600_000,
+    'd': 86_400_000,
+    'w': 604_800_000,
+}
+
+# Exchange weeks start on Monday; 1970-01-01 was a Thursday
+_WEEK_OFFSET_MS = 4 * 86_400_000
+
+
+def timeframe_to_ms(timeframe: str) -> int:
+    """
+    Convert a ccxt timeframe string to milliseconds.
+
+    Args:
+        timeframe: Timeframe such as '1m', '15m', '4h', '1d', '1w'
+
+    Returns:
+        Bar duration in milliseconds
+
+    Raises:
+        ValueError: If the timeframe unit is not supported
+    """
+    unit = timeframe[-1]
+    if unit not in _UNIT_MS or not timeframe[:-1].isdigit():
+        raise ValueError(f"Unsupported timeframe: {timeframe}")
+    return int(timeframe[:-1]) * _UNIT_MS[unit]
+
+
+def bar_open_time(timestamp_ms: int, timeframe: str) -> int:
+    """Open time of the ``timeframe`` bar containing ``timestamp_ms``."""
+    period = timeframe_to_ms(timeframe)
+    offset = _WEEK_OFFSET_MS if timeframe.endswith('w') else 0
+    return (timestamp_ms - offset) // period * period + offset
+
+
+def derives_from(timeframe: str, base_timeframe: str) -> bool:
+    """Whether ``timeframe`` bars can be built from ``base_timeframe`` candles."""
+    try:
+        period = timeframe_to_ms(timeframe)
+        base = timeframe_to_ms(base_timeframe)
+    except ValueError:
+        return False
+    return period >= base and period % base == 0
+
+
+def rows_to_frame(rows: Iterable[Sequence[float]]) -> pd.DataFrame:
+    """Build a DataFrame shaped like ``MarketDataService.fetch_ohlcv`` output."""
+    df = pd.DataFrame(list(rows), columns=OHLCV_COLUMNS)
+    df['timestamp'] = pd.to_datetime(df['timestamp'], unit='ms')
+    return df
+
+
+class BarAggregator:
+    """Folds base candles into bars of one higher timeframe."""
+
+    def __init__(self, timeframe: str, max_bars: int):
+        """
+        Initialize aggregator.
+
+        Args:
+            timeframe: Target timeframe (e.g., '4h')
+            max_bars: Number of aggregated bars to retain
+        """
+        self.timeframe = timeframe
+        self.bars: Deque[List[float]] = deque(maxlen=max_bars)
+        # Base candles of the forming bar, needed to re-fold on revisions
+        self._members: Dict[int, Sequence[float]] = {}
+        self._partial_head: Optional[int] = None
+
+    def add(self, candle: Sequence[float]):
+        """
+        Fold one base candle (timestamp ms, open, high, low, close, volume).
+
+        Candles must arrive in time order; re-sending the latest candle with
+        updated values (a still-forming base candle) revises the current bar.
+        """
+        ts = int(candle[0])
+        start = bar_open_time(ts, self.timeframe)
+
+        if not self.bars:
+            # History starting mid-bar yields an incomplete first bar
+            if start != ts:
+                self._partial_head = start
+
+        if not self.bars or start > self.bars[-1][0]:
+            self._members = {ts: candle}
+            self.bars.append([start, candle[1], candle[2], candle[3], candle[4], candle[5]])
+            return
+
+        if start < self.bars[-1][0]:
+            return  # older than the forming bar, already folded
+
+        bar = self.bars[-1]
+        if ts in self._members:
+            self._members[ts] = candle
+            members = [self._members[k] for k in sorted(self._members)]
+            bar[1] = members[0][1]
+            bar[2] = max(m[2] for m in members)
+            bar[3] = min(m[3] for m in members)
+            bar[4] = members[-1][4]
+            bar[5] = sum(m[5] for m in members)
+            return
+
+        self._members[ts] = candle
+        bar[2] = max(bar[2], candle[2])
+        bar[3] = min(bar[3], candle[3])
+        bar[4] = candle[4]
+        bar[5] += candle[5]
+
+    def latest(self, limit: int) -> List[List[float]]:
+        """Return up to ``limit`` most recent complete-history bars (forming bar included)."""
+        bars = list(self.bars)
+        if bars and bars[0][0] == self._partial_head:
+            bars = bars[1:]
+        return [list(bar) for bar in bars[-limit:]]
+
+
+class TimeframeResampler:
+    """Per-symbol base candle buffer with derived timeframe aggregators."""
+
+    def __init__(self, base_timeframe: str, max_base_bars: int):
+        """
+        Initialize resampler.
+
+        Args:
+            base_timeframe: Resolution of the source stream (e.g., '1m')
+            max_base_bars: Base candles retained for bootstrapping new timeframes
+        """
+        self.base_timeframe = base_timeframe
+        self.base_ms = timeframe_to_ms(base_timeframe)
+        self.base: Deque[Sequence[float]] = deque(maxlen=max_base_bars)
+        self.aggregators: Dict[str, BarAggregator] = {}
+
+    @property
+    def last_timestamp(self) -> Optional[int]:
+        """Open time of the newest base candle, if any."""
+        return int(self.base[-1][0]) if self.base else None
+
+    def ingest(self, candles: Iterable[Sequence[float]]):
+        """
+        Append base candles and update every derived timeframe.
+
+        Args:
+            candles: Rows of (timestamp ms, open, high, low, close, volume)
+        """
+        for candle in candles:
+            ts = int(candle[0])
+            last = self.last_timestamp
+            if last is not None and ts < last:
+                continue
+            if last is not None and ts == last:
+                self.base[-1] = candle
+            else:
+                self.base.append(candle)
+            for aggregator in self.aggregators.values():
+                aggregator.add(candle)
+
+    def bars(self, timeframe: str, limit: int) -> List[List[float]]:
+        """
+        Get the latest bars for ``timeframe``.
+
+        Aggregators are created lazily and bootstrapped from the base buffer.
+
+        Args:
+            timeframe: Base or derived timeframe
+            limit: Number of bars
+
+        Returns:
+            List of [timestamp ms, open, high, low, close, volume] rows
+        """
+        if timeframe == self.base_timeframe:
+            return [list(candle) for candle in list(self.base)[-limit:]]
+
+        aggregator = self.aggregators.get(timeframe)
+        if aggregator is None:
+            ratio = timeframe_to_ms(timeframe) // self.base_ms
+            aggregator = BarAggregator(timeframe, max_bars=self.base.maxlen // ratio + 2)
+            for candle in self.base:
+                aggregator.add(candle)
+            self.aggregators[timeframe] = aggregator
+        return aggregator.latest(limit)
@@ -0,0 +1,221 @@
+"""
+Portfolio Risk Engine.
+Gates new entries on portfolio exposure, correlation and value-at-risk.
+"""
+import logging
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from statistics import NormalDist
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from ..config import settings
+
+logger = logging.getLogger(__name__)
+
+# Covariance matrices kept for recently checked symbol sets (least recently used evicted)
+COV_CACHE_SIZE = 256
+
+
+@dataclass(frozen=True)
+class RiskDecision:
+    """Outcome of a pre-trade risk check."""
+    allowed: bool
+    qty: float
+    reason: Optional[str] = None
+    metrics: Dict[str, float] = field(default_factory=dict)
+
+
+class PortfolioRiskEngine:
+    """
+    Vectorized pre-trade risk checks across all open positions.
+
+    Per-symbol log returns are cached with their bar timestamps from the
+    candles the strategy already fetches. Series are aligned on common
+    timestamps before they are compared, and a held symbol whose returns
+    end more than ``max_stale_bars`` before the candidate's (it has not
+    been evaluated lately) is left out rather than paired with a different
+    window. The covariance matrix for a given set of symbols is reused
+    until one of their series changes. A check is then a handful of small
+    NumPy operations on a k x k matrix (k = held symbols + 1).
+    """
+
+    def __init__(
+        self,
+        max_gross_exposure_pct: Optional[float] = None,
+        max_correlation: Optional[float] = None,
+        var_limit_pct: Optional[float] = None,
+        var_confidence: Optional[float] = None,
+        window: Optional[int] = None,
+        max_stale_bars: Optional[int] = None
+    ):
+        """
+        Initialize risk engine (defaults from settings).
+
+        Args:
+            max_gross_exposure_pct: Max sum of |notional| as % of equity
+            max_correlation: Max same-direction return correlation with a held symbol
+            var_limit_pct: Max one-bar parametric VaR as % of equity
+            var_confidence: VaR confidence level (e.g., 0.99)
+            window: Number of returns kept per symbol
+            max_stale_bars: Bars a held symbol's returns may lag the candidate's
+        """
+        self.max_gross_exposure_pct = max_gross_exposure_pct or settings.MAX_GROSS_EXPOSURE_PCT
+        self.max_correlation = max_correlation or settings.MAX_CORRELATION
+        self.var_limit_pct = var_limit_pct or settings.VAR_LIMIT_PCT
+        self.window = window or settings.RISK_RETURNS_WINDOW
+        self.max_stale_bars = settings.RISK_MAX_STALE_BARS if max_stale_bars is None else max_stale_bars
+        self.z_score = NormalDist().inv_cdf(var_confidence or settings.VAR_CONFIDENCE)
+
+        self._returns: Dict[str, np.ndarray] = {}
+        self._timestamps: Dict[str, np.ndarray] = {}
+        self._versions: Dict[str, int] = {}
+        self._cov_cache: "OrderedDict[Tuple[str, ...], Tuple[Tuple[int, ...], np.ndarray]]" = OrderedDict()
+
+    def update_returns(self, symbol: str, closes: np.ndarray, timestamps: np.ndarray):
+        """
+        Cache log returns from a close-price series.
+
+        Args:
+            symbol: Trading pair
+            closes: Close prices in time order
+            timestamps: Bar open times (ms) of ``closes``
+        """
+        closes = np.asarray(closes, dtype=np.float64)[-(self.window + 1):]
+        if closes.shape[0] < 2:
+            return
+        # Each return is stamped with the bar it ends on
+        self._returns[symbol] = np.diff(np.log(closes))
+        self._timestamps[symbol] = np.asarray(timestamps, dtype=np.int64)[-closes.shape[0] + 1:]
+        self._versions[symbol] = self._versions.get(symbol, 0) + 1
+
+    def _is_fresh(self, symbol: str, reference: str) -> bool:
+        """Whether ``symbol``'s returns end within ``max_stale_bars`` of ``reference``'s."""
+        ref = self._timestamps[reference]
+        if ref.shape[0] < 2:
+            return True
+        bar_ms = int(ref[-1] - ref[-2])
+        return int(self._timestamps[symbol][-1]) >= int(ref[-1]) - self.max_stale_bars * bar_ms
+
+    def _covariance(self, symbols: List[str]) -> np.ndarray:
+        """Covariance of per-bar returns for ``symbols`` on their common bars (cached per version)."""
+        key = tuple(symbols)
+        versions = tuple(self._versions[s] for s in symbols)
+        cached = self._cov_cache.get(key)
+        if cached is not None and cached[0] == versions:
+            self._cov_cache.move_to_end(key)
+            return cached[1]
+
+        common = self._timestamps[symbols[0]]
+        for s in symbols[1:]:
+            common = np.intersect1d(common, self._timestamps[s], assume_unique=True)
+        if common.shape[0] > 1:
+            stacked = np.vstack([
+                self._returns[s][np.searchsorted(self._timestamps[s], common)] for s in symbols
+            ])
+            cov = np.atleast_2d(np.cov(stacked))
+        else:
+            cov = np.zeros((len(symbols), len(symbols)))
+        self._cov_cache[key] = (versions, cov)
+        self._cov_cache.move_to_end(key)
+        while len(self._cov_cache) > COV_CACHE_SIZE:
+            self._cov_cache.popitem(last=False)
+        return cov
+
+    def evaluate(
+        self,
+        symbol: str,
+        side: str,
+        qty: float,
+        price: float,
+        positions: List[Dict],
+        equity: float
+    ) -> RiskDecision:
+        """
+        Check a prospective entry against portfolio limits.
+
+        Gross exposure and VaR breaches downsize the order; a correlation
+        breach with a held position in the same direction blocks it.
+
+        Args:
+            symbol: Trading pair to enter
+            side: 'long' or 'short'
+            qty: Proposed quantity
+            price: Entry price
+            positions: Open positions (paper engine position dicts)
+            equity: Current equity
+
+        Returns:
+            RiskDecision with the permitted quantity
+        """
+        if qty <= 0 or equity <= 0:
+            return RiskDecision(False, 0.0, "Nothing to size")
+
+        direction = 1.0 if side == 'long' else -1.0
+        held = [p for p in positions if p['symbol'] != symbol]
+        held_notional = np.array(
+            [(1.0 if p['side'] == 'long' else -1.0) * p['qty'] * p['current_price'] for p in held],
+            dtype=np.float64
+        )
+        metrics: Dict[str, float] = {}
+
+        # 1. Gross exposure
+        gross_limit = equity * self.max_gross_exposure_pct / 100.0
+        held_gross = float(np.abs(held_notional).sum())
+        headroom = gross_limit - held_gross
+        if headroom <= 0:
+            return RiskDecision(False, 0.0, "Gross exposure limit reached", metrics)
+        if qty * price > headroom:
+            qty = headroom / price
+        metrics['gross_exposure_pct'] = (held_gross + qty * price) / equity * 100
+
+        # 2. Correlation and VaR need returns for the candidate
+        if symbol not in self._returns:
+            logger.debug(f"No cached returns for {symbol}, skipping correlation/VaR checks")
+            return RiskDecision(True, qty, None, metrics)
+
+        cached = [i for i, p in enumerate(held) if p['symbol'] in self._returns]
+        known = [i for i in cached if self._is_fresh(held[i]['symbol'], symbol)]
+        if len(known) < len(cached):
+            stale = sorted({held[i]['symbol'] for i in cached} - {held[i]['symbol'] for i in known})
+            logger.debug(f"Stale returns for {', '.join(stale)}, left out of correlation/VaR for {symbol}")
+        symbols = [held[i]['symbol'] for i in known] + [symbol]
+        cov = self._covariance(symbols)
+        weights = np.append(held_notional[known], direction * qty * price)
+
+        # Same-direction correlation with any held position
+        if known:
+            std = np.sqrt(np.diag(cov))
+            with np.errstate(divide='ignore', invalid='ignore'):
+                corr = cov[-1, :-1] / (std[-1] * std[:-1])
+            same_direction = np.sign(weights[:-1]) * direction
+            effective = np.nan_to_num(corr * same_direction)
+            metrics['max_correlation'] = float(effective.max())
+            if effective.max() > self.max_correlation:
+                worst = symbols[int(effective.argmax())]
+                return RiskDecision(False, 0.0, f"Correlation with {worst} above {self.max_correlation}", metrics)
+
+        # Parametric VaR: z * sqrt(w' S w), solved for the largest candidate scale within limit
+        var_limit = equity * self.var_limit_pct / 100.0
+        candidate = weights[-1]
+        held_w = weights[:-1]
+        a = cov[-1, -1] * candidate ** 2
+        b = candidate * float(cov[-1, :-1] @ held_w) if known else 0.0
+        c = float(held_w @ cov[:-1, :-1] @ held_w) if known else 0.0
+        portfolio_var = self.z_score * np.sqrt(max(a + 2 * b + c, 0.0))
+        metrics['var_pct'] = float(portfolio_var / equity * 100)
+
+        if portfolio_var > var_limit:
+            # Solve a*s^2 + 2b*s + c = (limit/z)^2 for s in [0, 1]
+            target = (var_limit / self.z_score) ** 2 - c
+            if a <= 0 or target <= 0:
+                return RiskDecision(False, 0.0, "Portfolio VaR limit reached", metrics)
+            scale = (-b + np.sqrt(max(b * b + a * target, 0.0))) / a
+            scale = float(min(max(scale, 0.0), 1.0))
+            if scale <= 0:
+                return RiskDecision(False, 0.0, "Portfolio VaR limit reached", metrics)
+            qty *= scale
+            metrics['var_pct'] = self.var_limit_pct
+
+        return RiskDecision(True, qty, None, metrics)
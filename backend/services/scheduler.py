@@ -0,0 +1,133 @@
+"""
+Position Scheduler.
+Periodically marks open positions to market and closes SL/TP hits.
+Runs on exactly one API worker at a time (the lease holder).
+"""
+import logging
+from typing import Dict, List, Optional
+
+from ..config import settings
+from .clock import clock
+from .market_data import MarketDataService
+from .paper_trading import PaperTradingEngine
+from .resampler import bar_open_time, timeframe_to_ms
+from .write_behind import WriteBehindQueue
+
+logger = logging.getLogger(__name__)
+
+
+class PositionScheduler:
+    """
+    Leader-elected background loop over open positions.
+    
+    Each cycle marks positions to the ticker. Once per closed bar it also
+    replays that bar's full range through the engine, so a stop or target
+    touched between two polls (a wick) still fills, with the intrabar fill
+    simulator deciding which came first when the bar crossed both.
+    """
+    
+    def __init__(
+        self,
+        engine: PaperTradingEngine,
+        market_data: MarketDataService,
+        writer: WriteBehindQueue,
+        interval_seconds: Optional[float] = None,
+        timeframe: Optional[str] = None
+    ):
+        """
+        Initialize scheduler.
+        
+        Args:
+            engine: Paper trading engine (its state store provides the lease)
+            market_data: Market data service
+            writer: Write-behind queue for trade updates
+            interval_seconds: Cycle interval (default settings.SCHEDULER_INTERVAL_SECONDS)
+            timeframe: Bars checked at close (default settings.TIMEFRAME)
+        """
+        self.engine = engine
+        self.market_data = market_data
+        self.writer = writer
+        self.interval_seconds = interval_seconds or settings.SCHEDULER_INTERVAL_SECONDS
+        self.timeframe = timeframe or settings.TIMEFRAME
+        self.is_leader = False
+        # Open time of the last closed bar replayed per symbol
+        self.last_bar: Dict[str, int] = {}
+    
+    async def run_cycle(self) -> int:
+        """
+        Update every open position once.
+        
+        Returns:
+            Number of positions closed
+        """
+        await self.engine.sync()
+        symbols = list(dict.fromkeys(p['symbol'] for p in self.engine.get_status()['positions']))
+        closed_total = 0
+        
+        for symbol in symbols:
+            closed = await self.close_bar(symbol)
+            ticker = await self.market_data.get_ticker(symbol)
+            async with self.engine.transaction():
+                closed += self.engine.update_positions(symbol, ticker['last'])
+            await self.writer.record_closed(symbol, closed)
+            closed_total += len(closed)
+        
+        return closed_total
+    
+    async def close_bar(self, symbol: str) -> List[Dict]:
+        """
+        Run the last closed bar of ``symbol`` through the engine, once.
+        
+        Replaying a bar twice (after a restart or a leader change) is
+        harmless: positions that survived it are unchanged by it.
+        
+        Args:
+            symbol: Trading pair
+        
+        Returns:
+            Positions closed by the bar
+        """
+        bar_ms = timeframe_to_ms(self.timeframe)
+        last_closed = bar_open_time(int(clock.time() * 1000), self.timeframe) - bar_ms
+        if self.last_bar.get(symbol, -1) >= last_closed:
+            return []
+        
+        candles = await self.market_data.fetch_candles(symbol, self.timeframe, limit=3)
+        rows = [i for i in range(len(candles)) if candles.timestamp[i] == last_closed]
+        if not rows:
+            return []  # not published yet; retried next cycle
+        i = rows[0]
+        
+        self.last_bar[symbol] = last_closed
+        async with self.engine.transaction():
+            return self.engine.update_positions_with_bar(
+                symbol,
+                self.timeframe,
+                last_closed,
+                float(candles.open[i]),
+                float(candles.high[i]),
+                float(candles.low[i]),
+                float(candles.close[i])
+            )
+    
+    async def run(self):
+        """Run cycles forever; only the current lease holder does work."""
+        while True:
+            try:
+                leader = await self.engine.state_store.acquire_leadership()
+                if leader != self.is_leader:
+                    logger.info(f"Scheduler leadership {'acquired' if leader else 'lost'}")
+                    self.is_leader = leader
+                if leader:
+                    closed = await self.run_cycle()
+                    if closed:
+                        logger.info(f"Scheduler closed {closed} position(s)")
+            except Exception as e:
+                logger.error(f"Scheduler cycle failed: {e}")
+            await clock.sleep(self.interval_seconds)
+    
+    async def stop(self):
+        """Release the lease so another worker can take over immediately."""
+        if self.is_leader:
+            await self.engine.state_store.release_leadership()
+            self.is_leader = False
@@ -0,0 +1,109 @@
+"""
+Signal Cache.
+Strategy signals memoized per symbol until the next candle closes.
+"""
+from dataclasses import dataclass
+from typing import Dict, Hashable, Optional, Tuple
+
+from ..config import settings
+from .clock import clock
+from .resampler import bar_open_time, timeframe_to_ms
+
+
+@dataclass(frozen=True)
+class CachedSignal:
+    """A computed signal and the closed bar it belongs to."""
+    signal: Optional[Dict]
+    bar_time: int        # open time of the last closed bar, epoch ms
+    computed_at: float   # epoch seconds
+
+
+class SignalCache:
+    """
+    Latest signal per symbol, keyed by (timeframe, strategy params, last closed bar).
+
+    An entry is served until a newer bar closes, so repeated /signals calls
+    share one computation and /execute trades the exact signal that was
+    shown. The bar is derived from the shared clock, so a hit needs no candle
+    fetch. "No signal" entries expire sooner (``negative_ttl``) so a
+    breakout inside the bar still surfaces.
+    """
+
+    def __init__(
+        self,
+        params: Hashable,
+        timeframe: Optional[str] = None,
+        negative_ttl: Optional[float] = None
+    ):
+        """
+        Initialize cache.
+
+        Args:
+            params: Strategy parameters the cached signals were computed with
+            timeframe: Signal timeframe (default settings.TIMEFRAME)
+            negative_ttl: Seconds a "no signal" result is reused (default settings.SIGNAL_CACHE_NEGATIVE_SECONDS)
+        """
+        self.params = params
+        self.timeframe = timeframe or settings.TIMEFRAME
+        self.bar_ms = timeframe_to_ms(self.timeframe)
+        self.negative_ttl = settings.SIGNAL_CACHE_NEGATIVE_SECONDS if negative_ttl is None else negative_ttl
+        self._entries: Dict[Tuple[str, str, Hashable], CachedSignal] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def _key(self, symbol: str) -> Tuple[str, str, Hashable]:
+        return (symbol, self.timeframe, self.params)
+
+    def last_closed_bar(self, now: Optional[float] = None) -> int:
+        """Open time (epoch ms) of the most recently closed bar."""
+        now_ms = int((now if now is not None else clock.time()) * 1000)
+        return bar_open_time(now_ms, self.timeframe) - self.bar_ms
+
+    def get(self, symbol: str, now: Optional[float] = None) -> Optional[CachedSignal]:
+        """
+        Cached signal for the current bar, if any.
+
+        Args:
+            symbol: Trading pair
+            now: Current time in epoch seconds (default: the shared clock)
+
+        Returns:
+            CachedSignal, or None when a new bar has closed (or nothing is cached)
+        """
+        now = now if now is not None else clock.time()
+        entry = self._entries.get(self._key(symbol))
+        if (
+            entry is None
+            or entry.bar_time != self.last_closed_bar(now)
+            or (entry.signal is None and now - entry.computed_at >= self.negative_ttl)
+        ):
+            self.misses += 1
+            return None
+        self.hits += 1
+        return entry
+
+    def put(self, symbol: str, bar_time: int, signal: Optional[Dict]):
+        """
+        Store a computed signal.
+
+        Args:
+            symbol: Trading pair
+            bar_time: Open time of the last closed bar the signal was computed after
+            signal: Strategy signal (None for "no signal")
+        """
+        key = self._key(symbol)
+        current = self._entries.get(key)
+        if current is not None and current.bar_time > bar_time:
+            return  # never replace a newer bar with an older one
+        self._entries[key] = CachedSignal(signal, bar_time, clock.time())
+
+    def invalidate(self, symbol: Optional[str] = None):
+        """Drop one symbol's entry, or every entry."""
+        if symbol is None:
+            self._entries.clear()
+        else:
+            self._entries.pop(self._key(symbol), None)
+
+    def stats(self) -> Dict:
+        """Cache counters."""
+        return {'symbols': len(self._entries), 'hits': self.hits, 'misses': self.misses}
@@ -0,0 +1,224 @@
+"""
+Engine State Store.
+Shares paper-engine state and the scheduler leader lease across API workers.
+"""
+import json
+import logging
+import os
+import socket
+import time
+import uuid
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Dict, List, Optional, Sequence, Tuple
+
+import redis.asyncio as redis
+
+from ..config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class EngineStateStore:
+    """
+    In-process store: state lives only in the engine itself.
+
+    Used when a single worker serves the API. Every method is a no-op so the
+    engine behaves exactly as before.
+    """
+
+    async def version(self) -> int:
+        """Version of the latest saved state (0 = nothing saved)."""
+        return 0
+
+    async def load(self) -> Optional[Tuple[int, Dict]]:
+        """Load ``(version, state)`` or None if nothing is stored."""
+        return None
+
+    async def save(self, state: Dict, fills: Sequence[Dict] = (), expected_version: Optional[int] = None) -> int:
+        """
+        Persist ``state`` with the fills that produced it and return its new version.
+
+        Args:
+            state: Engine state from ``PaperTradingEngine.to_state``
+            fills: Fill events committed with it
+            expected_version: Version the state was built on; the save fails
+                if another writer has saved since
+
+        Raises:
+            Exception: If the stored version is no longer ``expected_version``
+        """
+        return 0
+
+    async def load_fills(self) -> List[Dict]:
+        """Fills other workers saved since the previous call (oldest first)."""
+        return []
+
+    @asynccontextmanager
+    async def write_lock(self) -> AsyncIterator[None]:
+        """Cross-worker writer lock (trivially held in-process)."""
+        yield
+
+    async def acquire_leadership(self) -> bool:
+        """Acquire or renew the scheduler lease; always leader in-process."""
+        return True
+
+    async def release_leadership(self):
+        """Give up the scheduler lease."""
+
+    async def close(self):
+        """Release connections."""
+
+
+class RedisEngineStateStore(EngineStateStore):
+    """
+    Redis-backed store for running several API workers or containers.
+
+    - State is one JSON document plus a monotonically increasing version
+      key, so readers can check for changes with a single small GET.
+    - Writers serialize through a Redis lock with a timeout, so a crashed
+      worker cannot block the others indefinitely. A writer that outlives
+      its lock is fenced off by the version: ``save`` only succeeds if the
+      version is still the one its transaction started from (WATCH/MULTI).
+    - Fills are appended to a capped stream in the same transaction as the
+      state they produced, so every worker's listeners (analytics, SSE)
+      see every close, not only those made on their own worker.
+    - The scheduler runs only on the holder of a lease key (SET NX PX) that
+      the leader renews; if it dies the lease expires and another worker
+      takes over.
+    """
+
+    # Renew only if we still own the lease
+    _RENEW_SCRIPT = """
+    if redis.call('get', KEYS[1]) == ARGV[1] then
+        return redis.call('pexpire', KEYS[1], ARGV[2])
+    end
+    return 0
+    """
+
+    _RELEASE_SCRIPT = """
+    if redis.call('get', KEYS[1]) == ARGV[1] then
+        return redis.call('del', KEYS[1])
+    end
+    return 0
+    """
+
+    def __init__(self, url: Optional[str] = None, namespace: str = "spark:engine"):
+        """
+        Initialize store.
+
+        Args:
+            url: Redis URL (default settings.REDIS_URL)
+            namespace: Key prefix
+        """
+        self.client = redis.from_url(url or settings.REDIS_URL)
+        self.state_key = f"{namespace}:state"
+        self.version_key = f"{namespace}:version"
+        self.lock_key = f"{namespace}:lock"
+        self.leader_key = f"{namespace}:leader"
+        self.fills_key = f"{namespace}:fills"
+        self.worker_id = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        self.lease_ms = int(settings.LEADER_LEASE_SECONDS * 1000)
+        # Stream ids are millisecond timestamps: only fills from after this worker started
+        self._fills_cursor = f"{int(time.time() * 1000)}-0"
+
+    async def version(self) -> int:
+        value = await self.client.get(self.version_key)
+        return int(value) if value else 0
+
+    async def load(self) -> Optional[Tuple[int, Dict]]:
+        version, payload = await self.client.mget(self.version_key, self.state_key)
+        if not payload:
+            return None
+        return int(version or 0), json.loads(payload)
+
+    async def save(self, state: Dict, fills: Sequence[Dict] = (), expected_version: Optional[int] = None) -> int:
+        async with self.client.pipeline(transaction=True) as pipe:
+            try:
+                await pipe.watch(self.version_key)
+                current = int(await pipe.get(self.version_key) or 0)
+                if expected_version is not None and current != expected_version:
+                    raise Exception(
+                        f"Engine state changed underneath this writer (version {current}, expected {expected_version})"
+                    )
+                pipe.multi()
+                pipe.set(self.state_key, json.dumps(state, default=str))
+                pipe.incr(self.version_key)
+                for fill in fills:
+                    pipe.xadd(
+                        self.fills_key,
+                        {'worker': self.worker_id, 'fill': json.dumps(fill, default=_isoformat)},
+                        maxlen=settings.STATE_FILLS_MAXLEN,
+                        approximate=True
+                    )
+                results = await pipe.execute()
+            except redis.WatchError:
+                raise Exception("Engine state changed underneath this writer while saving")
+        return int(results[1])
+
+    async def load_fills(self) -> List[Dict]:
+        entries = await self.client.xrange(self.fills_key, min=f"({self._fills_cursor}", max="+")
+        fills = []
+        for entry_id, fields in entries:
+            self._fills_cursor = entry_id.decode()
+            # This worker's own fills were delivered locally when they committed
+            if fields[b'worker'].decode() != self.worker_id:
+                fills.append(json.loads(fields[b'fill']))
+        return fills
+
+    @asynccontextmanager
+    async def write_lock(self) -> AsyncIterator[None]:
+        lock = self.client.lock(
+            self.lock_key,
+            timeout=settings.STATE_LOCK_TIMEOUT_SECONDS,
+            blocking_timeout=settings.STATE_LOCK_TIMEOUT_SECONDS
+        )
+        if not await lock.acquire():
+            raise Exception("Timed out waiting for engine write lock")
+        try:
+            yield
+        finally:
+            try:
+                await lock.release()
+            except Exception as e:
+                logger.warning(f"Engine write lock release failed: {e}")
+
+    async def acquire_leadership(self) -> bool:
+        acquired = await self.client.set(self.leader_key, self.worker_id, nx=True, px=self.lease_ms)
+        if acquired:
+            return True
+        renewed = await self.client.eval(
+            self._RENEW_SCRIPT, 1, self.leader_key, self.worker_id, self.lease_ms
+        )
+        return bool(renewed)
+
+    async def release_leadership(self):
+        await self.client.eval(self._RELEASE_SCRIPT, 1, self.leader_key, self.worker_id)
+
+    async def close(self):
+        await self.client.aclose()
+
+
+def _isoformat(value) -> str:
+    """JSON fallback: datetimes as ISO 8601 (what the API returns), anything else as str."""
+    return value.isoformat() if hasattr(value, 'isoformat') else str(value)
+
+
+def create_state_store(backend: Optional[str] = None) -> EngineStateStore:
+    """
+    Build the state store selected in settings.
+
+    Args:
+        backend: 'memory' or 'redis' (default settings.STATE_BACKEND)
+
+    Returns:
+        EngineStateStore instance
+
+    Raises:
+        ValueError: If the backend name is unknown
+    """
+    backend = backend or settings.STATE_BACKEND
+    if backend == 'memory':
+        return EngineStateStore()
+    if backend == 'redis':
+        return RedisEngineStateStore()
+    raise ValueError(f"Unknown state backend: {backend}")
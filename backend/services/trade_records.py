@@ -0,0 +1,46 @@
+"""
+Trade Records.
+Persists paper-engine position lifecycle events to the trades table.
+"""
+from typing import Dict, List
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..models.trade import Trade
+from .clock import clock
+
+
+def open_trade_lookup(symbol: str, entry_price: float):
+    """Open trade of ``symbol`` at ``entry_price`` (positions without a trade_id)."""
+    return (
+        select(Trade)
+        .where(Trade.symbol == symbol)
+        .where(Trade.status == "open")
+        .where(Trade.entry_price == entry_price)
+    )
+
+
+async def record_closed_positions(db: AsyncSession, symbol: str, closed_positions: List[Dict]):
+    """
+    Mark trades of closed positions as closed (caller commits).
+    
+    Args:
+        db: Database session
+        symbol: Trading pair
+        closed_positions: Position dicts returned by the paper engine
+    """
+    for pos in closed_positions:
+        if "trade_id" in pos:
+            trade = await db.get(Trade, pos["trade_id"])
+        else:
+            result = await db.execute(open_trade_lookup(symbol, pos["entry_price"]))
+            trade = result.scalar_one_or_none()
+        
+        if trade:
+            trade.exit_price = pos["exit_price"]
+            trade.pnl = pos["pnl"]
+            trade.pnl_pct = pos["pnl_pct"]
+            trade.exit_reason = pos["exit_reason"]
+            trade.closed_at = clock.utcnow()
+            trade.status = "closed"
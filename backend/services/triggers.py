@@ -0,0 +1,309 @@
+"""
+Trigger Index.
+Per-symbol heaps of stop, target and trailing-stop levels for open positions.
+"""
+import heapq
+import itertools
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+
+# Exit reasons reported by the index
+STOP_LOSS = 'stop_loss'
+TAKE_PROFIT = 'take_profit'
+TRAILING_STOP = 'trailing_stop'
+
+# Books below this many heap entries are never compacted (rebuilding is not worth it)
+COMPACT_MIN_ENTRIES = 64
+
+
+@dataclass(eq=False)
+class _TrailGroup:
+    """Trailing stops sharing one peak (all opened before its last new high)."""
+    anchor: float
+    orders: List[Tuple[float, int, int]] = field(default_factory=list)  # (distance, seq, order id)
+    version: int = 0
+    alive: bool = True
+
+
+class _LevelBook:
+    """
+    Levels that fire when a signed price ``x`` falls to or below them.
+
+    Longs use x = price and shorts x = -price, so one structure serves
+    stops and targets of both sides:
+
+    - Fixed levels sit in a max-heap; a tick pops exactly the crossed ones.
+    - Trailing stops fire when x <= peak - distance. Stops opened before
+      the same new high share that peak, so they are kept in groups on a
+      stack ordered by peak; a new high merges the groups it passes
+      (smaller heap into larger) instead of touching every stop. Each
+      group's effective level (peak - smallest distance) sits in a second
+      max-heap.
+
+    Cancelled orders are removed lazily when they reach the top of a heap.
+    Levels far from the price may never get there, so once dead entries
+    outnumber live ones the book is rebuilt from its live orders.
+    """
+
+    def __init__(self, index: "TriggerIndex"):
+        self.index = index
+        self.fixed: List[Tuple[float, int, int]] = []        # (-level, seq, order id)
+        self.groups: List[_TrailGroup] = []                  # stack, peaks decreasing upward
+        self.group_levels: List[Tuple[float, int, int, _TrailGroup]] = []  # (-level, seq, version, group)
+        self.last_x: Optional[float] = None
+        self.entries = 0  # order entries in ``fixed`` and the group heaps, live or cancelled
+        self.live = 0     # armed orders in this book
+
+    def add_fixed(self, order_id: int, level: float):
+        heapq.heappush(self.fixed, (-level, next(self.index.seq), order_id))
+        self.entries += 1
+        self.live += 1
+
+    def add_trailing(self, order_id: int, distance: float, peak: float):
+        item = (distance, next(self.index.seq), order_id)
+        self.entries += 1
+        self.live += 1
+        # Usually the peak is the last price, i.e. the top group's anchor
+        i = len(self.groups)
+        while i and (not self.groups[i - 1].alive or self.groups[i - 1].anchor < peak):
+            i -= 1
+        if i and self.groups[i - 1].anchor == peak:
+            group = self.groups[i - 1]
+            heapq.heappush(group.orders, item)
+        else:
+            group = _TrailGroup(anchor=peak, orders=[item])
+            self.groups.insert(i, group)
+        self.index.trail_groups[order_id] = group
+        group.version += 1
+        self._push_level(group)
+
+    def _push_level(self, group: _TrailGroup):
+        self._clean(group)
+        if group.orders:
+            level = group.anchor - group.orders[0][0]
+            heapq.heappush(self.group_levels, (-level, next(self.index.seq), group.version, group))
+
+    def _clean(self, group: _TrailGroup):
+        """Drop cancelled orders from the top of a group."""
+        while group.orders and group.orders[0][2] not in self.index.orders:
+            heapq.heappop(group.orders)
+            self.entries -= 1
+        if not group.orders:
+            group.alive = False
+
+    def _ratchet(self, x: float):
+        """Raise peaks to ``x``, merging every group it passes."""
+        merged: Optional[_TrailGroup] = None
+        changed = False
+        while self.groups and (not self.groups[-1].alive or self.groups[-1].anchor <= x):
+            group = self.groups.pop()
+            if not group.alive:
+                continue
+            if merged is None:
+                merged = group
+                continue
+            small, merged = sorted((group, merged), key=lambda g: len(g.orders))
+            for item in small.orders:
+                heapq.heappush(merged.orders, item)
+                self.index.trail_groups[item[2]] = merged
+            small.alive = False
+            changed = True
+        if merged is not None:
+            changed = changed or merged.anchor < x
+            merged.anchor = max(merged.anchor, x)
+            self.groups.append(merged)
+            if changed:
+                merged.version += 1
+                self._push_level(merged)
+
+    def tick(self, x: float) -> List[Tuple[int, float]]:
+        """
+        Process a signed price.
+
+        Returns:
+            (order id, level) for every live order crossed by ``x``
+        """
+        self.last_x = x
+        fired = []
+
+        while self.fixed and -self.fixed[0][0] >= x:
+            neg_level, _, order_id = heapq.heappop(self.fixed)
+            self.entries -= 1
+            if order_id in self.index.orders:
+                fired.append((order_id, -neg_level))
+
+        # Fire before ratcheting: the peak so far is what the stop trailed
+        while self.group_levels and -self.group_levels[0][0] >= x:
+            _, _, version, group = heapq.heappop(self.group_levels)
+            if not group.alive or version != group.version:
+                continue
+            self._clean(group)
+            while group.orders and group.anchor - group.orders[0][0] >= x:
+                distance, _, order_id = heapq.heappop(group.orders)
+                self.entries -= 1
+                if order_id in self.index.orders:
+                    fired.append((order_id, group.anchor - distance))
+                self._clean(group)
+            if group.orders:
+                group.version += 1
+                self._push_level(group)
+
+        if self.groups:
+            self._ratchet(x)
+            self.compact_if_sparse()
+        return fired
+
+    def compact_if_sparse(self):
+        """Rebuild once cancelled entries (or stale group levels) outnumber live ones."""
+        sparse = self.entries > max(2 * self.live, COMPACT_MIN_ENTRIES)
+        stale = len(self.group_levels) > max(2 * len(self.groups), COMPACT_MIN_ENTRIES)
+        if sparse or stale:
+            self._compact()
+
+    def _compact(self):
+        """Rebuild every heap from live orders only: O(n) for n entries."""
+        orders = self.index.orders
+        self.fixed = [item for item in self.fixed if item[2] in orders]
+        heapq.heapify(self.fixed)
+        groups = []
+        for group in self.groups:
+            if not group.alive:
+                continue
+            group.orders = [item for item in group.orders if item[2] in orders]
+            heapq.heapify(group.orders)
+            if group.orders:
+                groups.append(group)
+            else:
+                group.alive = False
+        self.groups = groups
+        self.group_levels = []
+        for group in groups:
+            group.version += 1
+            self._push_level(group)
+        self.entries = len(self.fixed) + sum(len(group.orders) for group in groups)
+
+
+class TriggerIndex:
+    """
+    Exit triggers for open positions, indexed per symbol.
+
+    Each position arms an OCO group of up to three legs (stop loss, take
+    profit, trailing stop); the first leg to fire disarms the others. A
+    price update pops only the legs it crossed, so a tick costs
+    O(log n + k) for n armed legs and k fired ones rather than a pass over
+    every position.
+    """
+
+    def __init__(self):
+        self.seq = itertools.count()
+        self.books: Dict[Tuple[str, int], _LevelBook] = {}
+        # order id -> (position key, reason, symbol, sign, trail distance)
+        self.orders: Dict[int, Tuple[str, str, str, int, Optional[float]]] = {}
+        self.legs: Dict[str, List[int]] = {}
+        self.trail_groups: Dict[int, _TrailGroup] = {}
+        self._ids = itertools.count(1)
+
+    def _book(self, symbol: str, sign: int) -> _LevelBook:
+        book = self.books.get((symbol, sign))
+        if book is None:
+            book = self.books[(symbol, sign)] = _LevelBook(self)
+        return book
+
+    def arm(
+        self,
+        key: str,
+        symbol: str,
+        side: str,
+        stop_loss: Optional[float] = None,
+        take_profit: Optional[float] = None,
+        trail_distance: Optional[float] = None,
+        peak: Optional[float] = None
+    ):
+        """
+        Arm exit legs for a position (replacing any already armed).
+
+        Args:
+            key: Position key
+            symbol: Trading pair
+            side: 'long' or 'short'
+            stop_loss: Fixed stop level
+            take_profit: Fixed target level
+            trail_distance: Trailing stop distance in price units
+            peak: Best price reached so far (highest for longs, lowest for
+                shorts) that the trailing stop follows; required with
+                ``trail_distance``
+        """
+        self.disarm(key)
+        long = side == 'long'
+        legs = []
+        if stop_loss is not None:
+            # Longs stop out on a fall (x = price), shorts on a rise (x = -price)
+            sign = 1 if long else -1
+            legs.append(self._add(key, STOP_LOSS, symbol, sign, level=sign * stop_loss))
+        if take_profit is not None:
+            sign = -1 if long else 1
+            legs.append(self._add(key, TAKE_PROFIT, symbol, sign, level=sign * take_profit))
+        if trail_distance:
+            sign = 1 if long else -1
+            legs.append(self._add(key, TRAILING_STOP, symbol, sign, trail=(trail_distance, sign * peak)))
+        self.legs[key] = legs
+
+    def _add(self, key, reason, symbol, sign, level=None, trail=None) -> int:
+        order_id = next(self._ids)
+        self.orders[order_id] = (key, reason, symbol, sign, trail[0] if trail else None)
+        book = self._book(symbol, sign)
+        if trail:
+            book.add_trailing(order_id, *trail)
+        else:
+            book.add_fixed(order_id, level)
+        return order_id
+
+    def disarm(self, key: str):
+        """Cancel all legs of a position."""
+        books = set()
+        for order_id in self.legs.pop(key, ()):
+            order = self.orders.pop(order_id, None)
+            self.trail_groups.pop(order_id, None)
+            if order is not None:
+                book = self.books[(order[2], order[3])]
+                book.live -= 1
+                books.add(book)
+        for book in books:
+            book.compact_if_sparse()
+
+    def clear(self):
+        """Cancel everything."""
+        self.__init__()
+
+    def trailing_stop(self, key: str) -> Optional[float]:
+        """Current trailing stop price of a position, if it has one."""
+        for order_id in self.legs.get(key, ()):
+            _, reason, _, sign, distance = self.orders[order_id]
+            if reason == TRAILING_STOP:
+                return sign * (self.trail_groups[order_id].anchor - distance)
+        return None
+
+    def on_price(self, symbol: str, price: float) -> List[Tuple[str, str, float]]:
+        """
+        Process a price update.
+
+        Args:
+            symbol: Trading pair
+            price: Latest price
+
+        Returns:
+            (position key, exit reason, trigger level) for each position
+            exited; its other legs are disarmed (OCO)
+        """
+        fired = []
+        for sign in (1, -1):
+            book = self.books.get((symbol, sign))
+            if book is None:
+                continue
+            for order_id, level in book.tick(sign * price):
+                if order_id not in self.orders:
+                    continue  # sibling leg already fired on this tick
+                key, reason, _, _, _ = self.orders[order_id]
+                fired.append((key, reason, sign * level))
+                self.disarm(key)
+        return fired
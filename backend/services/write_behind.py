@@ -0,0 +1,385 @@
+"""
+Write-Behind Queue.
+Coalesces trade lifecycle writes and equity samples into periodic bulk statements.
+"""
+import asyncio
+import logging
+import time
+from collections import defaultdict, deque
+from typing import Deque, Dict, List, Optional, Tuple
+
+from sqlalchemy import func, insert, select, text, update
+from sqlalchemy.exc import InterfaceError, OperationalError
+
+from ..config import settings
+from ..database import AsyncSessionLocal
+from ..models.equity_sample import EquitySample
+from ..models.trade import Trade
+from .clock import clock
+from .trade_records import record_closed_positions
+
+logger = logging.getLogger(__name__)
+
+# Errors that mean the database is unreachable rather than a bad row
+CONNECTION_ERRORS = (OperationalError, InterfaceError, OSError, asyncio.TimeoutError)
+# Rows kept for inspection after exhausting their retries
+DEAD_LETTER_LIMIT = 1000
+NO_ROW = "no trade row with this id"
+
+
+async def _update_trade(db, trade_id: int, values: Dict) -> bool:
+    """UPDATE one trade by id; False if no such row exists."""
+    result = await db.execute(
+        update(Trade).where(Trade.id == trade_id).values(**values).returning(Trade.id)
+    )
+    return result.first() is not None
+
+
+class TradeIdPool:
+    """
+    Trade ids handed out ahead of the INSERT.
+
+    On PostgreSQL a block of ``trades_id_seq`` values is fetched in one
+    statement, so ids stay unique across workers and an open costs no round
+    trip until the block runs out. Other dialects (SQLite in development)
+    continue from MAX(id), which is only safe for a single process.
+    """
+
+    def __init__(self, block_size: Optional[int] = None):
+        """
+        Initialize pool.
+
+        Args:
+            block_size: Ids reserved per round trip (default settings.TRADE_ID_BLOCK)
+        """
+        self.block_size = block_size or settings.TRADE_ID_BLOCK
+        self._ids: List[int] = []
+        self._lock = asyncio.Lock()
+        self._next_local: Optional[int] = None
+
+    async def next(self) -> int:
+        """Reserve one trade id."""
+        async with self._lock:
+            if not self._ids:
+                self._ids = await self._reserve(self.block_size)
+            return self._ids.pop(0)
+
+    async def _reserve(self, n: int) -> List[int]:
+        async with AsyncSessionLocal() as db:
+            if db.bind.dialect.name == 'postgresql':
+                result = await db.execute(
+                    text("SELECT nextval('trades_id_seq') FROM generate_series(1, :n)"),
+                    {'n': n}
+                )
+                return [row[0] for row in result]
+            if self._next_local is None:
+                self._next_local = (await db.scalar(select(func.coalesce(func.max(Trade.id), 0)))) + 1
+        start, self._next_local = self._next_local, self._next_local + n
+        return list(range(start, start + n))
+
+
+class WriteBehindQueue:
+    """
+    Buffers trade inserts/updates and equity samples, flushing them together.
+
+    - A trade's open and close are merged while still pending, so a trade
+      opened and closed within one interval is a single INSERT.
+    - Every flush is one transaction: inserts, then updates (one UPDATE by
+      primary key each, checked for the row it matched), then equity
+      samples. A trade's later changes therefore never reach the database
+      before its earlier ones.
+    - Flushes happen every ``flush_seconds`` or as soon as ``max_batch``
+      writes are pending, so latency is bounded and the number of
+      transactions does not grow with the number of symbols.
+    - A failed batch is retried row by row, so one bad row (e.g. a close
+      for a trade whose insert was lost with a crashed worker) cannot block
+      the rest. Rows that keep failing are requeued up to ``max_attempts``
+      times and then moved to ``dead_letters``. Connection errors requeue
+      everything without counting, so an outage loses nothing.
+    """
+
+    def __init__(
+        self,
+        flush_seconds: Optional[float] = None,
+        max_batch: Optional[int] = None,
+        id_pool: Optional[TradeIdPool] = None,
+        max_attempts: Optional[int] = None
+    ):
+        """
+        Initialize queue.
+
+        Args:
+            flush_seconds: Max delay before a write is flushed (default settings.WRITE_BEHIND_FLUSH_SECONDS)
+            max_batch: Pending writes that trigger an early flush (default settings.WRITE_BEHIND_MAX_BATCH)
+            id_pool: Trade id reservation pool
+            max_attempts: Row-by-row failures before a trade write is dead-lettered
+                (default settings.WRITE_BEHIND_MAX_ATTEMPTS)
+        """
+        self.flush_seconds = flush_seconds or settings.WRITE_BEHIND_FLUSH_SECONDS
+        self.max_batch = max_batch or settings.WRITE_BEHIND_MAX_BATCH
+        self.max_attempts = max_attempts or settings.WRITE_BEHIND_MAX_ATTEMPTS
+        self.ids = id_pool or TradeIdPool()
+
+        self.inserts: Dict[int, Dict] = {}
+        self.updates: Dict[int, Dict] = defaultdict(dict)
+        self.equity: List[Dict] = []
+        self.attempts: Dict[int, int] = {}
+        self.dead_letters: Deque[Dict] = deque(maxlen=DEAD_LETTER_LIMIT)
+
+        self._wake = asyncio.Event()
+        self._flush_lock = asyncio.Lock()
+        self._running = False
+        self.flushes = 0
+        self.written = 0
+
+    @property
+    def pending(self) -> int:
+        """Number of buffered writes."""
+        return len(self.inserts) + len(self.updates) + len(self.equity)
+
+    def _added(self):
+        if self.pending >= self.max_batch:
+            self._wake.set()
+
+    async def reserve_trade_id(self) -> int:
+        """Trade id to assign to a position before its row is written."""
+        return await self.ids.next()
+
+    def add_trade(self, trade_id: int, **values):
+        """
+        Queue a new trade row.
+
+        Args:
+            trade_id: Id from ``reserve_trade_id``
+            **values: Trade column values
+        """
+        self.inserts[trade_id] = {'id': trade_id, **values}
+        self._added()
+
+    def update_trade(self, trade_id: int, **values):
+        """
+        Queue column changes for a trade (merged with any pending write for it).
+
+        Args:
+            trade_id: Trade id
+            **values: Changed column values
+        """
+        if trade_id in self.inserts:
+            self.inserts[trade_id].update(values)
+        else:
+            self.updates[trade_id].update(values)
+        self._added()
+
+    def add_equity(self, sample: Dict):
+        """Queue an ``equity_history`` row."""
+        self.equity.append(sample)
+        self._added()
+
+    async def record_closed(self, symbol: str, closed_positions: List[Dict]):
+        """
+        Queue closes of positions returned by the paper engine.
+
+        Positions opened before trade ids were assigned are matched and
+        written immediately through the legacy lookup.
+
+        Args:
+            symbol: Trading pair
+            closed_positions: Closed position dicts
+        """
+        legacy = []
+        for pos in closed_positions:
+            if pos.get('trade_id') is None:
+                legacy.append(pos)
+                continue
+            self.update_trade(
+                pos['trade_id'],
+                exit_price=pos['exit_price'],
+                pnl=pos['pnl'],
+                pnl_pct=pos['pnl_pct'],
+                exit_reason=pos['exit_reason'],
+                closed_at=pos.get('closed_at') or clock.utcnow(),
+                status='closed'
+            )
+        if legacy:
+            async with AsyncSessionLocal() as db:
+                await record_closed_positions(db, symbol, legacy)
+                await db.commit()
+
+    async def flush(self) -> int:
+        """
+        Write everything buffered in one transaction.
+
+        Inserts and equity samples go out as multi-row statements. Updates
+        are one ``UPDATE ... RETURNING id`` each, because drivers such as
+        asyncpg do not report per-row counts for executemany: an update
+        whose row is missing (e.g. a close for a trade another worker
+        opened whose INSERT has not landed yet) would otherwise count as
+        written. Updates that matched no row are retried like failed rows.
+        If the batch fails, its rows are retried one transaction each; see
+        the class docstring for how failing rows are handled.
+
+        Returns:
+            Number of writes flushed
+        """
+        async with self._flush_lock:
+            inserts, self.inserts = self.inserts, {}
+            updates, self.updates = self.updates, defaultdict(dict)
+            equity, self.equity = self.equity, []
+            count = len(inserts) + len(updates) + len(equity)
+            if not count:
+                return 0
+
+            missing = []
+            try:
+                async with AsyncSessionLocal() as db:
+                    if inserts:
+                        await db.execute(insert(Trade), list(inserts.values()))
+                    for trade_id, values in updates.items():
+                        if not await _update_trade(db, trade_id, values):
+                            missing.append(trade_id)
+                    if equity:
+                        await db.execute(insert(EquitySample), equity)
+                    await db.commit()
+            except CONNECTION_ERRORS:
+                self._requeue(inserts, updates, equity)
+                raise
+            except Exception as e:
+                logger.warning(f"Write-behind batch of {count} failed, retrying row by row: {e}")
+                count = await self._flush_rows(inserts, updates, equity)
+            else:
+                failed_updates: Dict[int, Dict] = {}
+                for trade_id in missing:
+                    self._row_failed('update', trade_id, updates[trade_id], NO_ROW, {}, failed_updates)
+                for trade_id in (*inserts, *updates):
+                    if trade_id not in missing:
+                        self.attempts.pop(trade_id, None)
+                if failed_updates:
+                    self._requeue({}, failed_updates, [])
+                count -= len(missing)
+
+            self.flushes += 1
+            self.written += count
+            return count
+
+    async def _write_row(self, kind: str, trade_id: int, values: Dict) -> bool:
+        """Write one trade row in its own transaction; False if an update matched no row."""
+        async with AsyncSessionLocal() as db:
+            if kind == 'insert':
+                await db.execute(insert(Trade).values(**values))
+                ok = True
+            else:
+                ok = await _update_trade(db, trade_id, values)
+            await db.commit()
+        return ok
+
+    def _row_failed(
+        self,
+        kind: str,
+        trade_id: int,
+        values: Dict,
+        error: str,
+        failed_inserts: Dict[int, Dict],
+        failed_updates: Dict[int, Dict]
+    ):
+        """Count a failed trade write and set it aside for retry, or dead-letter it."""
+        attempts = self.attempts.get(trade_id, 0) + 1
+        if attempts >= self.max_attempts:
+            self.attempts.pop(trade_id, None)
+            self.dead_letters.append({'kind': kind, 'trade_id': trade_id, 'values': values, 'error': error})
+            logger.error(f"Dropped trade {trade_id} {kind} after {attempts} attempts: {error}")
+        else:
+            self.attempts[trade_id] = attempts
+            (failed_inserts if kind == 'insert' else failed_updates)[trade_id] = values
+            logger.warning(f"Trade {trade_id} {kind} failed (attempt {attempts}/{self.max_attempts}): {error}")
+
+    async def _flush_rows(self, inserts: Dict[int, Dict], updates: Dict[int, Dict], equity: List[Dict]) -> int:
+        """
+        Write a failed batch one row per transaction.
+
+        Returns:
+            Number of rows written
+        """
+        written = 0
+        failed_inserts: Dict[int, Dict] = {}
+        failed_updates: Dict[int, Dict] = {}
+        rows: List[Tuple[str, int, Dict]] = (
+            [('insert', trade_id, values) for trade_id, values in inserts.items()]
+            + [('update', trade_id, values) for trade_id, values in updates.items()]
+        )
+
+        for i, (kind, trade_id, values) in enumerate(rows):
+            try:
+                ok = await self._write_row(kind, trade_id, values)
+                error = None if ok else NO_ROW
+            except CONNECTION_ERRORS:
+                # Database unreachable: requeue the rest untouched, as for a failed batch
+                for rest_kind, rest_id, rest_values in rows[i:]:
+                    (failed_inserts if rest_kind == 'insert' else failed_updates)[rest_id] = rest_values
+                self._requeue(failed_inserts, failed_updates, equity)
+                raise
+            except Exception as e:
+                ok, error = False, str(e)
+
+            if ok:
+                written += 1
+                self.attempts.pop(trade_id, None)
+            else:
+                self._row_failed(kind, trade_id, values, error, failed_inserts, failed_updates)
+
+        # Equity samples are expendable: a bad one is logged and skipped
+        for sample in equity:
+            try:
+                async with AsyncSessionLocal() as db:
+                    await db.execute(insert(EquitySample).values(**sample))
+                    await db.commit()
+                written += 1
+            except CONNECTION_ERRORS:
+                self._requeue(failed_inserts, failed_updates, [])
+                raise
+            except Exception as e:
+                logger.error(f"Dropped equity sample at {sample.get('time')}: {e}")
+
+        if failed_inserts or failed_updates:
+            self._requeue(failed_inserts, failed_updates, [])
+        return written
+
+    def _requeue(self, inserts: Dict[int, Dict], updates: Dict[int, Dict], equity: List[Dict]):
+        """Put a failed batch back ahead of writes queued since."""
+        for trade_id, values in self.inserts.items():
+            inserts.setdefault(trade_id, {}).update(values)
+        for trade_id, values in self.updates.items():
+            if trade_id in inserts:
+                inserts[trade_id].update(values)
+            else:
+                updates.setdefault(trade_id, {}).update(values)
+        self.inserts = inserts
+        self.updates = defaultdict(dict, updates)
+        # Equity samples are expendable; keep at most a day's worth
+        limit = int(86400 / settings.EQUITY_SAMPLE_SECONDS)
+        self.equity = (equity + self.equity)[-limit:]
+
+    async def run(self):
+        """Flush every ``flush_seconds`` (sooner when a batch fills up)."""
+        self._running = True
+        while self._running:
+            try:
+                await asyncio.wait_for(self._wake.wait(), timeout=clock.timeout(self.flush_seconds))
+            except asyncio.TimeoutError:
+                pass
+            self._wake.clear()
+            started = time.monotonic()
+            try:
+                flushed = await self.flush()
+                if flushed:
+                    logger.debug(f"Flushed {flushed} write(s) in {(time.monotonic() - started) * 1000:.1f}ms")
+            except Exception as e:
+                logger.error(f"Write-behind flush failed ({self.pending} pending): {e}")
+
+    async def stop(self):
+        """Stop the loop and write whatever is still buffered."""
+        self._running = False
+        self._wake.set()
+        try:
+            await self.flush()
+        except Exception as e:
+            logger.error(f"Final write-behind flush failed, {self.pending} write(s) lost: {e}")
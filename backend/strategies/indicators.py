@@ -0,0 +1,427 @@
+"""
+Indicator Kernels.
+TA-Lib-compatible EMA, Wilder RSI, ATR and rolling extremes with selectable backends.
+
+Backends (``settings.INDICATOR_BACKEND``):
+
+- ``talib``: TA-Lib C functions, one call per indicator
+- ``numpy``: vectorized NumPy, no native dependency beyond NumPy
+- ``numba``: one JIT-compiled pass computing every indicator together (default)
+
+All three produce the same values (NaN during warm-up, TA-Lib seeding);
+``benchmarks/indicator_parity.py`` checks them against TA-Lib.
+
+Hot paths pass ``out=workspace(n)`` so results land in per-thread buffers
+that are reused across calls instead of allocating a dozen arrays each time.
+"""
+import logging
+import math
+import threading
+from functools import lru_cache
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+from ..config import settings
+
+logger = logging.getLogger(__name__)
+
+try:
+    import talib
+except ImportError:  # optional: the numpy/numba backends cover the strategy
+    talib = None
+
+try:
+    import numba
+except ImportError:
+    numba = None
+
+BACKENDS = ('talib', 'numpy', 'numba')
+# Substitutes for a backend that is not installed, fastest first
+FALLBACK_ORDER = ('numba', 'talib', 'numpy')
+_fallback_warned = set()
+
+# Rows of the fused kernel's output
+EMA_FAST, EMA_SLOW, RSI, ATR, HIGHEST_HIGH, LOWEST_LOW = range(6)
+# Scratch rows used by the numpy backend after the outputs
+SCRATCH_ROWS = 6
+
+_local = threading.local()
+
+
+def workspace(n: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Reusable buffers for ``compute_indicators(..., out=...)`` on this thread.
+
+    Capacity grows to the next power of two and is kept, so a scan over
+    many symbols of similar length allocates once per thread (or worker
+    process). The returned views are overwritten by the next call.
+
+    Args:
+        n: Number of bars
+
+    Returns:
+        (floats of shape (6 + SCRATCH_ROWS, n), bools of shape (2, n))
+    """
+    floats = getattr(_local, 'floats', None)
+    if floats is None or floats.shape[1] < n:
+        capacity = 1 << max(6, (n - 1).bit_length())
+        floats = _local.floats = np.empty((6 + SCRATCH_ROWS, capacity))
+        _local.bools = np.empty((2, capacity), dtype=bool)
+    return floats[:, :n], _local.bools[:, :n]
+
+
+def available_backends() -> tuple:
+    """Backends whose dependencies are installed."""
+    return tuple(
+        name for name in BACKENDS
+        if (name != 'talib' or talib is not None) and (name != 'numba' or numba is not None)
+    )
+
+
+def resolve_backend(name: Optional[str] = None) -> str:
+    """
+    Pick the backend to use, falling back to the fastest installed one.
+
+    Args:
+        name: Requested backend (default settings.INDICATOR_BACKEND)
+
+    Returns:
+        Backend name
+
+    Raises:
+        ValueError: If the name is unknown
+    """
+    name = name or settings.INDICATOR_BACKEND
+    if name not in BACKENDS:
+        raise ValueError(f"Unknown indicator backend: {name}")
+    installed = available_backends()
+    if name not in installed:
+        fallback = next(backend for backend in FALLBACK_ORDER if backend in installed)
+        if name not in _fallback_warned:
+            _fallback_warned.add(name)
+            logger.warning(f"Indicator backend '{name}' is not installed, using {fallback}")
+        return fallback
+    return name
+
+
+def warm_up(backend: Optional[str] = None) -> str:
+    """
+    Resolve the backend and run it once on a short series.
+
+    For ``numba`` this compiles the fused kernel (or loads it from the
+    on-disk cache) at startup instead of on the first signal.
+
+    Args:
+        backend: Requested backend (default settings.INDICATOR_BACKEND)
+
+    Returns:
+        Backend in use
+    """
+    backend = resolve_backend(backend)
+    close = np.linspace(100.0, 110.0, 64)
+    compute_indicators(
+        close * 1.01, close * 0.99, close,
+        settings.EMA_FAST, settings.EMA_SLOW, settings.RSI_LENGTH, settings.ATR_LENGTH, settings.LOOKBACK,
+        backend=backend
+    )
+    return backend
+
+
+# ---------------------------------------------------------------------------
+# NumPy backend
+# ---------------------------------------------------------------------------
+
+@lru_cache(maxsize=256)
+def _powers(decay: float, n: int) -> np.ndarray:
+    """decay ** [1..n], cached (the block lengths repeat across calls)."""
+    powers = decay ** np.arange(1, n + 1)
+    powers.flags.writeable = False
+    return powers
+
+
+def _smooth(values: np.ndarray, alpha: float, initial: float, out: np.ndarray):
+    """
+    Exponential smoothing y[t] = y[t-1] + alpha * (x[t] - y[t-1]) without a Python loop.
+
+    Within a block y[k] = d^k * (y[0] + alpha * sum_j x[j] / d^j) with
+    d = 1 - alpha, so each block is one cumsum. Blocks are short enough that
+    d^-k stays finite; the terms are non-negative for prices, gains, losses
+    and true ranges, so the cumsum loses no precision.
+    """
+    decay = 1.0 - alpha
+    if decay <= 0.0:
+        out[:] = values
+        return
+    block = max(1, int(250 / -math.log10(decay)))
+    previous = initial
+    for start in range(0, values.shape[0], block):
+        segment = values[start:start + block]
+        powers = _powers(decay, segment.shape[0])
+        result = out[start:start + segment.shape[0]]
+        np.divide(segment, powers, out=result)
+        np.cumsum(result, out=result)
+        result *= alpha
+        result += previous
+        result *= powers
+        previous = result[-1]
+
+
+def _nan_row(n: int, out: Optional[np.ndarray]) -> np.ndarray:
+    if out is None:
+        return np.full(n, np.nan)
+    out.fill(np.nan)
+    return out
+
+
+def ema(values: np.ndarray, period: int, out: Optional[np.ndarray] = None) -> np.ndarray:
+    """EMA seeded with the SMA of the first ``period`` values (TA-Lib EMA)."""
+    out = _nan_row(values.shape[0], out)
+    if values.shape[0] < period:
+        return out
+    out[period - 1] = values[:period].mean()
+    _smooth(values[period:], 2.0 / (period + 1), out[period - 1], out[period:])
+    return out
+
+
+def _wilder(values: np.ndarray, period: int, out: np.ndarray):
+    """Wilder average of ``values[1:]`` into ``out`` from index ``period`` on."""
+    out[period] = values[1:period + 1].mean()
+    _smooth(values[period + 1:], 1.0 / period, out[period], out[period + 1:])
+
+
+def rsi(
+    close: np.ndarray,
+    period: int,
+    out: Optional[np.ndarray] = None,
+    scratch: Optional[np.ndarray] = None
+) -> np.ndarray:
+    """Wilder RSI (TA-Lib RSI); ``scratch`` is an optional (4, n) buffer."""
+    n = close.shape[0]
+    out = _nan_row(n, out)
+    if n <= period:
+        return out
+    if scratch is None:
+        scratch = np.empty((4, n))
+    gain, loss, avg_gain, avg_loss = scratch[0], scratch[1], scratch[2], scratch[3]
+    gain[0] = 0.0
+    np.subtract(close[1:], close[:-1], out=gain[1:])
+    np.negative(gain, out=loss)
+    np.maximum(gain, 0.0, out=gain)
+    np.maximum(loss, 0.0, out=loss)
+    _wilder(gain, period, avg_gain)
+    _wilder(loss, period, avg_loss)
+    # RSI = 100 * gain / (gain + loss), 0 when both are zero
+    total = np.add(avg_gain[period:], avg_loss[period:], out=loss[period:])
+    result = out[period:]
+    np.multiply(avg_gain[period:], 100.0, out=result)
+    np.divide(result, total, out=result, where=total > 0)
+    result[total <= 0] = 0.0
+    return out
+
+
+def atr(
+    high: np.ndarray,
+    low: np.ndarray,
+    close: np.ndarray,
+    period: int,
+    out: Optional[np.ndarray] = None,
+    scratch: Optional[np.ndarray] = None
+) -> np.ndarray:
+    """Wilder ATR over true ranges from the second bar on (TA-Lib ATR)."""
+    n = close.shape[0]
+    out = _nan_row(n, out)
+    if n <= period:
+        return out
+    true_range = scratch if scratch is not None else np.empty(n)
+    true_range[0] = 0.0
+    np.maximum(high[1:], close[:-1], out=true_range[1:])
+    true_range[1:] -= np.minimum(low[1:], close[:-1])
+    _wilder(true_range, period, out)
+    return out
+
+
+def rolling(values: np.ndarray, period: int, reducer, out: Optional[np.ndarray] = None) -> np.ndarray:
+    """Rolling reduction over ``period`` values, NaN until the window fills."""
+    out = _nan_row(values.shape[0], out)
+    if values.shape[0] >= period:
+        reducer(sliding_window_view(values, period), axis=1, out=out[period - 1:])
+    return out
+
+
+# ---------------------------------------------------------------------------
+# Fused kernel (compiled by Numba when installed)
+# ---------------------------------------------------------------------------
+
+def _fused_kernel(high, low, close, fast_period, slow_period, rsi_period, atr_period, lookback, out):
+    """
+    Every indicator in one pass over the bars, written into ``out`` (6 x n).
+
+    Plain Python is only used to verify the kernel; it is meant to run
+    compiled.
+    """
+    n = close.shape[0]
+    out[:, :] = np.nan
+    k_fast = 2.0 / (fast_period + 1)
+    k_slow = 2.0 / (slow_period + 1)
+    sum_fast = 0.0
+    sum_slow = 0.0
+    ema_fast = 0.0
+    ema_slow = 0.0
+    gain = 0.0
+    loss = 0.0
+    avg_tr = 0.0
+    # Monotonic deques of indexes for the rolling extremes
+    max_idx = np.empty(n, dtype=np.int64)
+    min_idx = np.empty(n, dtype=np.int64)
+    max_head = 0
+    max_tail = 0
+    min_head = 0
+    min_tail = 0
+
+    for i in range(n):
+        c = close[i]
+
+        # EMAs: SMA seed, then exponential smoothing
+        if i < fast_period:
+            sum_fast += c
+            if i == fast_period - 1:
+                ema_fast = sum_fast / fast_period
+                out[0, i] = ema_fast
+        else:
+            ema_fast += k_fast * (c - ema_fast)
+            out[0, i] = ema_fast
+        if i < slow_period:
+            sum_slow += c
+            if i == slow_period - 1:
+                ema_slow = sum_slow / slow_period
+                out[1, i] = ema_slow
+        else:
+            ema_slow += k_slow * (c - ema_slow)
+            out[1, i] = ema_slow
+
+        if i > 0:
+            # RSI: Wilder averages of gains and losses
+            change = c - close[i - 1]
+            up = change if change > 0 else 0.0
+            down = -change if change < 0 else 0.0
+            if i <= rsi_period:
+                gain += up
+                loss += down
+                if i == rsi_period:
+                    gain /= rsi_period
+                    loss /= rsi_period
+            else:
+                gain += (up - gain) / rsi_period
+                loss += (down - loss) / rsi_period
+            if i >= rsi_period:
+                total = gain + loss
+                out[2, i] = 100.0 * gain / total if total > 0 else 0.0
+
+            # ATR: Wilder average of true ranges
+            prev = close[i - 1]
+            tr = (high[i] if high[i] > prev else prev) - (low[i] if low[i] < prev else prev)
+            if i <= atr_period:
+                avg_tr += tr
+                if i == atr_period:
+                    avg_tr /= atr_period
+                    out[3, i] = avg_tr
+            else:
+                avg_tr += (tr - avg_tr) / atr_period
+                out[3, i] = avg_tr
+
+        # Rolling extremes
+        while max_tail > max_head and high[max_idx[max_tail - 1]] <= high[i]:
+            max_tail -= 1
+        max_idx[max_tail] = i
+        max_tail += 1
+        if max_idx[max_head] <= i - lookback:
+            max_head += 1
+        while min_tail > min_head and low[min_idx[min_tail - 1]] >= low[i]:
+            min_tail -= 1
+        min_idx[min_tail] = i
+        min_tail += 1
+        if min_idx[min_head] <= i - lookback:
+            min_head += 1
+        if i >= lookback - 1:
+            out[4, i] = high[max_idx[max_head]]
+            out[5, i] = low[min_idx[min_head]]
+
+
+fused_kernel = numba.njit(cache=True, nogil=True)(_fused_kernel) if numba is not None else _fused_kernel
+
+
+# ---------------------------------------------------------------------------
+# Entry point
+# ---------------------------------------------------------------------------
+
+def compute_indicators(
+    high: np.ndarray,
+    low: np.ndarray,
+    close: np.ndarray,
+    ema_fast: int,
+    ema_slow: int,
+    rsi_length: int,
+    atr_length: int,
+    lookback: int,
+    backend: Optional[str] = None,
+    out: Optional[Tuple[np.ndarray, np.ndarray]] = None
+) -> Dict[str, np.ndarray]:
+    """
+    Calculate the strategy's indicators on float64 arrays.
+
+    Args:
+        high: High prices
+        low: Low prices
+        close: Close prices
+        ema_fast: Fast EMA period
+        ema_slow: Slow EMA period
+        rsi_length: RSI period
+        atr_length: ATR period
+        lookback: Breakout lookback
+        backend: 'talib', 'numpy' or 'numba' (default settings.INDICATOR_BACKEND)
+        out: Buffers from ``workspace(n)``; the returned arrays are then views
+            into them (valid until the next call on this thread). Fresh
+            arrays are allocated when omitted.
+
+    Returns:
+        Dict of indicator arrays aligned with the inputs
+    """
+    backend = resolve_backend(backend)
+    n = close.shape[0]
+    if out is None:
+        floats, bools = np.empty((6 + SCRATCH_ROWS, n)), np.empty((2, n), dtype=bool)
+    else:
+        floats, bools = out
+
+    if backend == 'numba':
+        fused_kernel(high, low, close, ema_fast, ema_slow, rsi_length, atr_length, lookback, floats[:6])
+    elif backend == 'talib':
+        # TA-Lib allocates its results; copy them into place
+        floats[EMA_FAST] = talib.EMA(close, timeperiod=ema_fast)
+        floats[EMA_SLOW] = talib.EMA(close, timeperiod=ema_slow)
+        floats[RSI] = talib.RSI(close, timeperiod=rsi_length)
+        floats[ATR] = talib.ATR(high, low, close, timeperiod=atr_length)
+        rolling(high, lookback, np.max, out=floats[HIGHEST_HIGH])
+        rolling(low, lookback, np.min, out=floats[LOWEST_LOW])
+    else:
+        scratch = floats[6:]
+        ema(close, ema_fast, out=floats[EMA_FAST])
+        ema(close, ema_slow, out=floats[EMA_SLOW])
+        rsi(close, rsi_length, out=floats[RSI], scratch=scratch[:4])
+        atr(high, low, close, atr_length, out=floats[ATR], scratch=scratch[4])
+        rolling(high, lookback, np.max, out=floats[HIGHEST_HIGH])
+        rolling(low, lookback, np.min, out=floats[LOWEST_LOW])
+
+    fast, slow = floats[EMA_FAST], floats[EMA_SLOW]
+    return {
+        'ema_fast': fast,
+        'ema_slow': slow,
+        'rsi': floats[RSI],
+        'atr': floats[ATR],
+        'highest_high': floats[HIGHEST_HIGH],
+        'lowest_low': floats[LOWEST_LOW],
+        'uptrend': np.greater(fast, slow, out=bools[0]),
+        'downtrend': np.less(fast, slow, out=bools[1]),
+    }
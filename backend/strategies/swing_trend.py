@@ -2,10 +2,58 @@
 Swing Trend Baseline Strategy.
 Uses EMA crossover, RSI, and price breakouts with ATR-based stops.
 """
+import numpy as np
 import pandas as pd
-import talib
-from typing import Optional, Dict
+from dataclasses import dataclass
+from typing import Optional, Dict, Tuple, Union
 from ..config import settings
+from ..services.candle_store import CandleArrays
+from .indicators import compute_indicators, resolve_backend, workspace
+
+INDICATOR_COLUMNS = (
+    'ema_fast', 'ema_slow', 'rsi', 'atr', 'highest_high', 'lowest_low', 'uptrend', 'downtrend'
+)
+
+
+def as_candles(data: Union[CandleArrays, pd.DataFrame]) -> CandleArrays:
+    """Accept either ``fetch_candles`` arrays or a ``fetch_ohlcv`` DataFrame."""
+    return CandleArrays.from_frame(data) if isinstance(data, pd.DataFrame) else data
+
+
+@dataclass(frozen=True)
+class BreakoutTrigger:
+    """
+    Entry levels for the bar after ``bar_time``, published once it closes.
+    
+    ``generate_signal`` compares the forming bar with the last closed one.
+    Its breakout, trend and RSI conditions each reduce to a price threshold
+    (the EMAs and RSI of the forming bar are monotonic in its close), so a
+    long can only fire above ``long_above`` and a short only below
+    ``short_below``; a tick needs two float comparisons to rule both out.
+    """
+    bar_time: int  # open time of the last closed bar, epoch ms
+    breakout_high: float
+    breakout_low: float
+    trend_level: float  # forming-bar close above which EMA fast > EMA slow
+    rsi_level: float    # forming-bar close above which RSI > 50
+    atr: float
+    rsi: float
+    
+    @property
+    def long_above(self) -> float:
+        return max(self.breakout_high, self.trend_level, self.rsi_level)
+    
+    @property
+    def short_below(self) -> float:
+        return min(self.breakout_low, self.trend_level, self.rsi_level)
+    
+    def side(self, price: float) -> Optional[str]:
+        """Side whose entry conditions ``price`` may satisfy, if any."""
+        if price > self.long_above:
+            return 'long'
+        if price < self.short_below:
+            return 'short'
+        return None
 
 
 class SwingTrendStrategy:
@@ -19,6 +67,107 @@ class SwingTrendStrategy:
         self.lookback = settings.LOOKBACK
         self.atr_length = settings.ATR_LENGTH
         self.rr_ratio = settings.RR_RATIO
+        self.indicator_backend = resolve_backend()
+    
+    @property
+    def params(self) -> Tuple:
+        """Parameters that determine the strategy's signals."""
+        return (
+            self.ema_fast, self.ema_slow, self.rsi_length,
+            self.lookback, self.atr_length, self.rr_ratio
+        )
+    
+    def compute_indicators(
+        self,
+        high: np.ndarray,
+        low: np.ndarray,
+        close: np.ndarray,
+        out: Optional[Tuple[np.ndarray, np.ndarray]] = None
+    ) -> Dict[str, np.ndarray]:
+        """
+        Calculate indicators directly on float64 arrays.
+
+        Accepts read-only memory-mapped views (e.g. from ``CandleStore``)
+        without copying the inputs. The kernels come from the configured
+        ``INDICATOR_BACKEND``.
+
+        Args:
+            high: High prices
+            low: Low prices
+            close: Close prices
+            out: Reusable buffers from ``indicators.workspace``
+
+        Returns:
+            Dict of indicator arrays aligned with the inputs
+        """
+        return compute_indicators(
+            high, low, close,
+            ema_fast=self.ema_fast,
+            ema_slow=self.ema_slow,
+            rsi_length=self.rsi_length,
+            atr_length=self.atr_length,
+            lookback=self.lookback,
+            backend=self.indicator_backend,
+            out=out
+        )
+
+    def breakout_trigger(self, closed: Union[CandleArrays, pd.DataFrame]) -> Optional[BreakoutTrigger]:
+        """
+        Precompute the entry levels for the next bar.
+        
+        Args:
+            closed: OHLCV of closed bars only (the forming bar excluded)
+        
+        Returns:
+            BreakoutTrigger, or None while indicators are still warming up
+        """
+        closed = as_candles(closed)
+        if len(closed) <= max(self.rsi_length, self.lookback, self.ema_slow):
+            return None
+        close = closed.close
+        ind = self.compute_indicators(closed.high, closed.low, close, out=workspace(len(closed)))
+        atr, rsi = ind['atr'][-1], ind['rsi'][-1]
+        if np.isnan(atr) or np.isnan(rsi) or np.isnan(ind['highest_high'][-1]):
+            return None
+        
+        # EMA_fast - EMA_slow of the forming bar is linear in its close
+        k_fast = 2.0 / (self.ema_fast + 1)
+        k_slow = 2.0 / (self.ema_slow + 1)
+        fast, slow = ind['ema_fast'][-1], ind['ema_slow'][-1]
+        if k_fast > k_slow:
+            trend_level = ((1 - k_slow) * slow - (1 - k_fast) * fast) / (k_fast - k_slow)
+        else:
+            # Fast period not shorter than slow: keep the side the EMAs are on now
+            trend_level = -np.inf if fast > slow else np.inf
+        
+        # Wilder RSI of the forming bar exceeds 50 iff its average gain
+        # exceeds its average loss: close > prev + (avg_loss - avg_gain) * (n - 1)
+        avg_gain, avg_loss = self._wilder_averages(close)
+        rsi_level = close[-1] + (avg_loss - avg_gain) * (self.rsi_length - 1)
+        
+        return BreakoutTrigger(
+            bar_time=int(closed.timestamp[-1]),
+            breakout_high=float(ind['highest_high'][-1]),
+            breakout_low=float(ind['lowest_low'][-1]),
+            trend_level=float(trend_level),
+            rsi_level=float(rsi_level),
+            atr=float(atr),
+            rsi=float(rsi)
+        )
+    
+    def _wilder_averages(self, close: np.ndarray):
+        """Average gain and loss behind the last TA-Lib RSI value."""
+        n = self.rsi_length
+        change = np.diff(close)
+        gain = np.clip(change, 0, None)
+        loss = np.clip(-change, 0, None)
+        # Seeded with the simple mean of the first n changes, then smoothed by 1/n
+        decay = 1 - 1 / n
+        tail = gain.shape[0] - n
+        weights = decay ** np.arange(tail - 1, -1, -1) / n
+        avg_gain = gain[:n].mean() * decay ** tail + gain[n:] @ weights
+        avg_loss = loss[:n].mean() * decay ** tail + loss[n:] @ weights
+        return float(avg_gain), float(avg_loss)
     
     def calculate_indicators(self, df: pd.DataFrame) -> pd.DataFrame:
         """
@@ -33,37 +182,27 @@ class SwingTrendStrategy:
         # Make copy to avoid modifying original
         df = df.copy()
         
-        # Convert to numpy arrays for TA-Lib
-        close = df['close'].values
-        high = df['high'].values
-        low = df['low'].values
-        
-        # Calculate EMAs
-        df['ema_fast'] = talib.EMA(close, timeperiod=self.ema_fast)
-        df['ema_slow'] = talib.EMA(close, timeperiod=self.ema_slow)
-        
-        # Calculate RSI
-        df['rsi'] = talib.RSI(close, timeperiod=self.rsi_length)
-        
-        # Calculate ATR
-        df['atr'] = talib.ATR(high, low, close, timeperiod=self.atr_length)
-        
-        # Calculate highest high and lowest low for breakout detection
-        df['highest_high'] = df['high'].rolling(window=self.lookback).max()
-        df['lowest_low'] = df['low'].rolling(window=self.lookback).min()
-        
-        # Determine trend
-        df['uptrend'] = df['ema_fast'] > df['ema_slow']
-        df['downtrend'] = df['ema_fast'] < df['ema_slow']
+        # Convert to float64 arrays for the indicator kernels
+        indicators = self.compute_indicators(
+            df['high'].to_numpy(dtype=np.float64),
+            df['low'].to_numpy(dtype=np.float64),
+            df['close'].to_numpy(dtype=np.float64)
+        )
+        for name, values in indicators.items():
+            df[name] = values
         
         return df
     
-    def generate_signal(self, df: pd.DataFrame) -> Optional[Dict]:
+    def generate_signal(self, candles: Union[CandleArrays, pd.DataFrame]) -> Optional[Dict]:
         """
         Generate trading signal based on strategy rules.
         
+        Indicators are written into this thread's reusable workspace, so a
+        scan over many symbols allocates no per-call indicator arrays.
+        
         Args:
-            df: DataFrame with OHLCV data and indicators
+            candles: CandleArrays from ``fetch_candles``, or a DataFrame with
+                OHLCV data (and optionally indicators from ``calculate_indicators``)
         
         Returns:
             Dict with signal details or None if no signal
@@ -74,13 +213,21 @@ class SwingTrendStrategy:
                 'tp': take profit price
             }
         """
-        # Calculate indicators if not already present
-        if 'ema_fast' not in df.columns:
-            df = self.calculate_indicators(df)
+        if isinstance(candles, pd.DataFrame) and 'ema_fast' in candles.columns:
+            # Indicators already calculated
+            columns = {name: candles[name].to_numpy() for name in ('close', *INDICATOR_COLUMNS)}
+        else:
+            candles = as_candles(candles)
+            columns = self.compute_indicators(
+                candles.high, candles.low, candles.close, out=workspace(len(candles))
+            )
+            columns['close'] = candles.close
+        if len(columns['close']) < 2:
+            return None
         
         # Get latest values
-        latest = df.iloc[-1]
-        previous = df.iloc[-2]
+        latest = {name: values[-1] for name, values in columns.items()}
+        previous = {name: values[-2] for name, values in columns.items()}
         
         # Check for missing data
         if pd.isna(latest['ema_fast']) or pd.isna(latest['rsi']) or pd.isna(latest['atr']):
@@ -0,0 +1,116 @@
+"""
+Market data fetch stress test against the local Binance simulator.
+
+Starts ``backend.fake_exchange`` in-process, points ``MarketDataService``
+at it through EXCHANGE_API_URL and fires concurrent candle/ticker fetches
+across many symbols, reporting throughput, latency percentiles and how
+errors and 429s surfaced. No network access is needed.
+
+Usage (from the repository root):
+    python -m benchmarks.exchange_stress --symbols 200 --requests 2000 --concurrency 50
+    python -m benchmarks.exchange_stress --latency-ms 30 --error-rate 0.02 --weight-limit 1200
+"""
+import argparse
+import asyncio
+import os
+import socket
+import tempfile
+import time
+from collections import Counter
+
+import uvicorn
+
+from backend.config import settings
+from backend.fake_exchange import SimulatorConfig, create_app
+
+
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+async def run(args):
+    symbols = [f"X{i:04d}/USDT" for i in range(args.symbols)]
+    app = create_app(SimulatorConfig(
+        symbols=symbols,
+        latency_ms=args.latency_ms,
+        jitter_ms=args.jitter_ms,
+        error_rate=args.error_rate,
+        throttle_rate=args.throttle_rate,
+        weight_limit=args.weight_limit,
+    ))
+    port = free_port()
+    server = uvicorn.Server(uvicorn.Config(app, host="127.0.0.1", port=port, log_level="warning"))
+    serving = asyncio.create_task(server.serve())
+    while not server.started:
+        await asyncio.sleep(0.01)
+
+    settings.EXCHANGE_API_URL = f"http://127.0.0.1:{port}"
+    settings.EXCHANGE_TESTNET = False
+    settings.MARKETS_CACHE_PATH = os.path.join(tempfile.mkdtemp(), "markets.json")
+    from backend.services.market_data import MarketDataService
+    market_data = MarketDataService()
+    market_data.exchange.enableRateLimit = not args.no_client_throttle
+
+    # Cold start: markets from the exchange, then (as after a restart) from the cache file
+    for source in ("exchange", "cache"):
+        market_data.exchange.markets = None
+        started = time.perf_counter()
+        loaded = await market_data.load_markets()
+        await market_data.fetch_candles(symbols[0], args.timeframe, limit=100)
+        print(f"markets from {source} + first fetch: {(time.perf_counter() - started) * 1000:.1f} ms "
+              f"({loaded} markets)")
+
+    latencies, outcomes = [], Counter()
+    semaphore = asyncio.Semaphore(args.concurrency)
+
+    async def one(i: int):
+        symbol = symbols[i % len(symbols)]
+        async with semaphore:
+            t = time.perf_counter()
+            try:
+                if i % 10 == 9:
+                    await market_data.get_ticker(symbol)
+                else:
+                    await market_data.fetch_candles(symbol, args.timeframe, limit=100)
+                outcomes["ok"] += 1
+            except Exception as e:
+                # MarketDataService re-raises; the ccxt error is the context
+                outcomes[type(e.__context__ or e).__name__] += 1
+            latencies.append(time.perf_counter() - t)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(one(i) for i in range(args.requests)))
+    elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    pct = lambda q: latencies[min(int(len(latencies) * q), len(latencies) - 1)] * 1000
+    print(f"{args.requests} requests in {elapsed:.2f}s = {args.requests / elapsed:.0f} req/s "
+          f"(client throttle {'off' if args.no_client_throttle else 'on'})")
+    print(f"latency p50 {pct(0.5):.1f} ms, p95 {pct(0.95):.1f} ms, p99 {pct(0.99):.1f} ms")
+    print(f"outcomes: {dict(outcomes)}")
+    print(f"server: {dict(app.state.exchange.counts)}")
+
+    await market_data.close()
+    server.should_exit = True
+    await serving
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--symbols", type=int, default=200)
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--timeframe", default="1h")
+    parser.add_argument("--latency-ms", type=float, default=0.0)
+    parser.add_argument("--jitter-ms", type=float, default=0.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--throttle-rate", type=float, default=0.0)
+    parser.add_argument("--weight-limit", type=int, default=0, help="Server weight budget per minute (0 = unlimited)")
+    parser.add_argument("--no-client-throttle", action="store_true", help="Disable ccxt's enableRateLimit")
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+"""
+Indicator backend parity and speed check.
+
+Compares every available backend (numpy, numba) against TA-Lib on random
+OHLC series, then times a parameter sweep like an optimizer's inner loop
+(many EMA/RSI/ATR/lookback combinations over the same candles, writing
+into one reused workspace).
+
+The fused kernel is also verified uncompiled when Numba is missing.
+
+Usage (from the repository root):
+    python -m benchmarks.indicator_parity --bars 5000 --sweep 200
+"""
+import argparse
+import itertools
+import time
+
+import numpy as np
+
+from backend.strategies import indicators
+from backend.strategies.indicators import compute_indicators, workspace
+
+NAMES = ('ema_fast', 'ema_slow', 'rsi', 'atr', 'highest_high', 'lowest_low', 'uptrend', 'downtrend')
+
+
+def random_ohlc(bars: int, seed: int):
+    rng = np.random.default_rng(seed)
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.01, bars)))
+    high = close * (1 + np.abs(rng.normal(0, 0.004, bars)))
+    low = close * (1 - np.abs(rng.normal(0, 0.004, bars)))
+    return high, low, close
+
+
+def fused_uncompiled(high, low, close, *params):
+    out = np.empty((6, close.shape[0]))
+    indicators._fused_kernel(high, low, close, *params, out)
+    fast, slow = out[indicators.EMA_FAST], out[indicators.EMA_SLOW]
+    return {
+        'ema_fast': fast, 'ema_slow': slow, 'rsi': out[indicators.RSI], 'atr': out[indicators.ATR],
+        'highest_high': out[indicators.HIGHEST_HIGH], 'lowest_low': out[indicators.LOWEST_LOW],
+        'uptrend': fast > slow, 'downtrend': fast < slow,
+    }
+
+
+def max_error(expected, actual) -> float:
+    if np.isnan(expected).tolist() != np.isnan(actual).tolist():
+        return float('inf')
+    mask = ~np.isnan(expected)
+    if not mask.any():
+        return 0.0
+    return float(np.max(np.abs(expected[mask] - actual[mask]) / np.maximum(1.0, np.abs(expected[mask]))))
+
+
+def check_parity(bars: int, seeds: int) -> bool:
+    candidates = [b for b in indicators.available_backends() if b != 'talib']
+    ok = True
+    for seed in range(seeds):
+        high, low, close = random_ohlc(bars, seed)
+        for params in [(9, 21, 14, 14, 40), (5, 50, 7, 20, 10), (2, 3, 2, 2, 1), (12, 26, 14, 14, bars + 5)]:
+            reference = compute_indicators(high, low, close, *params, backend='talib')
+            runs = {b: compute_indicators(high, low, close, *params, backend=b) for b in candidates}
+            for b in candidates:
+                # Reused buffers must give the same values as fresh arrays
+                reused = compute_indicators(high, low, close, *params, backend=b, out=workspace(bars))
+                runs[f"{b} (workspace)"] = {name: values.copy() for name, values in reused.items()}
+            if seed == 0 and 'numba' not in candidates:
+                runs['fused (uncompiled)'] = fused_uncompiled(high, low, close, *params)
+            for backend, result in runs.items():
+                for name in NAMES:
+                    if name in ('uptrend', 'downtrend'):
+                        # Ties within float noise may flip a boolean; count exact mismatches
+                        error = float(np.mean(reference[name] != result[name]))
+                        passed = error < 1e-3
+                    else:
+                        error = max_error(reference[name], result[name])
+                        passed = error < 1e-9
+                    if not passed:
+                        ok = False
+                        print(f"MISMATCH seed={seed} params={params} {backend}.{name}: {error:.3g}")
+    print(f"parity vs talib ({', '.join(candidates)}): {'ok' if ok else 'FAILED'}")
+    return ok
+
+
+def time_sweep(bars: int, sweep: int):
+    high, low, close = random_ohlc(bars, 42)
+    grid = list(itertools.product(range(5, 15), range(20, 60, 5), range(7, 22, 7), range(10, 60, 10)))[:sweep]
+    for backend in indicators.available_backends():
+        compute_indicators(high, low, close, 9, 21, 14, 14, 40, backend=backend)  # warm up / JIT
+        started = time.perf_counter()
+        out = workspace(bars)
+        for fast, slow, length, lookback in grid:
+            compute_indicators(high, low, close, fast, slow, length, length, lookback, backend=backend, out=out)
+        elapsed = time.perf_counter() - started
+        print(f"{backend:>6}: {len(grid)} parameter sets x {bars} bars in {elapsed * 1000:.1f}ms "
+              f"({elapsed / len(grid) * 1e6:.0f} us/set)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--bars", type=int, default=5000)
+    parser.add_argument("--seeds", type=int, default=5)
+    parser.add_argument("--sweep", type=int, default=200)
+    args = parser.parse_args()
+
+    if indicators.talib is None:
+        print("TA-Lib is not installed; parity needs it as the reference")
+    else:
+        check_parity(args.bars, args.seeds)
+    time_sweep(args.bars, args.sweep)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+"""
+Signal scan memory benchmark.
+
+Scans N symbols the way a bulk /execute does (all candles fetched first,
+then one signal per symbol) and compares the DataFrame path (fetch_ohlcv
+frames with datetime timestamps, calculate_indicators copies) against the
+array path (CandleArrays from fetch_candles, indicators in the reusable
+workspace). Candles are synthetic ccxt rows, so no exchange is needed.
+
+Usage (from the repository root):
+    python -m benchmarks.scan_memory --symbols 1000 --bars 100
+"""
+import argparse
+import time
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+
+from backend.services.candle_store import CandleArrays
+from backend.strategies.swing_trend import SwingTrendStrategy
+
+
+def ccxt_rows(bars: int, seed: int):
+    rng = np.random.default_rng(seed)
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.01, bars)))
+    start = 1_700_000_000_000
+    return [
+        [start + i * 3_600_000, c, c * 1.003, c * 0.997, c, 10.0]
+        for i, c in enumerate(close.tolist())
+    ]
+
+
+def frame_path(strategy, payloads):
+    frames = []
+    for rows in payloads:
+        df = pd.DataFrame(rows, columns=['timestamp', 'open', 'high', 'low', 'close', 'volume'])
+        df['timestamp'] = pd.to_datetime(df['timestamp'], unit='ms')
+        frames.append(df)
+    return [strategy.generate_signal(strategy.calculate_indicators(df)) for df in frames]
+
+
+def array_path(strategy, payloads):
+    candles = [CandleArrays.from_rows(rows) for rows in payloads]
+    return [strategy.generate_signal(c) for c in candles]
+
+
+def measure(name, fn, strategy, payloads):
+    fn(strategy, payloads[:10])  # warm caches and workspace
+    started = time.perf_counter()
+    signals = fn(strategy, payloads)
+    elapsed = time.perf_counter() - started
+    # Separate traced run: tracemalloc slows allocation-heavy code a lot
+    tracemalloc.start()
+    fn(strategy, payloads)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    found = sum(s is not None for s in signals)
+    print(f"{name:>10}: peak {peak / 1e6:7.2f} MB, {elapsed * 1000:8.1f} ms, {found} signal(s)")
+    return signals
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--symbols", type=int, default=1000)
+    parser.add_argument("--bars", type=int, default=100)
+    args = parser.parse_args()
+
+    strategy = SwingTrendStrategy()
+    payloads = [ccxt_rows(args.bars, seed) for seed in range(args.symbols)]
+    old = measure("dataframe", frame_path, strategy, payloads)
+    new = measure("arrays", array_path, strategy, payloads)
+    assert old == new, "paths disagree"
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,13 @@
+-- Idempotency records for bulk order execution (POST /api/v1/execute)
+-- A retried request with the same key replays the stored response instead of opening trades again
+
+CREATE TABLE IF NOT EXISTS execution_requests (
+    key VARCHAR(100) PRIMARY KEY,
+    response JSONB NOT NULL,
+    created_at TIMESTAMP NOT NULL DEFAULT NOW()
+);
+
+-- For periodic cleanup of old keys
+CREATE INDEX IF NOT EXISTS idx_execution_requests_created_at ON execution_requests(created_at);
+
+GRANT ALL PRIVILEGES ON TABLE execution_requests TO postgres;
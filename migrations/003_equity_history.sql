@@ -0,0 +1,80 @@
+-- Equity curve of the paper trading engine
+-- Raw samples are batch-inserted by the API (EquityRecorder); charts read the
+-- continuous aggregates so long ranges scan pre-aggregated rows, not samples
+
+CREATE TABLE IF NOT EXISTS equity_history (
+    time TIMESTAMP NOT NULL,
+    equity DOUBLE PRECISION NOT NULL,      -- marked to market (available + position cost + unrealized P&L)
+    available DOUBLE PRECISION NOT NULL,
+    exposure DOUBLE PRECISION NOT NULL,    -- gross notional of open positions at mark
+    open_positions INTEGER NOT NULL,
+    PRIMARY KEY (time)
+);
+
+SELECT create_hypertable('equity_history', 'time', chunk_time_interval => INTERVAL '1 day', if_not_exists => TRUE);
+
+-- OHLC of equity per minute / hour / day
+CREATE MATERIALIZED VIEW IF NOT EXISTS equity_1m
+WITH (timescaledb.continuous) AS
+SELECT
+    time_bucket(INTERVAL '1 minute', time) AS bucket,
+    first(equity, time) AS open,
+    max(equity) AS high,
+    min(equity) AS low,
+    last(equity, time) AS close,
+    last(available, time) AS available,
+    max(exposure) AS exposure,
+    max(open_positions) AS open_positions
+FROM equity_history
+GROUP BY bucket
+WITH NO DATA;
+
+CREATE MATERIALIZED VIEW IF NOT EXISTS equity_1h
+WITH (timescaledb.continuous) AS
+SELECT
+    time_bucket(INTERVAL '1 hour', time) AS bucket,
+    first(equity, time) AS open,
+    max(equity) AS high,
+    min(equity) AS low,
+    last(equity, time) AS close,
+    last(available, time) AS available,
+    max(exposure) AS exposure,
+    max(open_positions) AS open_positions
+FROM equity_history
+GROUP BY bucket
+WITH NO DATA;
+
+CREATE MATERIALIZED VIEW IF NOT EXISTS equity_1d
+WITH (timescaledb.continuous) AS
+SELECT
+    time_bucket(INTERVAL '1 day', time) AS bucket,
+    first(equity, time) AS open,
+    max(equity) AS high,
+    min(equity) AS low,
+    last(equity, time) AS close,
+    last(available, time) AS available,
+    max(exposure) AS exposure,
+    max(open_positions) AS open_positions
+FROM equity_history
+GROUP BY bucket
+WITH NO DATA;
+
+-- Keep aggregates current; the newest bucket is served from raw rows (real-time aggregation)
+SELECT add_continuous_aggregate_policy('equity_1m',
+    start_offset => INTERVAL '1 hour', end_offset => INTERVAL '1 minute',
+    schedule_interval => INTERVAL '1 minute', if_not_exists => TRUE);
+SELECT add_continuous_aggregate_policy('equity_1h',
+    start_offset => INTERVAL '3 hours', end_offset => INTERVAL '1 hour',
+    schedule_interval => INTERVAL '30 minutes', if_not_exists => TRUE);
+SELECT add_continuous_aggregate_policy('equity_1d',
+    start_offset => INTERVAL '3 days', end_offset => INTERVAL '1 day',
+    schedule_interval => INTERVAL '1 hour', if_not_exists => TRUE);
+
+ALTER MATERIALIZED VIEW equity_1m SET (timescaledb.materialized_only = false);
+ALTER MATERIALIZED VIEW equity_1h SET (timescaledb.materialized_only = false);
+ALTER MATERIALIZED VIEW equity_1d SET (timescaledb.materialized_only = false);
+
+-- Raw samples are only needed until they are rolled up
+SELECT add_retention_policy('equity_history', INTERVAL '30 days', if_not_exists => TRUE);
+
+GRANT ALL PRIVILEGES ON TABLE equity_history TO postgres;
@@ -0,0 +1,30 @@
+-- Indexes matched to the actual trade queries
+--   /status, analytics:   status = 'closed' AND closed_at >= ...   (reads pnl)
+--   close lookup:         symbol = ? AND status = 'open'           (reads entry_price)
+--   /trades/history:      [status = ?] ORDER BY opened_at DESC LIMIT n
+-- Partial indexes stay small (open trades are few) and INCLUDE columns make
+-- the aggregate and lookup index-only scans. Checked by benchmarks/explain_check.py.
+-- CONCURRENTLY keeps the table writable while building on an existing database.
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_trades_closed_at_closed
+    ON trades (closed_at) INCLUDE (pnl)
+    WHERE status = 'closed';
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_trades_symbol_open
+    ON trades (symbol) INCLUDE (entry_price)
+    WHERE status = 'open';
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_trades_status_opened_at
+    ON trades (status, opened_at DESC);
+
+-- Superseded: status alone is unselective and closed_at is only queried for closed trades
+DROP INDEX CONCURRENTLY IF EXISTS idx_trades_status;
+DROP INDEX CONCURRENTLY IF EXISTS idx_trades_closed_at;
+
+-- Index-only scans need an up-to-date visibility map on an insert-heavy table
+ALTER TABLE trades SET (
+    autovacuum_vacuum_insert_scale_factor = 0.05,
+    autovacuum_vacuum_scale_factor = 0.05
+);
+
+ANALYZE trades;
@@ -0,0 +1,15 @@
+"""
+Shared test setup.
+
+Settings are read at import time, so the database and state backend are
+pointed at throwaway local ones before any ``backend`` module loads.
+"""
+import os
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+os.environ.setdefault("DATABASE_URL", f"sqlite+aiosqlite:///{tempfile.mkdtemp()}/test.db")
+os.environ.setdefault("STATE_BACKEND", "memory")
+os.environ.setdefault("MARKETS_CACHE_PATH", "")
@@ -0,0 +1,57 @@
+"""Incremental analytics agree with a batch computation over the same history."""
+import math
+
+import numpy as np
+import pytest
+
+from backend.services.analytics import PerformanceTracker
+
+DAY = 86_400.0
+
+
+def test_trade_stats_match_batch():
+    pnls = [5.0, -2.0, -3.0, 0.0, 8.0, 1.0, 2.0, -4.0]
+    tracker = PerformanceTracker()
+    for pnl in pnls:
+        tracker.record_trade(pnl)
+    report = tracker.report()['trades']
+
+    wins = [p for p in pnls if p > 0]
+    losses = [p for p in pnls if p < 0]
+    assert report['total_trades'] == len(pnls)
+    assert report['win_rate'] == pytest.approx(len(wins) / len(pnls) * 100)
+    assert report['net_pnl'] == pytest.approx(sum(pnls))
+    assert report['profit_factor'] == pytest.approx(sum(wins) / -sum(losses))
+    assert report['expectancy'] == pytest.approx(np.mean(pnls))
+    assert report['largest_win'] == max(wins) and report['largest_loss'] == min(losses)
+    assert report['max_win_streak'] == 3 and report['max_loss_streak'] == 2
+    assert report['current_streak'] == -1
+
+
+def test_equity_stats_match_batch():
+    rng = np.random.default_rng(7)
+    # Several samples per day at irregular times, 60 days
+    times = np.sort(rng.uniform(0, 60 * DAY, 600))
+    equity = 1000 * np.exp(np.cumsum(rng.normal(0, 0.01, len(times))))
+    tracker = PerformanceTracker(period_seconds=DAY, periods_per_year=365)
+    for t, e in zip(times, equity):
+        tracker.record_equity(float(t), float(e))
+    report = tracker.report()['equity']
+
+    # Batch: last equity of each day, returns between consecutive days' closes
+    days = (times // DAY).astype(int)
+    last_of_day = equity[np.r_[np.flatnonzero(np.diff(days)), len(days) - 1]]
+    opens = np.r_[equity[0], last_of_day[:-1]]
+    returns = (last_of_day / opens - 1)[:-1]  # the final day is still open
+    assert report['return_periods'] == len(returns)
+    assert report['mean_period_return_pct'] == pytest.approx(returns.mean() * 100)
+    std = returns.std(ddof=1)
+    assert report['sharpe'] == pytest.approx(returns.mean() / std * math.sqrt(365))
+    downside = math.sqrt(np.sum(np.minimum(returns, 0) ** 2) / len(returns))
+    assert report['sortino'] == pytest.approx(returns.mean() / downside * math.sqrt(365))
+    assert report['annualized_volatility_pct'] == pytest.approx(std * math.sqrt(365) * 100)
+
+    peaks = np.maximum.accumulate(equity)
+    assert report['max_drawdown'] == pytest.approx(np.max(peaks - equity))
+    assert report['max_drawdown_pct'] == pytest.approx(np.max((peaks - equity) / peaks) * 100)
+    assert report['peak_equity'] == pytest.approx(equity.max())
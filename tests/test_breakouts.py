@@ -0,0 +1,55 @@
+"""Precomputed breakout levels agree with the full strategy on the forming bar."""
+import numpy as np
+import pytest
+
+from backend.services.breakouts import BreakoutBoard
+from backend.services.candle_store import CandleArrays
+from backend.services.replay import random_walk
+from backend.strategies.swing_trend import SwingTrendStrategy
+
+HOUR = 3_600_000
+START = 1_704_067_200_000
+
+
+def with_forming(closed: CandleArrays, price: float) -> CandleArrays:
+    """``closed`` plus a forming bar that opened at the last close and trades at ``price``."""
+    last = float(closed.close[-1])
+    row = [int(closed.timestamp[-1]) + HOUR, last, max(last, price), min(last, price), price, 1.0]
+    rows = np.column_stack([closed.timestamp, closed.open, closed.high, closed.low, closed.close, closed.volume])
+    return CandleArrays.from_rows(rows.tolist() + [row])
+
+
+@pytest.mark.parametrize("seed", range(6))
+def test_trigger_side_agrees_with_generate_signal(seed):
+    strategy = SwingTrendStrategy()
+    closed = random_walk(150, START, '1h', seed=seed)
+    trigger = strategy.breakout_trigger(closed)
+    assert trigger is not None
+
+    last = float(closed.close[-1])
+    levels = [trigger.long_above, trigger.short_below]
+    prices = np.linspace(last * 0.9, last * 1.1, 401)
+    checked = 0
+    for price in prices:
+        # Float noise decides prices sitting exactly on a level; skip those
+        if any(abs(price - level) < 1e-6 * last for level in levels if np.isfinite(level)):
+            continue
+        signal = strategy.generate_signal(with_forming(closed, float(price)))
+        assert trigger.side(float(price)) == (signal['side'] if signal else None), price
+        checked += 1
+    assert checked > 390
+
+
+def test_board_fires_each_side_once_per_bar():
+    strategy = SwingTrendStrategy()
+    trigger = strategy.breakout_trigger(random_walk(150, START, '1h', seed=1))
+    board = BreakoutBoard('1h')
+    board.publish('BTC/USDT', trigger)
+    now = (trigger.bar_time + HOUR + 60_000) / 1000
+    above = trigger.long_above * 1.01
+
+    assert board.check('BTC/USDT', above, now) == 'long'
+    assert board.check('BTC/USDT', above, now) is None
+    # The trigger was built for one bar; after it closes nothing fires
+    board.publish('ETH/USDT', trigger)
+    assert board.check('ETH/USDT', above, (trigger.bar_time + 2 * HOUR) / 1000) is None
@@ -0,0 +1,47 @@
+"""Candle store round-trips across month partitions."""
+import numpy as np
+
+from backend.services.candle_store import CandleArrays, CandleStore
+
+HOUR = 3_600_000
+JAN_31_22H = 1_706_738_400_000  # 2024-01-31 22:00 UTC
+
+
+def hourly(start_ms: int, count: int, base: float = 100.0) -> CandleArrays:
+    return CandleArrays.from_rows([
+        [start_ms + i * HOUR, base + i, base + i + 1, base + i - 1, base + i + 0.5, 10.0 + i]
+        for i in range(count)
+    ])
+
+
+def assert_same(actual: CandleArrays, expected: CandleArrays):
+    for field in ('timestamp', 'open', 'high', 'low', 'close', 'volume'):
+        np.testing.assert_array_equal(getattr(actual, field), getattr(expected, field))
+
+
+def test_round_trip_across_months_with_overwrites(tmp_path):
+    store = CandleStore(str(tmp_path))
+    candles = hourly(JAN_31_22H, 5)  # two January bars, three in February
+    assert store.write('BTC/USDT', '1h', candles) == 5
+    assert store.partitions('BTCUSDT', '1h') == ['2024-01', '2024-02']
+    assert_same(store.load('BTC/USDT', '1h'), candles)
+
+    # [start, end) spans the month boundary
+    assert_same(store.load('BTC/USDT', '1h', JAN_31_22H + HOUR, JAN_31_22H + 3 * HOUR), candles.slice(1, 3))
+
+    # Rewriting a bar replaces it; readers see the new file, not a stale map
+    revised = hourly(JAN_31_22H + 3 * HOUR, 1, base=500.0)
+    store.write('BTC/USDT', '1h', revised)
+    loaded = store.load('BTC/USDT', '1h')
+    assert len(loaded) == 5 and loaded.close[3] == revised.close[0]
+    assert_same(loaded.slice(0, 3), candles.slice(0, 3))
+
+    # The consolidated copy serves the same rows until the next write
+    assert store.consolidate('BTC/USDT', '1h') == 5
+    assert_same(store.load('BTC/USDT', '1h'), loaded)
+    store.write('BTC/USDT', '1h', hourly(JAN_31_22H + 5 * HOUR, 1))
+    assert len(store.load('BTC/USDT', '1h')) == 6
+
+
+def test_missing_symbol_loads_empty(tmp_path):
+    assert len(CandleStore(str(tmp_path)).load('ETH/USDT', '1h')) == 0
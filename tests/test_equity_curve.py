@@ -0,0 +1,39 @@
+"""GET /equity range handling."""
+import asyncio
+from datetime import datetime
+
+import httpx
+
+from backend.api import routes
+from backend.main import app
+
+
+def test_offset_times_are_compared_as_naive_utc(monkeypatch):
+    queried = []
+
+    async def query_equity_curve(conn, start, end, resolution):
+        queried.append((start, end, resolution))
+        return []
+
+    monkeypatch.setattr(routes, "query_equity_curve", query_equity_curve)
+
+    async def scenario():
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as client:
+            ok = await client.get("/api/v1/equity", params={"start": "2024-01-01T02:00:00+02:00"})
+            ranged = await client.get("/api/v1/equity", params={
+                "start": "2024-01-01T00:00:00Z", "end": "2024-01-01T06:00:00+05:00"
+            })
+            backwards = await client.get("/api/v1/equity", params={
+                "start": "2024-01-01T03:00:00+02:00", "end": "2024-01-01T00:00:00"
+            })
+        return ok, ranged, backwards
+
+    ok, ranged, backwards = asyncio.run(scenario())
+
+    assert ok.status_code == 200
+    start, end, _ = queried[0]
+    assert start == datetime(2024, 1, 1) and start.tzinfo is None and end.tzinfo is None
+    assert ranged.status_code == 200
+    assert queried[1][:2] == (datetime(2024, 1, 1), datetime(2024, 1, 1, 1))
+    # 01:00 UTC is after midnight UTC
+    assert backwards.status_code == 400
@@ -0,0 +1,55 @@
+"""Stream state diffs and fill delivery."""
+import asyncio
+
+from backend.config import settings
+from backend.services.event_broker import EventBroker, diff_state, snapshot_state
+from backend.services.execution import ExecutionModel
+from backend.services.paper_trading import PaperTradingEngine
+
+
+def test_partial_exit_diff_carries_the_remaining_size(monkeypatch):
+    monkeypatch.setattr(settings, 'MAX_OPEN_POSITIONS', 5)
+    engine = PaperTradingEngine(1000, execution_model=ExecutionModel())
+    position = engine.open_position('BTC/USDT', 'long', 100.0, 2.0, stop_loss=90.0, take_profit=120.0)
+    other = engine.open_position('BTC/USDT', 'long', 100.0, 1.0, stop_loss=80.0, take_profit=130.0)
+    before = snapshot_state(engine.snapshot())
+
+    position.update(qty=1.5, cost=150.0)
+    engine.update_positions('BTC/USDT', 101.0)
+    diff = diff_state(before, snapshot_state(engine.snapshot()))['positions']
+    assert diff[position['id']]['qty'] == 1.5 and diff[position['id']]['cost'] == 150.0
+    assert 'qty' not in diff[other['id']]
+
+    engine.close_position(position['id'], 101.0, 'manual')
+    after = diff_state(before, snapshot_state(engine.snapshot()))['positions']
+    assert after[position['id']] is None and other['id'] in after
+
+
+def test_stream_sends_fills_at_once_and_coalesces_marks(monkeypatch):
+    monkeypatch.setattr(settings, 'MAX_OPEN_POSITIONS', 5)
+
+    async def scenario():
+        engine = PaperTradingEngine(1000, execution_model=ExecutionModel())
+        broker = EventBroker(min_interval=0.2, max_pending_fills=10)
+        broker.attach(engine)
+        subscription = broker.subscribe()
+        events = subscription.events(heartbeat=5)
+
+        event, _, state = await events.__anext__()
+        assert event == 'snapshot' and state['positions'] == {}
+
+        position = engine.open_position('BTC/USDT', 'long', 100.0, 1.0, stop_loss=90.0, take_profit=120.0)
+        event, _, fill = await asyncio.wait_for(events.__anext__(), 0.1)
+        assert event == 'fill' and fill['event'] == 'open' and fill['id'] == position['id']
+
+        # Marks within the interval are folded into one update with the latest values
+        for price in (101.0, 102.0, 103.0):
+            engine.update_positions('BTC/USDT', price)
+        event, _, diff = await asyncio.wait_for(events.__anext__(), 1)
+        assert event == 'update'
+        assert diff['positions'][position['id']]['current_price'] == 103.0
+        assert diff['available'] == engine.available  # the open, sent with the marks
+        broker.unsubscribe(subscription)
+        assert not broker.subscribers
+
+    asyncio.run(scenario())
@@ -0,0 +1,120 @@
+"""POST /execute: joint sizing, entry prices and idempotency."""
+import asyncio
+import itertools
+
+import httpx
+import pytest
+
+from backend.api import routes
+from backend.database import AsyncSessionLocal, engine, init_db
+from backend.main import app
+from backend.models.execution_request import ExecutionRequest
+from backend.services.execution import FeeSlippageModel
+from backend.services.paper_trading import PaperTradingEngine
+
+
+class RecordingQueue:
+    """Write-behind stand-in: hands out ids and keeps queued rows in memory."""
+
+    def __init__(self):
+        self.ids = itertools.count(1)
+        self.trades = {}
+
+    async def reserve_trade_id(self) -> int:
+        return next(self.ids)
+
+    def add_trade(self, trade_id: int, **values):
+        self.trades[trade_id] = values
+
+
+@pytest.fixture
+def bulk_engine(monkeypatch):
+    # 0.5% slippage dwarfs the commission, so commission-only scaling overshoots
+    engine = PaperTradingEngine(
+        initial_capital=1000.0,
+        execution_model=FeeSlippageModel(commission_pct=0.04, slippage_ticks=0, slippage_bps=50.0)
+    )
+    monkeypatch.setattr(routes, "paper_engine", engine)
+    monkeypatch.setattr(routes, "write_queue", RecordingQueue())
+    monkeypatch.setattr(routes.settings, "MAX_OPEN_POSITIONS", 3)
+
+    async def tight_stop_signal(symbol):
+        # Risk-based qty for a 0.1% stop is far more than the account can buy
+        return {"side": "long", "entry": 100.0, "stop": 99.9, "tp": 100.25, "atr": 0.1}, True
+
+    monkeypatch.setattr(routes, "evaluate_signal", tight_stop_signal)
+    monkeypatch.setattr(routes.market_data, "get_ticker", ticker_at(100.0))
+    return engine
+
+
+def ticker_at(price: float):
+    async def get_ticker(symbol):
+        return {"symbol": symbol, "last": price}
+    return get_ticker
+
+
+def test_bulk_sizing_fits_capital_with_slippage(bulk_engine):
+    async def scenario():
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as client:
+            return await client.post("/api/v1/execute", json={"symbols": ["A/USDT", "B/USDT", "C/USDT"]})
+
+    response = asyncio.run(scenario())
+
+    assert response.status_code == 200
+    body = response.json()
+    assert [s for s in body["skipped"] if "Insufficient capital" in s["reason"]] == []
+    assert len(body["executed"]) == 3
+    assert bulk_engine.available >= 0
+    # Scaled jointly, so the three positions share the capital almost completely
+    assert bulk_engine.available < 1.0
+
+
+def test_idempotency_record_waits_for_engine_commit(bulk_engine, monkeypatch):
+    async def scenario():
+        await init_db()
+        headers = {"Idempotency-Key": "retry-after-failed-save"}
+        body = {"symbols": ["A/USDT"]}
+        save = bulk_engine.state_store.save
+
+        async def failing_save(*args, **kwargs):
+            raise ConnectionError("state store unavailable")
+
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as client:
+            monkeypatch.setattr(bulk_engine.state_store, "save", failing_save)
+            failed = await client.post("/api/v1/execute", json=body, headers=headers)
+            assert failed.status_code == 500
+            assert bulk_engine.positions == {}
+            async with AsyncSessionLocal() as db:
+                assert await db.get(ExecutionRequest, headers["Idempotency-Key"]) is None
+
+            # The retry executes instead of replaying a response for positions that never existed
+            monkeypatch.setattr(bulk_engine.state_store, "save", save)
+            retried = await client.post("/api/v1/execute", json=body, headers=headers)
+            assert retried.status_code == 200
+            assert [p["symbol"] for p in retried.json()["executed"]] == ["A/USDT"]
+            assert [p["symbol"] for p in bulk_engine.positions.values()] == ["A/USDT"]
+
+            replayed = await client.post("/api/v1/execute", json=body, headers=headers)
+            assert replayed.json() == retried.json()
+        await engine.dispose()
+
+    asyncio.run(scenario())
+
+
+def test_fills_at_current_price_and_refuses_runaway_signals(bulk_engine, monkeypatch):
+    monkeypatch.setattr(routes.settings, "MAX_ENTRY_DRIFT_PCT", 0.1)
+
+    async def post(symbol, price):
+        monkeypatch.setattr(routes.market_data, "get_ticker", ticker_at(price))
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as client:
+            return (await client.post("/api/v1/execute", json={"symbols": [symbol]})).json()
+
+    # The signal's entry is 100; the market has since moved within tolerance
+    body = asyncio.run(post("A/USDT", 100.05))
+    assert body["executed"][0]["entry_price"] == pytest.approx(100.05 * 1.005)
+    assert body["executed"][0]["stop_loss"] == 99.9
+
+    body = asyncio.run(post("B/USDT", 100.2))
+    assert body["executed"] == [] and "past the signal entry" in body["skipped"][0]["reason"]
+    body = asyncio.run(post("C/USDT", 99.85))
+    assert body["executed"] == [] and "beyond the signal's stop" in body["skipped"][0]["reason"]
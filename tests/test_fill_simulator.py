@@ -0,0 +1,123 @@
+"""Stop-loss vs take-profit order inside one bar, and the scheduler's bar-close pass."""
+import asyncio
+
+import pytest
+
+from backend.config import settings
+from backend.services.candle_store import CandleArrays, CandleStore
+from backend.services.clock import clock
+from backend.services.execution import ExecutionModel
+from backend.services.fill_simulator import IntrabarFillSimulator
+from backend.services.paper_trading import PaperTradingEngine
+from backend.services.scheduler import PositionScheduler
+
+HOUR = 3_600_000
+MINUTE = 60_000
+BAR = 1_704_067_200_000  # 2024-01-01 00:00 UTC
+
+
+def minutes(*bars):
+    """1m candles from ``(high, low)`` pairs starting at BAR."""
+    return CandleArrays.from_rows([
+        [BAR + i * MINUTE, (high + low) / 2, high, low, (high + low) / 2, 1.0]
+        for i, (high, low) in enumerate(bars)
+    ])
+
+
+@pytest.fixture
+def store(tmp_path):
+    return CandleStore(str(tmp_path))
+
+
+@pytest.fixture
+def at():
+    """Run the clock from a given epoch ms."""
+    yield lambda ms: clock.simulate(ms / 1000, speed=1.0)
+    clock.reset()
+
+
+def resolve(simulator, symbol, side='long', open_price=100.0, stop_loss=95.0, take_profit=110.0):
+    return simulator.resolve(symbol, '1h', BAR, open_price, 112.0, 93.0, side, stop_loss, take_profit)
+
+
+def test_sub_bars_decide_which_level_was_hit_first(store):
+    store.write('TP/USDT', '1m', minutes((101, 99), (111, 100), (100, 93)))
+    store.write('SL/USDT', '1m', minutes((101, 99), (100, 94), (112, 100)))
+    simulator = IntrabarFillSimulator(store, sub_timeframe='1m')
+
+    assert resolve(simulator, 'TP/USDT') == ('take_profit', 110.0)
+    assert resolve(simulator, 'SL/USDT') == ('stop_loss', 95.0)
+    # Same sub-bars seen from a short: the low (its target) comes last in SL/USDT
+    assert resolve(simulator, 'SL/USDT', side='short', stop_loss=111.0, take_profit=94.0) == ('take_profit', 94.0)
+    # No sub-bars: the stop is assumed first
+    assert resolve(simulator, 'NONE/USDT') == ('stop_loss', 95.0)
+    # A gap through the stop fills at the open without drilling down
+    assert resolve(simulator, 'TP/USDT', open_price=94.0) == ('stop_loss', 94.0)
+
+
+def test_bar_closes_only_positions_open_for_the_whole_bar(store, at):
+    engine = PaperTradingEngine(
+        1000, fill_simulator=IntrabarFillSimulator(store, '1m'), execution_model=ExecutionModel()
+    )
+    store.write('BTC/USDT', '1m', minutes((101, 99), (111, 100), (100, 93)))
+
+    at(BAR - MINUTE)
+    before = engine.open_position('BTC/USDT', 'long', 100.0, 1.0, stop_loss=95.0, take_profit=110.0)
+    closed = engine.update_positions_with_bar('BTC/USDT', '1h', BAR, 100.0, 112.0, 93.0, 104.0)
+    assert [(p['id'], p['exit_reason'], p['exit_price']) for p in closed] == [
+        (before['id'], 'take_profit', 110.0)
+    ]
+
+    # Opened mid-bar: the range before it opened must not fill it
+    at(BAR + 30 * MINUTE)
+    during = engine.open_position('BTC/USDT', 'long', 100.0, 1.0, stop_loss=95.0, take_profit=110.0)
+    assert engine.update_positions_with_bar('BTC/USDT', '1h', BAR, 100.0, 112.0, 93.0, 104.0) == []
+    assert engine.positions[during['id']]['current_price'] == 104.0
+
+
+class BarFeed:
+    """Market data serving one hourly bar plus the forming one."""
+
+    def __init__(self, bar):
+        self.bar = bar
+        self.fetches = 0
+
+    async def fetch_candles(self, symbol, timeframe, limit):
+        self.fetches += 1
+        return CandleArrays.from_rows([self.bar, [self.bar[0] + HOUR, 104.0, 104.0, 104.0, 104.0, 1.0]])
+
+    async def get_ticker(self, symbol):
+        return {'last': 104.0}
+
+
+class Writer:
+    def __init__(self):
+        self.closed = []
+
+    async def record_closed(self, symbol, closed):
+        self.closed += closed
+
+
+def test_scheduler_replays_each_closed_bar_once(store, at, monkeypatch):
+    monkeypatch.setattr(settings, 'MAX_OPEN_POSITIONS', 5)
+
+    async def scenario():
+        engine = PaperTradingEngine(
+            1000, fill_simulator=IntrabarFillSimulator(store, '1m'), execution_model=ExecutionModel()
+        )
+        at(BAR - MINUTE)
+        engine.open_position('BTC/USDT', 'long', 100.0, 1.0, stop_loss=95.0, take_profit=120.0)
+        engine.open_position('BTC/USDT', 'short', 100.0, 1.0, stop_loss=115.0, take_profit=80.0)
+
+        # The wick to 93 happened between polls; the ticker is back at 104
+        feed = BarFeed([BAR, 100.0, 105.0, 93.0, 104.0, 1.0])
+        writer = Writer()
+        scheduler = PositionScheduler(engine, feed, writer, timeframe='1h')
+        at(BAR + HOUR + MINUTE)
+        assert await scheduler.run_cycle() == 1
+        assert [(p['side'], p['exit_reason']) for p in writer.closed] == [('long', 'stop_loss')]
+
+        assert await scheduler.run_cycle() == 0
+        assert feed.fetches == 1 and len(engine.positions) == 1
+
+    asyncio.run(scenario())
@@ -0,0 +1,69 @@
+"""Indicator backends agree with TA-Lib (skipped when TA-Lib is not installed)."""
+import numpy as np
+import pytest
+
+from backend.strategies import indicators
+from backend.strategies.indicators import compute_indicators, workspace
+
+talib = pytest.importorskip("talib")
+
+PARAMS = [(9, 21, 14, 14, 40), (5, 50, 7, 20, 10), (2, 3, 2, 2, 1), (12, 26, 14, 14, 305)]
+
+
+def random_ohlc(bars: int = 300, seed: int = 0):
+    rng = np.random.default_rng(seed)
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.01, bars)))
+    high = close * (1 + np.abs(rng.normal(0, 0.004, bars)))
+    low = close * (1 - np.abs(rng.normal(0, 0.004, bars)))
+    return high, low, close
+
+
+def reference(high, low, close, fast, slow, rsi_length, atr_length, lookback):
+    """The indicators computed with TA-Lib functions only."""
+    return {
+        'ema_fast': talib.EMA(close, timeperiod=fast),
+        'ema_slow': talib.EMA(close, timeperiod=slow),
+        'rsi': talib.RSI(close, timeperiod=rsi_length),
+        'atr': talib.ATR(high, low, close, timeperiod=atr_length),
+        'highest_high': talib.MAX(high, timeperiod=lookback) if lookback > 1 else high,
+        'lowest_low': talib.MIN(low, timeperiod=lookback) if lookback > 1 else low,
+    }
+
+
+def fused_uncompiled(high, low, close, *params):
+    """The fused kernel run as plain Python, whatever Numba's availability."""
+    out = np.empty((6, close.shape[0]))
+    indicators._fused_kernel(high, low, close, *params, out)
+    return {
+        'ema_fast': out[indicators.EMA_FAST], 'ema_slow': out[indicators.EMA_SLOW],
+        'rsi': out[indicators.RSI], 'atr': out[indicators.ATR],
+        'highest_high': out[indicators.HIGHEST_HIGH], 'lowest_low': out[indicators.LOWEST_LOW],
+    }
+
+
+def assert_matches(expected, actual):
+    for name, values in expected.items():
+        np.testing.assert_array_equal(np.isnan(actual[name]), np.isnan(values), err_msg=name)
+        mask = ~np.isnan(values)
+        np.testing.assert_allclose(actual[name][mask], values[mask], rtol=1e-9, atol=1e-9, err_msg=name)
+
+
+@pytest.mark.parametrize("params", PARAMS)
+@pytest.mark.parametrize("backend", ['talib', 'numpy', 'numba'])
+def test_backend_matches_talib(backend, params):
+    if backend not in indicators.available_backends():
+        pytest.skip(f"{backend} is not installed")
+    high, low, close = random_ohlc()
+    expected = reference(high, low, close, *params)
+
+    result = compute_indicators(high, low, close, *params, backend=backend)
+    assert_matches(expected, result)
+    np.testing.assert_array_equal(result['uptrend'], result['ema_fast'] > result['ema_slow'])
+    # Reused per-thread buffers give the same values as fresh arrays
+    assert_matches(expected, compute_indicators(high, low, close, *params, backend=backend, out=workspace(len(close))))
+
+
+@pytest.mark.parametrize("params", PARAMS)
+def test_uncompiled_fused_kernel_matches_talib(params):
+    high, low, close = random_ohlc(seed=1)
+    assert_matches(reference(high, low, close, *params), fused_uncompiled(high, low, close, *params))
@@ -0,0 +1,24 @@
+"""Application startup/shutdown leaves no background task behind."""
+import asyncio
+
+from backend import main
+from backend.config import settings
+from backend.database import engine
+
+
+def test_shutdown_cancels_background_tasks(monkeypatch):
+    # Connection refused: markets are unavailable, startup carries on
+    monkeypatch.setattr(settings, "EXCHANGE_API_URL", "http://127.0.0.1:9")
+    monkeypatch.setattr(settings, "SCHEDULER_ENABLED", True)
+
+    async def scenario():
+        for _ in range(2):
+            await main.startup()
+            assert main.background_tasks and main.write_task is not None
+            await main.shutdown()
+            assert main.background_tasks == [] and main.write_task is None
+            others = [task for task in asyncio.all_tasks() if task is not asyncio.current_task()]
+            assert others == []
+        await engine.dispose()
+
+    asyncio.run(scenario())
@@ -0,0 +1,70 @@
+"""Markets cached on disk restore into the pinned ccxt binance client without network."""
+import asyncio
+
+import httpx
+import pytest
+
+from backend.config import settings
+from backend.fake_exchange import SimulatorConfig, create_app
+from backend.services.market_data import MarketDataService
+
+SYMBOLS = ['BTC/USDT', 'ETH/USDT', 'ETH/BTC']
+
+
+async def simulator_exchange_info() -> dict:
+    app = create_app(SimulatorConfig(symbols=SYMBOLS))
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://simulator") as client:
+        return (await client.get("/api/v3/exchangeInfo")).json()
+
+
+def test_load_markets_from_cache(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "EXCHANGE_API_URL", "http://simulator.invalid")
+    monkeypatch.setattr(settings, "MARKETS_CACHE_PATH", str(tmp_path / "markets.json"))
+
+    async def scenario():
+        info = await simulator_exchange_info()
+        service = MarketDataService()
+        exchange = service.exchange
+
+        async def exchange_info(params=None):
+            return info
+
+        async def offline(params=None):
+            raise AssertionError("markets fetched although the cache is fresh")
+
+        try:
+            # First start: fetched through ccxt's own parser, then cached
+            exchange.publicGetExchangeInfo = exchange_info
+            assert await service.load_markets() == len(SYMBOLS)
+            assert (tmp_path / "markets.json").exists()
+            fetched = {
+                name: getattr(exchange, name)
+                for name in ('markets', 'symbols', 'ids', 'currencies', 'codes', 'baseCurrencies', 'quoteCurrencies')
+            }
+            ticks = service.tick_sizes()
+
+            # Restart: a fresh client is filled from the file alone
+            await service.close()
+            exchange = service.exchange
+            exchange.publicGetExchangeInfo = offline
+            assert await service.load_markets() == len(SYMBOLS)
+            for name, value in fetched.items():
+                assert getattr(exchange, name) == value, name
+            assert service.tick_sizes() == ticks and set(ticks) == set(SYMBOLS)
+            assert exchange.markets_by_id['ETHBTC'][0]['symbol'] == 'ETH/BTC'
+            # Ticks are the exchange's PRICE_FILTER tickSize, not ccxt's decimal-place count
+            expected = {
+                market['symbol']: float(next(f['tickSize'] for f in market['filters'] if f['filterType'] == 'PRICE_FILTER'))
+                for market in info['symbols']
+            }
+            assert ticks == {symbol: expected[exchange.market(symbol)['id']] for symbol in SYMBOLS}
+            # Without the raw filters the tick follows from precision.price in decimal places
+            for market in exchange.markets.values():
+                market['info'] = {}
+            assert service.tick_sizes() == pytest.approx(ticks)
+            # ccxt's implicit load_markets() inside fetch_* calls stays offline too
+            await exchange.load_markets()
+        finally:
+            await service.close()
+
+    asyncio.run(scenario())
@@ -0,0 +1,36 @@
+"""python -m backend.monte_carlo: CSV returns are converted at the backtest's risk."""
+import json
+import sys
+
+import pytest
+
+from backend import monte_carlo
+
+
+def run(monkeypatch, capsys, *args) -> dict:
+    monkeypatch.setattr(sys, "argv", ["monte_carlo", *args])
+    monte_carlo.main()
+    return json.loads(capsys.readouterr().out)
+
+
+@pytest.fixture
+def trade_list(tmp_path):
+    path = tmp_path / "trades.csv"
+    # Two winners of 1% of equity each on a 1000 USDT backtest
+    path.write_text(
+        "Trade #,Type,Profit USDT\n"
+        "1,Entry Long,0\n1,Exit Long,10\n"
+        "2,Entry Long,0\n2,Exit Long,10.1\n"
+    )
+    return str(path)
+
+
+def test_backtest_risk_is_separate_from_simulated_risk(monkeypatch, capsys, trade_list):
+    common = ["--csv", trade_list, "--capital", "1000", "--sims", "50", "--workers", "1", "--seed", "1"]
+    at_one = run(monkeypatch, capsys, *common, "--backtest-risk", "1", "--risk", "2")
+    at_two = run(monkeypatch, capsys, *common, "--backtest-risk", "2", "--risk", "2")
+
+    # 1% of equity per trade is 1R when the backtest risked 1%, 0.5R when it risked 2%
+    assert at_one["sample_mean_r"] == pytest.approx(1.0)
+    assert at_two["sample_mean_r"] == pytest.approx(0.5)
+    assert at_one["risk_per_trade_pct"] == pytest.approx(2.0)
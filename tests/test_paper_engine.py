@@ -0,0 +1,125 @@
+"""Paper engine transactions: rollback and snapshot publication."""
+import asyncio
+import time
+
+import pytest
+
+from backend.config import settings
+from backend.services.execution import (
+    ExecutionModel,
+    OrderBookCache,
+    OrderBookExecutionModel,
+    OrderBookSnapshot
+)
+from backend.services.paper_trading import PaperTradingEngine
+
+
+def make_engine() -> PaperTradingEngine:
+    return PaperTradingEngine(1000, execution_model=ExecutionModel())
+
+
+def test_rollback_restores_state_and_never_publishes_it():
+    async def scenario():
+        engine = make_engine()
+        published = []
+        engine.subscribe(lambda snapshot, fills: published.append((snapshot, fills)))
+        before = engine.snapshot()
+
+        with pytest.raises(RuntimeError):
+            async with engine.transaction():
+                engine.open_position('BTC/USDT', 'long', 100.0, 2.0, stop_loss=90.0, take_profit=120.0)
+                # Readers still see the last committed state mid-transaction
+                assert engine.snapshot() is before
+                assert engine.get_status()['positions'] == []
+                raise RuntimeError("database commit failed")
+
+        assert engine.positions == {} and engine.available == 1000
+        assert engine.snapshot() is before and published == []
+        # The rolled-back position left no armed exit behind
+        assert engine.update_positions('BTC/USDT', 50.0) == []
+        assert engine.triggers.orders == {}
+
+        async with engine.transaction():
+            engine.open_position('BTC/USDT', 'long', 100.0, 2.0, stop_loss=90.0, take_profit=120.0)
+        assert len(published) == 1
+        snapshot, fills = published[0]
+        assert [p['symbol'] for p in snapshot.positions] == ['BTC/USDT']
+        assert [f['event'] for f in fills] == ['open']
+        assert engine.get_status()['available'] == pytest.approx(800.0)
+
+    asyncio.run(scenario())
+
+
+def test_unchanged_transaction_is_not_republished():
+    async def scenario():
+        engine = make_engine()
+        before = engine.snapshot()
+        async with engine.transaction():
+            engine.update_positions('ETH/USDT', 10.0)
+        assert engine.snapshot() is before
+
+    asyncio.run(scenario())
+
+
+def test_shallow_book_closes_in_parts_with_net_pnl_pct():
+    books = OrderBookCache()
+    model = OrderBookExecutionModel(books, commission_pct=0.1, slippage_ticks=0)
+    engine = PaperTradingEngine(1000, execution_model=model)
+    events = []
+    engine.subscribe(lambda snapshot, fills: events.extend(f['event'] for f in fills))
+    books.track('BTC/USDT')
+    books.snapshots['BTC/USDT'] = OrderBookSnapshot([[99.9, 10]], [[100.0, 10]], time.monotonic())
+    position = engine.open_position('BTC/USDT', 'long', 100.0, 2.0, stop_loss=90.0, take_profit=120.0)
+    cost, entry_fee = position['cost'], position['fees']
+
+    # Only 0.5 is bid at the take-profit: half exits, the rest stays armed
+    books.snapshots['BTC/USDT'] = OrderBookSnapshot([[120.0, 0.5]], [[120.1, 10]], time.monotonic())
+    assert engine.update_positions('BTC/USDT', 120.0) == []
+    [remaining] = engine.positions_for('BTC/USDT')
+    assert remaining['qty'] == pytest.approx(1.5)
+    assert remaining['cost'] == pytest.approx(cost * 0.75)
+    assert engine.triggers.orders
+    assert events == ['open', 'partial_close']
+
+    # An empty book fills nothing and keeps the position
+    books.snapshots['BTC/USDT'] = OrderBookSnapshot([], [], time.monotonic())
+    assert engine.update_positions('BTC/USDT', 121.0) == []
+    assert remaining['qty'] == pytest.approx(1.5)
+
+    books.snapshots['BTC/USDT'] = OrderBookSnapshot([[121.0, 10]], [[121.1, 10]], time.monotonic())
+    [closed] = engine.update_positions('BTC/USDT', 121.0)
+    exit_fees = model.fee(0.5, 120.0) + model.fee(1.5, 120.0)
+    gross = 0.5 * 20.0 + 1.5 * 20.0
+    assert closed['qty'] == pytest.approx(2.0)
+    assert closed['exit_price'] == pytest.approx(120.0)
+    assert closed['fees'] == pytest.approx(entry_fee + exit_fees)
+    assert closed['pnl'] == pytest.approx(gross - entry_fee - exit_fees)
+    assert closed['pnl_pct'] == pytest.approx(closed['pnl'] / cost * 100)
+    assert 'realized_pnl' not in closed
+    assert events[-1] == 'close'
+    assert engine.positions == {}
+    assert engine.available == pytest.approx(1000 + closed['pnl'])
+
+
+def test_positions_on_one_symbol_keep_their_own_exits(monkeypatch):
+    monkeypatch.setattr(settings, 'MAX_OPEN_POSITIONS', 5)
+    engine = make_engine()
+    first = engine.open_position('BTC/USDT', 'long', 100.0, 1.0, stop_loss=90.0, take_profit=120.0)
+    second = engine.open_position('BTC/USDT', 'long', 100.0, 1.0, stop_loss=95.0, take_profit=110.0)
+    hedge = engine.open_position('BTC/USDT', 'short', 100.0, 1.0, stop_loss=115.0, take_profit=80.0)
+    assert len({first['id'], second['id'], hedge['id']}) == 3
+    assert len(engine.triggers.legs) == 3
+
+    # Only the second position's target is crossed
+    [closed] = engine.update_positions('BTC/USDT', 111.0)
+    assert closed['id'] == second['id'] and closed['exit_reason'] == 'take_profit'
+    assert set(engine.positions) == {first['id'], hedge['id']}
+    assert all(p['current_price'] == 111.0 for p in engine.positions.values())
+
+    # Both remaining groups are still armed, and survive a reload
+    restored = make_engine()
+    restored.load_state(engine.to_state())
+    closed = restored.update_positions('BTC/USDT', 116.0)
+    assert [(p['id'], p['exit_reason']) for p in closed] == [(hedge['id'], 'stop_loss')]
+    opened = restored.open_position('BTC/USDT', 'long', 100.0, 0.1, stop_loss=90.0, take_profit=120.0)
+    assert opened['id'] not in (first['id'], second['id'], hedge['id'])
@@ -0,0 +1,59 @@
+"""Derived bars start on timeframe boundaries and match a batch resample."""
+import numpy as np
+import pandas as pd
+
+from backend.services.resampler import TimeframeResampler, bar_open_time
+
+MINUTE = 60_000
+HOUR = 3_600_000
+MIDNIGHT = 1_704_067_200_000  # Monday 2024-01-01 00:00 UTC
+
+
+def minutes(start_ms: int, count: int, seed: int = 0):
+    rng = np.random.default_rng(seed)
+    close = 100 + np.cumsum(rng.normal(0, 0.1, count))
+    return [
+        [start_ms + i * MINUTE, c - 0.05, c + 0.2, c - 0.2, c, float(i % 7 + 1)]
+        for i, c in enumerate(close)
+    ]
+
+
+def batch(rows, rule: str):
+    df = pd.DataFrame(rows, columns=['timestamp', 'open', 'high', 'low', 'close', 'volume'])
+    df.index = pd.to_datetime(df.timestamp, unit='ms')
+    bars = df.resample(rule).agg(
+        {'open': 'first', 'high': 'max', 'low': 'min', 'close': 'last', 'volume': 'sum'}
+    )
+    return [[int(t.value // 1_000_000), *row] for t, row in zip(bars.index, bars.to_numpy().tolist())]
+
+
+def test_bar_open_time_boundaries():
+    assert bar_open_time(MIDNIGHT + 59 * MINUTE, '1h') == MIDNIGHT
+    assert bar_open_time(MIDNIGHT + HOUR, '1h') == MIDNIGHT + HOUR
+    assert bar_open_time(MIDNIGHT + 5 * HOUR, '4h') == MIDNIGHT + 4 * HOUR
+    # Weekly bars open on Monday, not on the epoch's Thursday
+    assert bar_open_time(MIDNIGHT + 6 * 24 * HOUR, '1w') == MIDNIGHT
+    assert bar_open_time(MIDNIGHT - 1, '1w') == MIDNIGHT - 7 * 24 * HOUR
+
+
+def test_resampled_bars_match_batch_and_drop_partial_head():
+    # History starts mid-bar (00:30) and ends inside the 04:00 bar
+    rows = minutes(MIDNIGHT + 30 * MINUTE, 4 * 60)
+    resampler = TimeframeResampler('1m', max_base_bars=10_000)
+    resampler.ingest(rows[:100])
+    resampler.bars('1h', 10)  # created mid-stream, then fed incrementally
+    resampler.ingest(rows[100:])
+
+    hourly = resampler.bars('1h', 10)
+    assert [bar[0] for bar in hourly] == [MIDNIGHT + h * HOUR for h in range(1, 5)]
+    np.testing.assert_allclose(hourly, batch(rows, '1h')[1:])
+
+    four_hourly = resampler.bars('4h', 10)
+    assert [bar[0] for bar in four_hourly] == [MIDNIGHT + 4 * HOUR]
+
+    # A revised forming candle re-folds the forming bar
+    last = list(rows[-1])
+    last[2], last[4] = 150.0, 149.0
+    resampler.ingest([last])
+    assert resampler.bars('1h', 1)[0][2] == 150.0 and resampler.bars('1h', 1)[0][4] == 149.0
+    assert resampler.bars('1h', 2)[0] == hourly[-2]
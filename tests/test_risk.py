@@ -0,0 +1,92 @@
+"""Portfolio risk engine: downsizing, blocking and time-aligned returns."""
+import numpy as np
+import pytest
+
+from backend.services import risk
+from backend.services.risk import PortfolioRiskEngine
+
+HOUR_MS = 3_600_000
+
+
+def walk(n: int = 101, seed: int = 0, vol: float = 0.01) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    return 100 * np.exp(np.cumsum(rng.normal(0, vol, n)))
+
+
+def bars(n: int = 101, end: int = 1000) -> np.ndarray:
+    return (np.arange(end - n, end) + 1) * HOUR_MS
+
+
+def position(symbol: str, qty: float, price: float = 100.0, side: str = "long") -> dict:
+    return {"symbol": symbol, "side": side, "qty": qty, "current_price": price}
+
+
+def make_engine(**overrides) -> PortfolioRiskEngine:
+    params = dict(max_gross_exposure_pct=100.0, max_correlation=0.8, var_limit_pct=50.0,
+                  var_confidence=0.99, window=100, max_stale_bars=2)
+    params.update(overrides)
+    return PortfolioRiskEngine(**params)
+
+
+def test_gross_exposure_downsizes_then_blocks():
+    engine = make_engine()
+    decision = engine.evaluate("B", "long", qty=10, price=100.0, positions=[position("A", 6)], equity=1000.0)
+    assert decision.allowed and decision.qty == pytest.approx(4.0)
+
+    decision = engine.evaluate("B", "long", qty=1, price=100.0, positions=[position("A", 10)], equity=1000.0)
+    assert not decision.allowed and decision.reason == "Gross exposure limit reached"
+
+
+def test_correlated_position_in_same_direction_blocks():
+    engine = make_engine()
+    closes = walk()
+    engine.update_returns("A", closes, bars())
+    engine.update_returns("B", closes * 2, bars())
+
+    decision = engine.evaluate("B", "long", qty=1, price=100.0, positions=[position("A", 1)], equity=1000.0)
+    assert not decision.allowed and "Correlation with A" in decision.reason
+    # The opposite direction hedges instead
+    assert engine.evaluate("B", "short", qty=1, price=100.0, positions=[position("A", 1)], equity=1000.0).allowed
+
+
+def test_var_limit_downsizes():
+    engine = make_engine(var_limit_pct=1.0)
+    engine.update_returns("A", walk(vol=0.05), bars())
+    decision = engine.evaluate("A", "long", qty=5, price=100.0, positions=[], equity=1000.0)
+    assert decision.allowed and 0 < decision.qty < 5
+    assert decision.metrics["var_pct"] == pytest.approx(1.0)
+
+
+def test_returns_are_aligned_on_bar_timestamps():
+    engine = make_engine()
+    closes = walk()
+    engine.update_returns("A", closes, bars(end=1000))
+    # Same values, but last refreshed two bars earlier: pairing by trailing
+    # length would match them exactly, pairing by time shifts them apart
+    engine.update_returns("B", closes, bars(end=998))
+
+    decision = engine.evaluate("A", "long", qty=1, price=100.0, positions=[position("B", 1)], equity=1000.0)
+    assert decision.allowed
+    assert abs(decision.metrics["max_correlation"]) < 0.5
+
+
+def test_stale_held_returns_are_left_out():
+    engine = make_engine()
+    closes = walk()
+    engine.update_returns("A", closes, bars(end=1000))
+    engine.update_returns("B", closes, bars(end=990))
+
+    decision = engine.evaluate("A", "long", qty=1, price=100.0, positions=[position("B", 1)], equity=1000.0)
+    assert decision.allowed and "max_correlation" not in decision.metrics
+
+
+def test_covariance_cache_is_bounded():
+    engine = make_engine(max_correlation=2.0)
+    symbols = [f"S{i}" for i in range(25)]
+    for seed, symbol in enumerate(symbols):
+        engine.update_returns(symbol, walk(seed=seed), bars())
+    for held in symbols:
+        for candidate in symbols:
+            if held != candidate:
+                engine.evaluate(candidate, "long", qty=0.1, price=100.0, positions=[position(held, 0.1)], equity=1000.0)
+    assert len(engine._cov_cache) == risk.COV_CACHE_SIZE
@@ -0,0 +1,85 @@
+"""Cached signals are served within a bar and recomputed once it closes."""
+import asyncio
+
+import pytest
+
+from backend.api import routes
+from backend.services.candle_store import CandleArrays
+from backend.services.clock import clock
+from backend.services.signal_cache import SignalCache
+
+HOUR = 3_600_000
+BAR = 1_704_067_200_000  # 2024-01-01 00:00 UTC
+
+
+def at(ms: int) -> float:
+    return ms / 1000
+
+
+def test_entries_expire_when_the_next_bar_closes():
+    cache = SignalCache(params=('p',), timeframe='1h', negative_ttl=60)
+    signal = {'side': 'long'}
+    # Computed 10 minutes into the bar after BAR closed
+    cache.put('BTC/USDT', BAR, signal)
+    assert cache.get('BTC/USDT', now=at(BAR + HOUR + 10 * 60_000)).signal is signal
+    assert cache.get('BTC/USDT', now=at(BAR + 2 * HOUR - 1)).signal is signal
+    assert cache.get('BTC/USDT', now=at(BAR + 2 * HOUR)) is None
+
+    # An older bar never replaces a newer one
+    cache.put('BTC/USDT', BAR - HOUR, None)
+    assert cache.get('BTC/USDT', now=at(BAR + HOUR)).signal is signal
+
+
+def test_no_signal_entries_expire_early():
+    cache = SignalCache(params=('p',), timeframe='1h', negative_ttl=60)
+    clock.simulate(at(BAR + HOUR + 60_000), speed=1e-9)
+    try:
+        cache.put('BTC/USDT', BAR, None)
+    finally:
+        clock.reset()
+    assert cache.get('BTC/USDT', now=at(BAR + HOUR + 90_000)) is not None
+    assert cache.get('BTC/USDT', now=at(BAR + HOUR + 121_000)) is None
+
+
+def test_evaluate_signal_recomputes_after_bar_close(monkeypatch):
+    fetches = []
+
+    async def fetch_candles(symbol, timeframe, limit):
+        now_ms = int(clock.time() * 1000)
+        forming = now_ms - now_ms % HOUR
+        fetches.append(forming)
+        return CandleArrays.from_rows([
+            [forming - HOUR, 100.0, 101.0, 99.0, 100.0, 1.0],
+            [forming, 100.0, 101.0, 99.0, 100.5, 1.0],
+        ])
+
+    async def compute_signal(symbol, candles):
+        return {'side': 'long', 'bar': int(candles.timestamp[-1])}
+
+    async def refresh_breakout(symbol, candles):
+        pass
+
+    monkeypatch.setattr(routes.market_data, "fetch_candles", fetch_candles)
+    monkeypatch.setattr(routes, "compute_signal", compute_signal)
+    monkeypatch.setattr(routes, "refresh_breakout", refresh_breakout)
+    monkeypatch.setattr(routes, "signal_cache", SignalCache(params=('p',), timeframe='1h'))
+    monkeypatch.setattr(routes.settings, "TIMEFRAME", "1h")
+    monkeypatch.setattr(routes.risk_engine, "update_returns", lambda *args: None)
+
+    async def signal_at(ms):
+        clock.simulate(at(ms), speed=1e-9)
+        try:
+            signal, has_data = await routes.evaluate_signal('BTC/USDT')
+            assert has_data
+            return signal
+        finally:
+            clock.reset()
+
+    first = asyncio.run(signal_at(BAR + 5 * 60_000))
+    assert asyncio.run(signal_at(BAR + 59 * 60_000)) is first
+    assert fetches == [BAR]
+
+    # The bar closed: a new computation for the new forming bar
+    after = asyncio.run(signal_at(BAR + HOUR + 1000))
+    assert after is not first and after['bar'] == BAR + HOUR
+    assert fetches == [BAR, BAR + HOUR]
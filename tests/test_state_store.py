@@ -0,0 +1,65 @@
+"""Redis engine state store: versions, fencing and the shared fills stream."""
+import asyncio
+
+import pytest
+
+from backend.services.execution import ExecutionModel
+from backend.services.paper_trading import PaperTradingEngine
+from backend.services.state_store import RedisEngineStateStore
+
+fakeredis = pytest.importorskip("fakeredis")
+
+
+def redis_store(server) -> RedisEngineStateStore:
+    store = RedisEngineStateStore()
+    store.client = fakeredis.aioredis.FakeRedis(server=server)
+    return store
+
+
+def test_versions_and_fills_cursor():
+    async def scenario():
+        server = fakeredis.FakeServer()
+        a, b = redis_store(server), redis_store(server)
+        assert await a.version() == 0 and await a.load() is None
+
+        assert await a.save({'n': 1}, [{'event': 'open', 'symbol': 'X'}], expected_version=0) == 1
+        assert await b.save({'n': 2}, [{'event': 'close', 'symbol': 'X'}], expected_version=1) == 2
+        assert await a.load() == (2, {'n': 2})
+
+        # Each worker sees the other's fills once, never its own
+        assert await a.load_fills() == [{'event': 'close', 'symbol': 'X'}]
+        assert await b.load_fills() == [{'event': 'open', 'symbol': 'X'}]
+        assert await a.load_fills() == [] and await b.load_fills() == []
+
+        # A save built on an older version is refused and changes nothing
+        with pytest.raises(Exception, match="changed underneath"):
+            await a.save({'n': 3}, [{'event': 'open', 'symbol': 'Y'}], expected_version=1)
+        assert await a.load() == (2, {'n': 2})
+        assert await b.load_fills() == []
+        await a.close()
+        await b.close()
+
+    asyncio.run(scenario())
+
+
+def test_writer_that_outlived_its_lock_is_rolled_back():
+    async def scenario():
+        server = fakeredis.FakeServer()
+        first = PaperTradingEngine(1000, execution_model=ExecutionModel(), state_store=redis_store(server))
+        second = PaperTradingEngine(1000, execution_model=ExecutionModel(), state_store=redis_store(server))
+
+        with pytest.raises(Exception, match="changed underneath"):
+            async with first.transaction():
+                first.open_position('BTC/USDT', 'long', 100.0, 1.0, stop_loss=90.0, take_profit=120.0)
+                # The lock expired while this block awaited; another worker commits meanwhile
+                await second.state_store.save(second.to_state(), expected_version=0)
+                second.open_position('ETH/USDT', 'long', 10.0, 2.0, stop_loss=9.0, take_profit=12.0)
+                await second.state_store.save(second.to_state(), expected_version=1)
+
+        assert first.positions == {} and first.available == 1000
+        await first.sync()
+        assert [p['symbol'] for p in first.positions.values()] == ['ETH/USDT']
+        await first.state_store.close()
+        await second.state_store.close()
+
+    asyncio.run(scenario())
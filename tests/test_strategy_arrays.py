@@ -0,0 +1,42 @@
+"""The array signal path matches the DataFrame path and reuses its buffers."""
+import numpy as np
+import pytest
+
+from backend.services.candle_store import CandleArrays
+from backend.services.replay import random_walk
+from backend.strategies.indicators import workspace
+from backend.strategies.swing_trend import SwingTrendStrategy
+
+START = 1_704_067_200_000
+
+
+def test_rows_become_contiguous_columns():
+    candles = CandleArrays.from_rows([[START, 1, 2, 0.5, 1.5, 10], [START + 1, 1.5, 2.5, 1, 2, 20]])
+    assert candles.timestamp.dtype == np.int64
+    for column in (candles.open, candles.high, candles.low, candles.close, candles.volume):
+        assert column.dtype == np.float64 and column.flags['C_CONTIGUOUS']
+    # One block behind all price columns
+    assert candles.open.base is candles.volume.base is not None
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_array_and_dataframe_paths_agree(seed):
+    strategy = SwingTrendStrategy()
+    candles = random_walk(100, START, '1h', seed=seed)
+    frame = candles.to_frame()
+    signal = strategy.generate_signal(candles)
+    assert strategy.generate_signal(frame) == signal
+    assert strategy.generate_signal(strategy.calculate_indicators(frame)) == signal
+
+
+def test_workspace_is_reused_without_leaking_between_calls():
+    strategy = SwingTrendStrategy()
+    long_series = random_walk(120, START, '1h', seed=1)
+    short_series = random_walk(80, START, '1h', seed=2)
+
+    floats, _ = workspace(120)
+    assert workspace(80)[0].base is floats.base
+
+    expected = strategy.generate_signal(short_series), strategy.breakout_trigger(short_series)
+    strategy.generate_signal(long_series)
+    assert (strategy.generate_signal(short_series), strategy.breakout_trigger(short_series)) == expected
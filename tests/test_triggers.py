@@ -0,0 +1,48 @@
+"""TriggerIndex memory stays bounded when far-away levels are cancelled."""
+import random
+
+from backend.services.triggers import COMPACT_MIN_ENTRIES, TriggerIndex
+
+
+def heap_sizes(index: TriggerIndex):
+    for book in index.books.values():
+        entries = len(book.fixed) + sum(len(group.orders) for group in book.groups)
+        yield entries, len(book.group_levels), book.live
+
+
+def test_heaps_stay_bounded_after_many_opens_and_closes():
+    rng = random.Random(7)
+    index = TriggerIndex()
+    price, open_keys = 100.0, []
+
+    for i in range(20_000):
+        side = rng.choice(("long", "short"))
+        # Stops and targets far from the price: they never reach the top of a heap
+        far = 0.5 if side == "long" else 1.5
+        index.arm(
+            f"p{i}", "BTC/USDT", side,
+            stop_loss=price * far, take_profit=price * (2 - far),
+            trail_distance=price * rng.choice((0.2, 0.3)), peak=price
+        )
+        open_keys.append(f"p{i}")
+        price *= 1 + rng.gauss(0, 0.001)
+        index.on_price("BTC/USDT", price)
+        if len(open_keys) > 20:
+            index.disarm(open_keys.pop(rng.randrange(len(open_keys))))
+
+    for entries, levels, live in heap_sizes(index):
+        assert entries <= max(2 * live, COMPACT_MIN_ENTRIES)
+        assert levels <= max(2 * live, COMPACT_MIN_ENTRIES) + 1
+
+
+def test_levels_still_fire_after_compaction():
+    index = TriggerIndex()
+    for i in range(500):
+        index.arm(f"gone{i}", "ETH/USDT", "long", stop_loss=10.0 + i * 0.01, take_profit=500.0)
+        index.disarm(f"gone{i}")
+    index.arm("kept", "ETH/USDT", "long", stop_loss=90.0, take_profit=120.0, trail_distance=5.0, peak=100.0)
+
+    for entries, _, live in heap_sizes(index):
+        assert entries <= max(2 * live, COMPACT_MIN_ENTRIES)
+    assert index.on_price("ETH/USDT", 110.0) == []
+    assert index.on_price("ETH/USDT", 104.0) == [("kept", "trailing_stop", 105.0)]
@@ -0,0 +1,84 @@
+"""Write-behind flushes when a batch contains a row the database rejects."""
+import asyncio
+from datetime import datetime
+
+from sqlalchemy import func, select
+
+from backend.database import AsyncSessionLocal, engine, init_db
+from backend.models.equity_sample import EquitySample
+from backend.models.trade import Trade
+from backend.services.write_behind import WriteBehindQueue
+
+
+def open_trade() -> dict:
+    return dict(
+        strategy="swing_trend", symbol="BTC/USDT", side="long", entry_price=100.0, qty=1.0,
+        stop_loss=95.0, take_profit=110.0, opened_at=datetime(2024, 1, 1), status="open"
+    )
+
+
+async def count(model) -> int:
+    async with AsyncSessionLocal() as db:
+        return await db.scalar(select(func.count()).select_from(model))
+
+
+def test_orphan_update_does_not_block_other_writes():
+    async def scenario():
+        await init_db()
+        queue = WriteBehindQueue(max_batch=1000, max_attempts=3)
+        orphan = 999_999  # close for a trade whose insert never reached the database
+
+        queue.add_trade(1, **open_trade())
+        queue.update_trade(orphan, status="closed", pnl=1.0)
+        queue.add_equity({"time": datetime(2024, 1, 1), "equity": 500.0, "available": 400.0,
+                          "exposure": 100.0, "open_positions": 1})
+        assert await queue.flush() == 2
+        assert queue.pending == 1 and queue.attempts == {orphan: 1}
+
+        # Later writes keep flowing while the orphan is retried
+        queue.add_trade(2, **open_trade())
+        queue.update_trade(1, status="closed", pnl=-5.0)
+        assert await queue.flush() == 2
+        assert queue.attempts == {orphan: 2}
+
+        # Retries are capped: the orphan is dead-lettered, not requeued forever
+        await queue.flush()
+        assert queue.pending == 0 and queue.attempts == {}
+        assert [d["trade_id"] for d in queue.dead_letters] == [orphan]
+
+        assert await count(Trade) == 2
+        assert await count(EquitySample) == 1
+        async with AsyncSessionLocal() as db:
+            assert (await db.get(Trade, 1)).status == "closed"
+        await engine.dispose()
+
+    asyncio.run(scenario())
+
+
+def test_unmatched_update_is_retried_without_multi_rowcount(monkeypatch):
+    # Like asyncpg: executemany reports no per-row counts
+    monkeypatch.setattr(engine.dialect, "supports_sane_multi_rowcount", False)
+
+    async def scenario():
+        await init_db()
+        queue = WriteBehindQueue(max_batch=1000, max_attempts=5)
+        async with AsyncSessionLocal() as db:
+            trade_id = (await db.scalar(select(func.coalesce(func.max(Trade.id), 0)))) + 1
+
+        # The close arrives before the INSERT (made on another worker) has landed
+        queue.update_trade(trade_id, status="closed", pnl=3.0)
+        queue.update_trade(trade_id + 1, status="closed", pnl=1.0)
+        assert await queue.flush() == 0
+        assert queue.pending == 2 and queue.attempts == {trade_id: 1, trade_id + 1: 1}
+
+        async with AsyncSessionLocal() as db:
+            db.add(Trade(id=trade_id, **open_trade()))
+            await db.commit()
+        assert await queue.flush() == 1
+        assert queue.attempts == {trade_id + 1: 2}
+        async with AsyncSessionLocal() as db:
+            trade = await db.get(Trade, trade_id)
+            assert trade.status == "closed" and trade.pnl == 3.0
+        await engine.dispose()
+
+    asyncio.run(scenario())